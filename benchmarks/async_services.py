@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
+    PreSignUpTriggerEvent,
+)
+
+import src.adapters.recaptcha as recaptcha_adapter
+
+from benchmarks.fakes import FakeDynamoDBClient, FakeRecaptchaSession
+from benchmarks.scenarios import (
+    INJECTED_ERRORS,
+    LatencyProfiles,
+    build_settings,
+    build_user_attributes,
+)
+from benchmarks.stats import summarize
+from src.adapters.aws_async import AsyncClient
+from src.facades.process_pre_sign_up import process_pre_sign_up_async
+
+
+def _event(index: int) -> PreSignUpTriggerEvent:
+    return PreSignUpTriggerEvent(
+        {
+            "userPoolId": "benchmark-pool",
+            "userName": f"0fcbc418-e084-478c-9af0-{index:012d}",
+            "request": {
+                "validationData": {"reCaptchaToken": f"token-{index}"},
+                "userAttributes": build_user_attributes(index),
+            },
+            "response": {},
+        }
+    )
+
+
+def run_pre_sign_up_async(
+    profiles: LatencyProfiles, invocations: int, concurrency: int
+) -> dict:
+    settings = build_settings()
+    dynamodb_client = AsyncClient(FakeDynamoDBClient(profiles.dynamodb))
+    recaptcha_adapter._recaptcha_client = recaptcha_adapter.RecaptchaClient(
+        session_factory=lambda: FakeRecaptchaSession(profiles.recaptcha)
+    )
+    latencies: list[float] = []
+    errors = 0
+
+    async def run_once(index: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            await process_pre_sign_up_async(
+                _event(index), settings, dynamodb_client
+            )
+        except INJECTED_ERRORS:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+
+    async def run_all() -> None:
+        # Invocations overlap in groups, as in a container serving several
+        # requests at once on a single event loop.
+        for first in range(0, invocations, concurrency):
+            last = min(first + concurrency, invocations)
+            await asyncio.gather(*(run_once(i) for i in range(first, last)))
+
+    started = time.perf_counter()
+    asyncio.run(run_all())
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": "process_pre_sign_up_async",
+        "params": {"concurrency": concurrency, "invocations": invocations},
+        **summarize(latencies, elapsed, invocations, errors),
+    }
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+
+from typing import TYPE_CHECKING, Optional, cast
+
+from benchmarks.fakes import FakeDynamoDBClient
+from benchmarks.scenarios import CONTACTS_TABLE_NAME, LatencyProfiles
+from benchmarks.stats import summarize
+from src.adapters.bloom_filter import BloomFilter
+from src.services.user.is_contact_in_use import is_contact_in_use
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+FILTER_CAPACITIES = (10_000, 100_000)
+FILTER_FALSE_POSITIVE_RATES = (0.01, 0.001)
+FALSE_POSITIVE_PROBES = 100_000
+
+
+def _verified_contact(index: int) -> str:
+    return f"email#user-{index}@example.com"
+
+
+def _build_filter(capacity: int, false_positive_rate: float) -> BloomFilter:
+    contact_filter = BloomFilter.for_capacity(capacity, false_positive_rate)
+    for index in range(capacity):
+        contact_filter.add(_verified_contact(index))
+    return contact_filter
+
+
+def run_contact_filter_sizing(
+    capacities: tuple[int, ...] = FILTER_CAPACITIES,
+    false_positive_rates: tuple[float, ...] = FILTER_FALSE_POSITIVE_RATES,
+    probes: int = FALSE_POSITIVE_PROBES,
+) -> list[dict]:
+    results = []
+    for capacity in capacities:
+        for false_positive_rate in false_positive_rates:
+            # Filled to capacity, the worst case between two rebuilds.
+            build_started = time.perf_counter()
+            contact_filter = _build_filter(capacity, false_positive_rate)
+            build_seconds = time.perf_counter() - build_started
+
+            latencies: list[float] = []
+            false_positives = 0
+            started = time.perf_counter()
+            for index in range(probes):
+                probe = f"email#new-{index}@example.com"
+                lookup_started = time.perf_counter()
+                false_positives += probe in contact_filter
+                latencies.append(time.perf_counter() - lookup_started)
+            elapsed = time.perf_counter() - started
+
+            results.append(
+                {
+                    "scenario": "contact_filter_lookup",
+                    "params": {
+                        "capacity": capacity,
+                        "false_positive_rate": false_positive_rate,
+                        "invocations": probes,
+                    },
+                    "size_bytes": contact_filter.size_bytes,
+                    "hash_count": contact_filter.hash_count,
+                    "build_seconds": round(build_seconds, 3),
+                    "measured_false_positive_rate": round(
+                        false_positives / probes, 5
+                    ),
+                    "estimated_false_positive_rate": round(
+                        contact_filter.estimated_false_positive_rate(), 5
+                    ),
+                    **summarize(latencies, elapsed, probes),
+                }
+            )
+    return results
+
+
+def run_contact_in_use_check(
+    profiles: LatencyProfiles,
+    invocations: int,
+    capacity: int = FILTER_CAPACITIES[0],
+) -> list[dict]:
+    # New contacts are what most sign ups check, and what the filter skips.
+    contact_filters: dict[str, Optional[BloomFilter]] = {
+        "none": None,
+        "bloom": _build_filter(capacity, FILTER_FALSE_POSITIVE_RATES[0]),
+    }
+    results = []
+    for filter_name, contact_filter in contact_filters.items():
+        dynamodb_client = cast(
+            "DynamoDBClient", FakeDynamoDBClient(profiles.dynamodb)
+        )
+        latencies: list[float] = []
+        started = time.perf_counter()
+        for index in range(invocations):
+            check_started = time.perf_counter()
+            is_contact_in_use(
+                dynamodb_client,
+                CONTACTS_TABLE_NAME,
+                "email",
+                f"new-{index}@example.com",
+                contact_filter=contact_filter,
+            )
+            latencies.append(time.perf_counter() - check_started)
+        elapsed = time.perf_counter() - started
+
+        results.append(
+            {
+                "scenario": "is_contact_in_use",
+                "params": {
+                    "contact_filter": filter_name,
+                    "invocations": invocations,
+                },
+                **summarize(latencies, elapsed, invocations),
+            }
+        )
+    return results
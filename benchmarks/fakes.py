@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from botocore.exceptions import ClientError
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+    throttle_rate: float = 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "mean_ms": self.mean_ms,
+            "jitter_ms": self.jitter_ms,
+            "throttle_rate": self.throttle_rate,
+        }
+
+
+class FakeAWSService:
+    throttle_error_code = "ThrottlingException"
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        self._profile = profile
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: Counter[str] = Counter()
+        self.throttled: Counter[str] = Counter()
+
+    def _call(self, operation_name: str) -> None:
+        with self._lock:
+            self.calls[operation_name] += 1
+            delay_ms = max(
+                0.0,
+                self._random.gauss(
+                    self._profile.mean_ms, self._profile.jitter_ms
+                ),
+            )
+            throttled = self._random.random() < self._profile.throttle_rate
+            if throttled:
+                self.throttled[operation_name] += 1
+
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+        if throttled:
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": self.throttle_error_code,
+                        "Message": "Rate exceeded",
+                    }
+                },
+                operation_name,
+            )
+
+
+class FakeCognitoClient(FakeAWSService):
+    throttle_error_code = "TooManyRequestsException"
+
+    def admin_delete_user(self, *, UserPoolId: str, Username: str) -> dict:
+        self._call("AdminDeleteUser")
+        return {}
+
+    def sign_up(self, *, ClientId: str, Username: str, **kwargs: Any) -> dict:
+        self._call("SignUp")
+        return {"UserSub": Username, "UserConfirmed": False}
+
+
+class FakeDynamoDBClient(FakeAWSService):
+    throttle_error_code = "ProvisionedThroughputExceededException"
+
+    def __init__(self, profile: LatencyProfile, seed: int = 0):
+        super().__init__(profile, seed)
+        self._items: dict[tuple[str, str], dict[str, Any]] = {}
+        self._claims: dict[tuple[str, str], set[str]] = {}
+
+    def put_contact(
+        self,
+        table_name: str,
+        contact_key: str,
+        verified: bool,
+        user_id: Optional[str] = None,
+    ):
+        item = {
+            "contact": {"S": contact_key},
+            "verified": {"BOOL": verified},
+        }
+        if user_id:
+            item["user_id"] = {"S": user_id}
+            self._claims.setdefault((table_name, user_id), set()).add(
+                contact_key
+            )
+        self._items[(table_name, contact_key)] = item
+
+    def get_item(
+        self,
+        *,
+        TableName: str,
+        Key: dict[str, Any],
+        ProjectionExpression: Optional[str] = None,
+    ) -> dict:
+        self._call("GetItem")
+        (key_value,) = Key.values()
+        item = self._items.get((TableName, key_value["S"]))
+        return {"Item": item} if item else {}
+
+    def transact_write_items(self, *, TransactItems: list[dict]) -> dict:
+        self._call("TransactWriteItems")
+        return {}
+
+    def query(
+        self,
+        *,
+        TableName: str,
+        ExpressionAttributeValues: dict[str, Any],
+        **kwargs: Any,
+    ) -> dict:
+        # Only the user_id index of the contacts table is queried.
+        self._call("Query")
+        user_id = ExpressionAttributeValues[":user_id"]["S"]
+        with self._lock:
+            contact_keys = sorted(self._claims.get((TableName, user_id), ()))
+        return {
+            "Items": [
+                {"contact": {"S": contact_key}} for contact_key in contact_keys
+            ]
+        }
+
+    def delete_item(
+        self, *, TableName: str, Key: dict[str, Any], **kwargs: Any
+    ) -> dict:
+        self._call("DeleteItem")
+        (key_value,) = Key.values()
+        with self._lock:
+            item = self._items.pop((TableName, key_value["S"]), None)
+            if item and "user_id" in item:
+                self._claims[(TableName, item["user_id"]["S"])].discard(
+                    key_value["S"]
+                )
+        return {}
+
+
+class FakeSSMClient(FakeAWSService):
+    def __init__(
+        self,
+        profile: LatencyProfile,
+        parameters: dict[str, str],
+        seed: int = 0,
+    ):
+        super().__init__(profile, seed)
+        self._parameters = parameters
+
+    def get_parameters(
+        self, *, Names: list[str], WithDecryption: bool
+    ) -> dict[str, Any]:
+        self._call("GetParameters")
+        return {
+            "Parameters": [
+                {"Name": name, "Value": self._parameters[name]}
+                for name in Names
+                if name in self._parameters
+            ],
+            "InvalidParameters": [
+                name for name in Names if name not in self._parameters
+            ],
+        }
+
+
+class FakeRecaptchaResponse:
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict[str, Any]:
+        return {"success": True}
+
+
+class FakeRecaptchaSession(FakeAWSService):
+    def post(self, url: str, data: dict, timeout: float):
+        self._call("SiteVerify")
+        return FakeRecaptchaResponse()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+import src.adapters.rate_limits as rate_limits_adapter
+
+from benchmarks.scenarios import (
+    CONTACTS_TABLE_NAME,
+    UNLIMITED_RATE_LIMITS,
+    USERS_TABLE_NAME,
+)
+from benchmarks.stats import summarize
+from src.facades.reconcile_users import reconcile_users
+from src.settings import (
+    ContactsTableSettings,
+    ReconciliationSettings,
+    Settings,
+    UserPoolSettings,
+    UsersTableSettings,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+RECONCILIATION_USERS = 1_000_000
+SPILL_MAX_ITEMS = (50_000, 100_000)
+SCAN_PAGE_SIZE = 1_000
+LIST_USERS_PAGE_SIZE = 60
+# Every hundredth user is missing from one side or the other.
+MISMATCH_EVERY = 100
+
+
+def _user_id(index: int) -> str:
+    # Hash-like ids, so neither side returns users in sorted order.
+    return f"{(index * 2_654_435_761) % 2**32:08x}-{index:010d}"
+
+
+class SyntheticUsersTable:
+    def __init__(self, user_count: int):
+        self._user_count = user_count
+
+    def scan(
+        self, *, Segment: int, TotalSegments: int, **kwargs: Any
+    ) -> dict[str, Any]:
+        start = int(
+            kwargs.get("ExclusiveStartKey", {}).get("index", {}).get("N", -1)
+        )
+        start = Segment if start < 0 else start + TotalSegments
+        indexes = range(
+            start,
+            min(self._user_count, start + SCAN_PAGE_SIZE * TotalSegments),
+            TotalSegments,
+        )
+        items = [
+            {"user_id": {"S": _user_id(index)}, "verified_at": {"N": "1"}}
+            for index in indexes
+            if index % MISMATCH_EVERY != 1
+        ]
+        response: dict[str, Any] = {"Items": items}
+        if indexes and indexes[-1] + TotalSegments < self._user_count:
+            response["LastEvaluatedKey"] = {"index": {"N": str(indexes[-1])}}
+        return response
+
+
+class SyntheticUserPool:
+    def __init__(self, user_count: int):
+        self._user_count = user_count
+        self._created_at = datetime.now(timezone.utc) - timedelta(days=30)
+
+    def list_users(self, **kwargs: Any) -> dict[str, Any]:
+        start = int(kwargs.get("PaginationToken", 0))
+        end = min(self._user_count, start + LIST_USERS_PAGE_SIZE)
+        users = [
+            {
+                "Username": _user_id(index),
+                "UserStatus": "CONFIRMED",
+                "UserCreateDate": self._created_at,
+                "Attributes": [
+                    {"Name": "email", "Value": f"user-{index}@example.com"},
+                    {"Name": "email_verified", "Value": "true"},
+                ],
+            }
+            for index in range(start, end)
+            if index % MISMATCH_EVERY != 2
+        ]
+        response: dict[str, Any] = {"Users": users}
+        if end < self._user_count:
+            response["PaginationToken"] = str(end)
+        return response
+
+
+def run_reconciliation(
+    user_count: int = RECONCILIATION_USERS,
+    spill_max_items: int = SPILL_MAX_ITEMS[-1],
+    total_segments: int = 4,
+) -> dict:
+    settings = Settings(
+        users_table=UsersTableSettings(name=USERS_TABLE_NAME),
+        contacts_table=ContactsTableSettings(name=CONTACTS_TABLE_NAME),
+        user_pool=UserPoolSettings(id="benchmark-pool"),
+        reconciliation=ReconciliationSettings(
+            total_segments=total_segments, spill_max_items=spill_max_items
+        ),
+    )
+
+    # Measures the diff itself, not the ListUsers quota.
+    rate_limits_adapter.configure(UNLIMITED_RATE_LIMITS)
+    started = time.perf_counter()
+    report = reconcile_users(
+        settings,
+        cast("DynamoDBClient", SyntheticUsersTable(user_count)),
+        cast("CognitoIdentityProviderClient", SyntheticUserPool(user_count)),
+        datetime.now(timezone.utc),
+    )
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": "reconcile_users",
+        "params": {
+            "users": user_count,
+            "spill_max_items": spill_max_items,
+            "total_segments": total_segments,
+        },
+        # Kilobytes on Linux, meaningful in a process of its own.
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "mismatches": report.mismatches,
+        # A single run, so every percentile is the whole reconciliation.
+        **summarize([elapsed], elapsed, report.table_users + report.pool_users),
+    }
+
+
+def run_reconciliation_isolated(
+    user_count: int, spill_max_items: int, total_segments: int = 4
+) -> dict:
+    # Each run gets a fresh interpreter so its peak memory is its own.
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.reconciliation",
+            f"--users={user_count}",
+            f"--spill-max-items={spill_max_items}",
+            f"--total-segments={total_segments}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.reconciliation")
+    parser.add_argument("--users", type=int, default=RECONCILIATION_USERS)
+    parser.add_argument(
+        "--spill-max-items", type=int, default=SPILL_MAX_ITEMS[-1]
+    )
+    parser.add_argument("--total-segments", type=int, default=4)
+    args = parser.parse_args(argv)
+    print(
+        json.dumps(
+            run_reconciliation(
+                args.users, args.spill_max_items, args.total_segments
+            )
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
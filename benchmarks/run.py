@@ -0,0 +1,271 @@
+"""
+Runs the handler benchmarks against in-process AWS stand-ins.
+
+    python -m benchmarks.run --output benchmarks/results/current.json
+    python -m benchmarks.run --baseline benchmarks/results/main.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.async_services import run_pre_sign_up_async
+from benchmarks.contact_filter import (
+    run_contact_filter_sizing,
+    run_contact_in_use_check,
+)
+from benchmarks.fakes import LatencyProfile
+from benchmarks.reconciliation import (
+    RECONCILIATION_USERS,
+    SPILL_MAX_ITEMS,
+    run_reconciliation_isolated,
+)
+from benchmarks.scenarios import (
+    LatencyProfiles,
+    run_bus_event,
+    run_post_confirmation,
+    run_pre_sign_up,
+    run_settings_refresh,
+    run_settings_warm_start,
+)
+from benchmarks.sign_up_api import run_sign_up_api
+from benchmarks.stream_decoding import run_stream_decoding
+from benchmarks.user_view import (
+    USER_REPRESENTATIONS,
+    USER_VIEW_USERS,
+    run_user_view_isolated,
+)
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = REPOSITORY_ROOT / "benchmarks" / "results"
+
+DEFAULT_BATCH_SIZES = (1, 10, 100, 1000, 10000)
+DEFAULT_POOL_SIZES = (1, 8, 32)
+ASYNC_CONCURRENCY = (1, 8)
+STREAM_DECODING_RECORDS = 10_000
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument(
+        "--batch-sizes",
+        type=_int_list,
+        default=list(DEFAULT_BATCH_SIZES),
+        help="stream records per bus event, comma separated",
+    )
+    parser.add_argument(
+        "--pool-sizes",
+        type=_int_list,
+        default=list(DEFAULT_POOL_SIZES),
+        help="bus event worker pool sizes, comma separated",
+    )
+    parser.add_argument(
+        "--invocations",
+        type=int,
+        default=200,
+        help="invocations per trigger scenario",
+    )
+    parser.add_argument(
+        "--max-records",
+        type=int,
+        default=20000,
+        help="stream records processed per bus scenario",
+    )
+    for service, mean_ms in (
+        ("cognito", 20.0),
+        ("dynamodb", 5.0),
+        ("ssm", 15.0),
+        ("recaptcha", 60.0),
+    ):
+        parser.add_argument(
+            f"--{service}-latency-ms", type=float, default=mean_ms
+        )
+        parser.add_argument(
+            f"--{service}-jitter-ms", type=float, default=mean_ms / 4
+        )
+        parser.add_argument(
+            f"--{service}-throttle-rate", type=float, default=0.0
+        )
+    parser.add_argument(
+        "--reconciliation-users",
+        type=int,
+        default=RECONCILIATION_USERS,
+        help="synthetic pool size of the reconciliation scenario, 0 skips it",
+    )
+    parser.add_argument(
+        "--user-view-users",
+        type=int,
+        default=USER_VIEW_USERS,
+        help="users listed by the user memory scenario, 0 skips it",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="previous results to compare against",
+    )
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown that fails the comparison",
+    )
+    return parser.parse_args(argv)
+
+
+def _profile(args: argparse.Namespace, service: str) -> LatencyProfile:
+    return LatencyProfile(
+        mean_ms=getattr(args, f"{service}_latency_ms"),
+        jitter_ms=getattr(args, f"{service}_jitter_ms"),
+        throttle_rate=getattr(args, f"{service}_throttle_rate"),
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPOSITORY_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def _result_key(result: dict) -> str:
+    params = {
+        name: value
+        for name, value in result["params"].items()
+        if name != "invocations"
+    }
+    return json.dumps([result["scenario"], params], sort_keys=True)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    baseline_results = {
+        _result_key(result): result for result in baseline["results"]
+    }
+    regressions: list[str] = []
+
+    for result in current["results"]:
+        previous = baseline_results.get(_result_key(result))
+        if not previous:
+            continue
+        for metric in COMPARED_METRICS:
+            if not previous[metric]:
+                continue
+            change = result[metric] / previous[metric] - 1
+            line = (
+                f"{result['scenario']} {result['params']} {metric}: "
+                f"{previous[metric]:.3f} -> {result[metric]:.3f} "
+                f"({change:+.1%})"
+            )
+            print(line)
+            if change > threshold:
+                regressions.append(line)
+
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    profiles = LatencyProfiles(
+        cognito=_profile(args, "cognito"),
+        dynamodb=_profile(args, "dynamodb"),
+        ssm=_profile(args, "ssm"),
+        recaptcha=_profile(args, "recaptcha"),
+    )
+
+    results = [
+        run_pre_sign_up(profiles, args.invocations),
+        run_post_confirmation(profiles, args.invocations),
+        run_settings_refresh(profiles, 5, args.invocations),
+        run_settings_warm_start(profiles, 5, args.invocations),
+        *run_stream_decoding(STREAM_DECODING_RECORDS, 20),
+        *run_sign_up_api(profiles, args.invocations),
+        *run_contact_filter_sizing(),
+        *run_contact_in_use_check(profiles, args.invocations),
+    ]
+    for concurrency in ASYNC_CONCURRENCY:
+        results.append(
+            run_pre_sign_up_async(profiles, args.invocations, concurrency)
+        )
+    if args.user_view_users:
+        for representation in USER_REPRESENTATIONS:
+            results.append(
+                run_user_view_isolated(representation, args.user_view_users)
+            )
+    if args.reconciliation_users:
+        for spill_max_items in SPILL_MAX_ITEMS:
+            results.append(
+                run_reconciliation_isolated(
+                    args.reconciliation_users, spill_max_items
+                )
+            )
+    for batch_size in args.batch_sizes:
+        # Small batches get more invocations so percentiles stay meaningful.
+        invocations = max(
+            1, min(args.invocations, args.max_records // batch_size)
+        )
+        for max_workers in args.pool_sizes:
+            results.append(
+                run_bus_event(profiles, batch_size, max_workers, invocations)
+            )
+
+    for result in results:
+        print(
+            f"{result['scenario']} {result['params']}: "
+            f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+            f"p99={result['p99_ms']}ms "
+            f"throughput={result['throughput_per_second']}/s "
+            f"errors={result['errors']}"
+        )
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "profiles": profiles.to_dict(),
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+        f"-{(commit or 'unknown')[:12]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["profiles"] != report["profiles"]:
+            print("Baseline was recorded with other latency profiles")
+            return 1
+        regressions = compare(baseline, report, args.regression_threshold)
+        if regressions:
+            print(f"{len(regressions)} metrics regressed beyond threshold")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
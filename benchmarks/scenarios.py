@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import itertools
+import os
+import tempfile
+import time
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, cast
+
+from botocore.exceptions import ClientError
+
+from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
+    PreSignUpTriggerEvent,
+)
+from aws_lambda_powertools.utilities.data_classes.event_bridge_event import (
+    EventBridgeEvent,
+)
+
+import src.adapters.rate_limits as rate_limits_adapter
+import src.adapters.recaptcha as recaptcha_adapter
+
+from benchmarks.fakes import (
+    FakeCognitoClient,
+    FakeDynamoDBClient,
+    FakeRecaptchaSession,
+    FakeSSMClient,
+    LatencyProfile,
+)
+from benchmarks.stats import summarize
+from src.adapters.ssm import ParameterCache, ParameterSnapshot
+from src.facades.handle_bus_event import handle_bus_event
+from src.facades.process_pre_sign_up import process_pre_sign_up
+from src.services.user.contact_index import (
+    build_contact_key,
+    extract_contact_keys,
+)
+from src.services.user.set_user_as_verified import set_user_as_verified
+from src.settings import (
+    ContactsTableSettings,
+    RateLimitSettings,
+    ReCaptchaSettings,
+    Settings,
+    UserPoolSettings,
+    UsersTableSettings,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+USERS_TABLE_NAME = "benchmark-users"
+CONTACTS_TABLE_NAME = "benchmark-contacts"
+
+UNLIMITED_RATE_LIMITS = RateLimitSettings(
+    cognito_user_creation_per_second=1e9,
+    cognito_user_list_per_second=1e9,
+    cognito_user_update_per_second=1e9,
+)
+
+# Throttling injected by the fakes surfaces as a ClientError, or as the
+# ValueError a service wraps it in. Anything else is a broken scenario and
+# fails the run instead of being counted.
+INJECTED_ERRORS = (ClientError, ValueError)
+
+# Deleted users are remembered per process, so every bus event removes
+# users that no earlier scenario has seen.
+_user_sequence = itertools.count()
+
+
+@dataclass(frozen=True)
+class LatencyProfiles:
+    cognito: LatencyProfile = field(default_factory=LatencyProfile)
+    dynamodb: LatencyProfile = field(default_factory=LatencyProfile)
+    ssm: LatencyProfile = field(default_factory=LatencyProfile)
+    recaptcha: LatencyProfile = field(default_factory=LatencyProfile)
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        return {
+            "cognito": self.cognito.to_dict(),
+            "dynamodb": self.dynamodb.to_dict(),
+            "ssm": self.ssm.to_dict(),
+            "recaptcha": self.recaptcha.to_dict(),
+        }
+
+
+def build_settings() -> Settings:
+    return Settings(
+        recaptcha=ReCaptchaSettings(secret_key="benchmark-secret"),
+        users_table=UsersTableSettings(name=USERS_TABLE_NAME),
+        contacts_table=ContactsTableSettings(name=CONTACTS_TABLE_NAME),
+        user_pool=UserPoolSettings(id="benchmark-pool"),
+    )
+
+
+def build_user_attributes(index: int) -> dict[str, str]:
+    return {
+        "sub": f"user-{index}",
+        "email": f"user-{index}@example.com",
+        "email_verified": "true",
+        "phone_number": f"+1555{index:07d}",
+        "phone_number_verified": "true",
+    }
+
+
+def _measure(
+    invocations: int, run_once: Callable[[int], int]
+) -> tuple[list[float], float, int]:
+    latencies: list[float] = []
+    errors = 0
+
+    started = time.perf_counter()
+    for index in range(invocations):
+        invocation_started = time.perf_counter()
+        try:
+            errors += run_once(index)
+        except INJECTED_ERRORS:
+            errors += 1
+        latencies.append(time.perf_counter() - invocation_started)
+    elapsed = time.perf_counter() - started
+
+    return latencies, elapsed, errors
+
+
+def run_pre_sign_up(profiles: LatencyProfiles, invocations: int) -> dict:
+    settings = build_settings()
+    dynamodb_client = cast(
+        "DynamoDBClient", FakeDynamoDBClient(profiles.dynamodb)
+    )
+    # Tokens are unique per invocation, so the verdict cache never hits.
+    recaptcha_adapter._recaptcha_client = recaptcha_adapter.RecaptchaClient(
+        session_factory=lambda: FakeRecaptchaSession(profiles.recaptcha)
+    )
+
+    def run_once(index: int) -> int:
+        event = PreSignUpTriggerEvent(
+            {
+                "userPoolId": "benchmark-pool",
+                "userName": f"0fcbc418-e084-478c-9af0-{index:012d}",
+                "request": {
+                    "validationData": {"reCaptchaToken": f"token-{index}"},
+                    "userAttributes": build_user_attributes(index),
+                },
+                "response": {},
+            }
+        )
+        process_pre_sign_up(event, settings, dynamodb_client)
+        return 0
+
+    latencies, elapsed, errors = _measure(invocations, run_once)
+    return {
+        "scenario": "process_pre_sign_up",
+        "params": {"invocations": invocations},
+        **summarize(latencies, elapsed, invocations, errors),
+    }
+
+
+def run_post_confirmation(profiles: LatencyProfiles, invocations: int) -> dict:
+    dynamodb_client = cast(
+        "DynamoDBClient", FakeDynamoDBClient(profiles.dynamodb)
+    )
+    now = datetime.now(timezone.utc)
+
+    def run_once(index: int) -> int:
+        user_attributes = build_user_attributes(index)
+        set_user_as_verified(
+            dynamodb_client,
+            USERS_TABLE_NAME,
+            user_attributes["sub"],
+            now,
+            CONTACTS_TABLE_NAME,
+            extract_contact_keys(user_attributes, verified_only=True),
+        )
+        return 0
+
+    latencies, elapsed, errors = _measure(invocations, run_once)
+    return {
+        "scenario": "set_user_as_verified",
+        "params": {"invocations": invocations},
+        **summarize(latencies, elapsed, invocations, errors),
+    }
+
+
+def run_settings_warm_start(
+    profiles: LatencyProfiles, parameter_count: int, invocations: int
+) -> dict:
+    parameters = {
+        f"/benchmark/parameter-{i}": f"value-{i}"
+        for i in range(parameter_count)
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = ParameterSnapshot(os.path.join(directory, "ssm.json"))
+        ParameterCache(
+            lambda: FakeSSMClient(profiles.ssm, parameters), snapshot=snapshot
+        ).get_many(parameters, persist=True)
+
+        def run_once(index: int) -> int:
+            # A re-initialized environment finds the snapshot left in /tmp.
+            cache = ParameterCache(
+                lambda: FakeSSMClient(profiles.ssm, parameters),
+                snapshot=snapshot,
+            )
+            cache.get_many(parameters, persist=True)
+            return 0
+
+        latencies, elapsed, errors = _measure(invocations, run_once)
+
+    return {
+        "scenario": "ssm_parameter_snapshot",
+        "params": {
+            "parameter_count": parameter_count,
+            "invocations": invocations,
+        },
+        **summarize(latencies, elapsed, invocations, errors),
+    }
+
+
+def _bus_event(batch_size: int) -> EventBridgeEvent:
+    return EventBridgeEvent(
+        {
+            "detail": {
+                "Records": [
+                    {
+                        "eventName": "REMOVE",
+                        "dynamodb": {
+                            "Keys": {"user_id": {"S": f"user-{user_number}"}},
+                            "SequenceNumber": str(user_number),
+                        },
+                    }
+                    for user_number in itertools.islice(
+                        _user_sequence, batch_size
+                    )
+                ]
+            }
+        }
+    )
+
+
+def run_bus_event(
+    profiles: LatencyProfiles,
+    batch_size: int,
+    max_workers: int,
+    invocations: int,
+) -> dict:
+    settings = build_settings()
+    cognito_client = cast(
+        "CognitoIdentityProviderClient", FakeCognitoClient(profiles.cognito)
+    )
+    contacts_table = FakeDynamoDBClient(profiles.dynamodb)
+    dynamodb_client = cast("DynamoDBClient", contacts_table)
+    # Quotas are modelled by the throttle rate of the stand-in, the shared
+    # limiter only has to react to its throttling errors.
+    rate_limits_adapter.configure(UNLIMITED_RATE_LIMITS)
+    events = [_bus_event(batch_size) for _ in range(invocations)]
+    # Every removed user holds the email claim of a verified sign up.
+    for event in events:
+        for record in event.detail["Records"]:
+            user_id = record["dynamodb"]["Keys"]["user_id"]["S"]
+            contacts_table.put_contact(
+                CONTACTS_TABLE_NAME,
+                build_contact_key("email", f"{user_id}@example.com"),
+                True,
+                user_id,
+            )
+
+    def run_once(index: int) -> int:
+        report = handle_bus_event(
+            events[index],
+            settings,
+            cognito_client,
+            dynamodb_client,
+            max_workers=max_workers,
+        )
+        return len(report.failed_user_ids)
+
+    latencies, elapsed, errors = _measure(invocations, run_once)
+    return {
+        "scenario": "handle_bus_event",
+        "params": {
+            "batch_size": batch_size,
+            "max_workers": max_workers,
+            "invocations": invocations,
+        },
+        # Throughput counts stream records, errors count failed deletions.
+        **summarize(latencies, elapsed, batch_size * invocations, errors),
+    }
+
+
+def run_settings_refresh(
+    profiles: LatencyProfiles, parameter_count: int, invocations: int
+) -> dict:
+    parameters = {
+        f"/benchmark/parameter-{i}": f"value-{i}"
+        for i in range(parameter_count)
+    }
+    cache = ParameterCache(lambda: FakeSSMClient(profiles.ssm, parameters))
+
+    def run_once(index: int) -> int:
+        # Every invocation is a cold start for the cache.
+        cache.clear()
+        cache.get_many(parameters)
+        return 0
+
+    latencies, elapsed, errors = _measure(invocations, run_once)
+    return {
+        "scenario": "ssm_parameter_cache",
+        "params": {
+            "parameter_count": parameter_count,
+            "invocations": invocations,
+        },
+        **summarize(latencies, elapsed, invocations, errors),
+    }
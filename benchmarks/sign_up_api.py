@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import time
+
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeCognitoClient
+from benchmarks.scenarios import LatencyProfiles
+from benchmarks.stats import summarize
+from src.controllers import sign_up_api
+from src.settings import SignUpApiSettings, Settings
+
+VALID_BODY = json.dumps(
+    {
+        "email": "user@example.com",
+        "password": "correct horse battery",
+        "phoneNumber": "+15555550123",
+        "reCaptchaToken": "token",
+    }
+)
+INVALID_BODY = json.dumps({"email": "not-an-email", "password": "short"})
+
+
+def _event(body: str) -> dict[str, Any]:
+    return {
+        "version": "2.0",
+        "routeKey": "ANY /sign-up/{proxy+}",
+        "rawPath": "/sign-up/",
+        "requestContext": {"http": {"method": "POST"}},
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+REQUEST_KINDS = {
+    "valid": (_event(VALID_BODY), 201),
+    "invalid": (_event(INVALID_BODY), 422),
+    "oversized": (_event("x" * 8192), 413),
+}
+
+
+def run_sign_up_api(profiles: LatencyProfiles, invocations: int) -> list[dict]:
+    settings = Settings(
+        sign_up_api=SignUpApiSettings(client_id="benchmark-client")
+    )
+    cognito_client = FakeCognitoClient(profiles.cognito)
+    # No remaining time on the context, so the deadline stays unbounded.
+    context = SimpleNamespace()
+    results = []
+
+    with (
+        patch.object(sign_up_api, "settings", settings),
+        patch.object(
+            sign_up_api.aws_adapter,
+            "get_cognito_client",
+            return_value=cognito_client,
+        ),
+    ):
+        for kind, (event, expected_status) in REQUEST_KINDS.items():
+            latencies: list[float] = []
+            errors = 0
+            started = time.perf_counter()
+            for _ in range(invocations):
+                request_started = time.perf_counter()
+                response = sign_up_api.lambda_handler(event, context)
+                latencies.append(time.perf_counter() - request_started)
+                if response["statusCode"] != expected_status:
+                    errors += 1
+            elapsed = time.perf_counter() - started
+
+            results.append(
+                {
+                    "scenario": "sign_up_api",
+                    "params": {"request": kind, "invocations": invocations},
+                    # Throughput is requests per second of one warm container.
+                    **summarize(latencies, elapsed, invocations, errors),
+                }
+            )
+
+    return results
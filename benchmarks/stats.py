@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import math
+
+from typing import Sequence
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest rank, so every reported value is an observed sample.
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    latencies_seconds: Sequence[float],
+    elapsed_seconds: float,
+    operations: int,
+    errors: int = 0,
+) -> dict[str, float]:
+    latencies_ms = sorted(latency * 1000 for latency in latencies_seconds)
+    return {
+        "samples": len(latencies_ms),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies_ms, 0.50), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "max_ms": round(latencies_ms[-1], 3) if latencies_ms else 0.0,
+        "throughput_per_second": (
+            round(operations / elapsed_seconds, 3) if elapsed_seconds else 0.0
+        ),
+    }
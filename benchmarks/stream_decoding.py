@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from typing import Any, Callable
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from benchmarks.stats import summarize
+from src.adapters.stream_records import (
+    StreamRecordDispatcher,
+    iter_user_stream_records,
+)
+
+
+def _stream_detail(record_count: int) -> dict[str, Any]:
+    event_names = ("INSERT", "MODIFY", "REMOVE")
+    return {
+        "Records": [
+            {
+                "eventID": f"event-{i}",
+                "eventName": event_names[i % len(event_names)],
+                "dynamodb": {
+                    "Keys": {"user_id": {"S": f"user-{i}"}},
+                    "SequenceNumber": str(i),
+                    "SizeBytes": 64,
+                },
+            }
+            for i in range(record_count)
+        ]
+    }
+
+
+def decode_with_deserializer(detail: dict[str, Any]) -> list[str]:
+    # The decoder handle_bus_event used before the streaming one, kept as
+    # the baseline of this benchmark.
+    deserializer = TypeDeserializer()
+    records = filter(
+        lambda record: record.get("eventName") == "REMOVE",
+        detail.get("Records") or [],
+    )
+    user_ids: list[str] = []
+    for record in records:
+        keys = record.get("dynamodb", {}).get("Keys", {})
+        user_id = deserializer.deserialize({"M": keys}).get("user_id")
+        if user_id:
+            user_ids.append(user_id)
+    return user_ids
+
+
+def decode_streaming(detail: dict[str, Any]) -> list[str]:
+    user_ids: list[str] = []
+    dispatcher = StreamRecordDispatcher()
+    dispatcher.register(
+        "REMOVE", lambda record: user_ids.append(record.user_id)
+    )
+    dispatcher.dispatch(
+        iter_user_stream_records(detail, dispatcher.event_names)
+    )
+    return user_ids
+
+
+DECODERS: dict[str, Callable[[dict[str, Any]], list[str]]] = {
+    "deserializer": decode_with_deserializer,
+    "streaming": decode_streaming,
+}
+
+
+def run_stream_decoding(record_count: int, invocations: int) -> list[dict]:
+    detail = _stream_detail(record_count)
+    results = []
+
+    for decoder_name, decode in DECODERS.items():
+        latencies: list[float] = []
+        started = time.perf_counter()
+        for _ in range(invocations):
+            invocation_started = time.perf_counter()
+            decode(detail)
+            latencies.append(time.perf_counter() - invocation_started)
+        elapsed = time.perf_counter() - started
+
+        # Measured apart from the timings, tracing slows allocations down.
+        tracemalloc.start()
+        decode(detail)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append(
+            {
+                "scenario": "stream_decoding",
+                "params": {
+                    "decoder": decoder_name,
+                    "record_count": record_count,
+                    "invocations": invocations,
+                },
+                "peak_memory_bytes": peak_bytes,
+                **summarize(latencies, elapsed, record_count * invocations),
+            }
+        )
+
+    return results
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterator, Optional, cast
+
+import src.adapters.rate_limits as rate_limits_adapter
+
+from benchmarks.scenarios import UNLIMITED_RATE_LIMITS
+from benchmarks.stats import summarize
+from src.adapters.aws import CognitoUser
+from src.services.user.list_pool_users import list_pool_users
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+
+USER_VIEW_USERS = 100_000
+LIST_USERS_PAGE_SIZE = 60
+USER_REPRESENTATIONS = ("dict", "view")
+
+
+class SyntheticUserPool:
+    # Pages are built on every call, the way botocore parses a response.
+    def __init__(self, user_count: int):
+        self._user_count = user_count
+        self._now = datetime.now(timezone.utc)
+
+    def list_users(self, **kwargs: Any) -> dict[str, Any]:
+        start = int(kwargs.get("PaginationToken", 0))
+        end = min(self._user_count, start + LIST_USERS_PAGE_SIZE)
+        response: dict[str, Any] = {
+            "Users": [
+                {
+                    "Username": f"0fcbc418-e084-478c-9af0-{index:012d}",
+                    "Attributes": [
+                        {"Name": "sub", "Value": f"sub-{index:012d}"},
+                        {"Name": "email", "Value": f"user-{index}@example.com"},
+                        {"Name": "email_verified", "Value": "true"},
+                        {"Name": "phone_number", "Value": f"+1555{index:07d}"},
+                        {"Name": "phone_number_verified", "Value": "false"},
+                        {"Name": "custom:tenant", "Value": f"tenant-{index}"},
+                    ],
+                    "UserCreateDate": self._now,
+                    "UserLastModifiedDate": self._now,
+                    "Enabled": True,
+                    "UserStatus": "CONFIRMED",
+                }
+                for index in range(start, end)
+            ],
+            "ResponseMetadata": {
+                "RequestId": f"request-{start}",
+                "HTTPStatusCode": 200,
+                "HTTPHeaders": {"content-type": "application/x-amz-json-1.1"},
+                "RetryAttempts": 0,
+            },
+        }
+        if end < self._user_count:
+            response["PaginationToken"] = str(end)
+        return response
+
+
+def _list_user_dicts(pool: SyntheticUserPool) -> Iterator[dict[str, Any]]:
+    # How listing code kept users before the compact view.
+    request: dict[str, Any] = {}
+    while True:
+        response = pool.list_users(**request)
+        yield from response["Users"]
+        if "PaginationToken" not in response:
+            return
+        request["PaginationToken"] = response["PaginationToken"]
+
+
+def run_user_view(representation: str, user_count: int) -> dict:
+    rate_limits_adapter.configure(UNLIMITED_RATE_LIMITS)
+    pool = SyntheticUserPool(user_count)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Each user's email is read as it is listed and the user is kept, like
+    # a caller that collects a listing before acting on it.
+    user_dicts: list[dict[str, Any]] = []
+    user_views: list[CognitoUser] = []
+    emails = 0
+    started = time.perf_counter()
+    if representation == "dict":
+        for user_dict in _list_user_dicts(pool):
+            emails += any(
+                attribute["Name"] == "email" and attribute["Value"]
+                for attribute in user_dict["Attributes"]
+            )
+            user_dicts.append(user_dict)
+    else:
+        cognito_client = cast("CognitoIdentityProviderClient", pool)
+        for user_view in list_pool_users(cognito_client, "benchmark-pool"):
+            emails += bool(user_view.email)
+            user_views.append(user_view)
+    elapsed = time.perf_counter() - started
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "scenario": "list_users_memory",
+        "params": {"representation": representation, "users": user_count},
+        "emails": emails,
+        # Kilobytes on Linux, meaningful in a process of its own.
+        "max_rss_kb": max_rss_kb,
+        "rss_growth_kb": max_rss_kb - baseline_kb,
+        **summarize([elapsed], elapsed, user_count),
+    }
+
+
+def run_user_view_isolated(representation: str, user_count: int) -> dict:
+    # Each run gets a fresh interpreter so its peak memory is its own.
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.user_view",
+            f"--representation={representation}",
+            f"--users={user_count}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.user_view")
+    parser.add_argument(
+        "--representation", choices=USER_REPRESENTATIONS, default="view"
+    )
+    parser.add_argument("--users", type=int, default=USER_VIEW_USERS)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_user_view(args.representation, args.users)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 module "apis" {
   source = "./apis"
 
-  lambda_logging_arn = data.aws_iam_policy.lambda_logging.arn
-  api_gateway_id     = data.aws_ssm_parameter.api_gateway_id.value
+  lambda_logging_arn  = data.aws_iam_policy.lambda_logging.arn
+  api_gateway_id      = data.aws_ssm_parameter.api_gateway_id.value
+  user_pool_client_id = aws_cognito_user_pool_client.frontend_client.id
 
 }
@@ -30,6 +30,14 @@ resource "aws_lambda_function" "user_management_sign_up" {
   memory_size   = 128
   timeout       = 10
 
+  environment {
+    variables = {
+      POWERTOOLS_SERVICE_NAME         = "sign-up-api"
+      APP_SIGN_UP_API__CLIENT_ID      = var.user_pool_client_id
+      APP_SIGN_UP_API__MAX_BODY_BYTES = "4096"
+    }
+  }
+
   logging_config {
     log_format            = "JSON"
     application_log_level = "INFO"
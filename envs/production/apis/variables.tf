@@ -3,6 +3,11 @@ variable "lambda_logging_arn" {
   type        = string
 }
 
+variable "user_pool_client_id" {
+  description = "The ID of the Cognito app client users sign up through"
+  type        = string
+}
+
 variable "api_gateway_id" {
   description = "The ID of the API Gateway for the user management service"
   type        = string
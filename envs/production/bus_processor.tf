@@ -29,6 +29,28 @@ data "aws_iam_policy_document" "user_management_bus_processor" {
     ]
     resources = [aws_cognito_user_pool.user_pool.arn]
   }
+
+  // Releases the contact claims of deleted users.
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:Query",
+      "dynamodb:DeleteItem",
+    ]
+    resources = [
+      aws_dynamodb_table.user_contacts.arn,
+      "${aws_dynamodb_table.user_contacts.arn}/index/*",
+    ]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "ssm:GetParameters",
+      "kms:Decrypt",
+    ]
+    resources = ["*"]
+  }
 }
 
 resource "aws_iam_policy" "user_management_bus_processor" {
@@ -51,6 +73,14 @@ resource "aws_lambda_function" "user_management_bus_processor" {
   memory_size   = 128
   timeout       = 10
 
+  environment {
+    variables = {
+      POWERTOOLS_SERVICE_NAME  = "bus-processor"
+      APP_USER_POOL__ID        = aws_ssm_parameter.cleanup_user_pool_id.name
+      APP_CONTACTS_TABLE__NAME = aws_dynamodb_table.user_contacts.name
+    }
+  }
+
   logging_config {
     log_format            = "JSON"
     application_log_level = "INFO"
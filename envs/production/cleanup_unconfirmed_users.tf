@@ -0,0 +1,125 @@
+// Settings resolve cleanup.user_pool_id through SSM.
+resource "aws_ssm_parameter" "cleanup_user_pool_id" {
+  name  = "/user-management/cleanup/user-pool-id"
+  type  = "String"
+  value = aws_cognito_user_pool.user_pool.id
+}
+
+data "aws_iam_policy_document" "user_management_cleanup_unconfirmed_users_lambda_assume" {
+  statement {
+    effect  = "Allow"
+    actions = ["sts:AssumeRole"]
+
+    principals {
+      type        = "Service"
+      identifiers = ["lambda.amazonaws.com"]
+    }
+  }
+}
+
+resource "aws_iam_role" "user_management_cleanup_unconfirmed_users" {
+  name               = "user-management-cleanup-unconfirmed-users"
+  assume_role_policy = data.aws_iam_policy_document.user_management_cleanup_unconfirmed_users_lambda_assume.json
+  path               = "/service/"
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_cleanup_unconfirmed_users_logging" {
+  role       = aws_iam_role.user_management_cleanup_unconfirmed_users.name
+  policy_arn = data.aws_iam_policy.lambda_logging.arn
+}
+
+data "aws_iam_policy_document" "user_management_cleanup_unconfirmed_users" {
+  statement {
+    effect = "Allow"
+    actions = [
+      "cognito-idp:ListUsers",
+      "cognito-idp:AdminDeleteUser",
+    ]
+    resources = [aws_cognito_user_pool.user_pool.arn]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:GetItem",
+      "dynamodb:PutItem",
+      "dynamodb:DeleteItem",
+    ]
+    resources = [aws_dynamodb_table.user_management_jobs.arn]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "ssm:GetParameters",
+    ]
+    resources = [aws_ssm_parameter.cleanup_user_pool_id.arn]
+  }
+}
+
+resource "aws_iam_policy" "user_management_cleanup_unconfirmed_users" {
+  name   = "user-management-cleanup-unconfirmed-users"
+  path   = "/service/"
+  policy = data.aws_iam_policy_document.user_management_cleanup_unconfirmed_users.json
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_cleanup_unconfirmed_users" {
+  role       = aws_iam_role.user_management_cleanup_unconfirmed_users.name
+  policy_arn = aws_iam_policy.user_management_cleanup_unconfirmed_users.arn
+}
+
+resource "aws_lambda_function" "user_management_cleanup_unconfirmed_users" {
+  filename      = "${path.module}/dummy_lambda.zip"
+  runtime       = "python3.13"
+  handler       = "index.handler"
+  function_name = "user-management-cleanup-unconfirmed-users"
+  role          = aws_iam_role.user_management_cleanup_unconfirmed_users.arn
+  memory_size   = 128
+  timeout       = 300
+
+  // A single sweep at a time keeps deletions within the configured rate.
+  reserved_concurrent_executions = 1
+
+  environment {
+    variables = {
+      POWERTOOLS_SERVICE_NAME         = "cleanup-unconfirmed-users"
+      APP_CLEANUP__USER_POOL_ID       = aws_ssm_parameter.cleanup_user_pool_id.name
+      APP_CLEANUP__GRACE_PERIOD_HOURS = "24"
+      APP_JOBS_TABLE__NAME            = aws_dynamodb_table.user_management_jobs.name
+      # Leaves most of the user update quota to the bus processor.
+      APP_RATE_LIMITS__COGNITO_USER_UPDATE_PER_SECOND = "10"
+    }
+  }
+
+  logging_config {
+    log_format            = "JSON"
+    application_log_level = "INFO"
+    system_log_level      = "WARN"
+  }
+
+  lifecycle {
+    ignore_changes = [
+      runtime,
+      handler,
+    ]
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "user_management_cleanup_unconfirmed_users" {
+  name                = "user-management-cleanup-unconfirmed-users"
+  schedule_expression = "rate(1 hour)"
+}
+
+resource "aws_cloudwatch_event_target" "user_management_cleanup_unconfirmed_users" {
+  rule      = aws_cloudwatch_event_rule.user_management_cleanup_unconfirmed_users.name
+  target_id = "user-management-cleanup-unconfirmed-users"
+  arn       = aws_lambda_function.user_management_cleanup_unconfirmed_users.arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_to_invoke_user_management_cleanup_unconfirmed_users" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.user_management_cleanup_unconfirmed_users.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.user_management_cleanup_unconfirmed_users.arn
+}
@@ -5,9 +5,16 @@ locals {
         PARAMETERS_SECRETS_EXTENSION_LOG_LEVEL = "INFO"
         POWERTOOLS_LOG_LEVEL                   = "INFO"
         POWERTOOLS_SERVICE_NAME                = "pre-sign-up-trigger"
-        # APP_RECAPTCHA__SECRET_KEY                        = "/saas-manual-inputs/recaptcha/secret-key"
+        APP_RECAPTCHA__SECRET_KEY                        = "/saas-manual-inputs/recaptcha/secret-key"
         APP_USERS_TABLE__NAME                            = data.aws_ssm_parameter.user_management["user_management_users_table_name"].value
         APP_USERS_TABLE__EXPIRE_UNVERIFIED_USERS_MINUTES = "360"
+        APP_CONTACTS_TABLE__NAME                         = aws_dynamodb_table.user_contacts.name
+        APP_IDEMPOTENCY__TABLE_NAME                      = aws_dynamodb_table.user_management_idempotency.name
+        APP_AWS_CLIENTS__WARM_UP                         = "true"
+        APP_AWS_CLIENTS__WARM_UP_BUDGET_SECONDS          = "4"
+        APP_CONTACT_FILTER__SNAPSHOT_BUCKET              = aws_s3_bucket.contact_filter.bucket
+        APP_POSTHOG__API_KEY                             = "/saas-manual-inputs/posthog/api-key"
+        APP_POSTHOG__API_HOST                            = "/saas-manual-inputs/posthog/api-host"
       })
     },
     post-confirmation-trigger = {
@@ -15,8 +22,12 @@ locals {
         PARAMETERS_SECRETS_EXTENSION_LOG_LEVEL = "INFO"
         POWERTOOLS_LOG_LEVEL                   = "INFO"
         POWERTOOLS_SERVICE_NAME                = "post-confirmation-trigger"
-        APP_PHOSTHOG__API_KEY                  = "/saas-manual-inputs/posthog/api-key"
-        APP_PHOSTHOG__API_HOST                 = "/saas-manual-inputs/posthog/api-host"
+        APP_CONTACTS_TABLE__NAME               = aws_dynamodb_table.user_contacts.name
+        APP_IDEMPOTENCY__TABLE_NAME            = aws_dynamodb_table.user_management_idempotency.name
+        APP_AWS_CLIENTS__WARM_UP               = "true"
+        APP_AWS_CLIENTS__WARM_UP_BUDGET_SECONDS = "4"
+        APP_POSTHOG__API_KEY                   = "/saas-manual-inputs/posthog/api-key"
+        APP_POSTHOG__API_HOST                  = "/saas-manual-inputs/posthog/api-host"
       })
     },
   }
@@ -60,9 +71,11 @@ resource "aws_iam_policy" "cognito_lambdas" {
         Effect = "Allow"
         Action = [
           "ssm:GetParameter",
+          "ssm:GetParameters",
           "kms:Decrypt",
           "cognito-idp:AdminDeleteUser",
           "cognito-idp:ListUsers",
+          "dynamodb:DescribeEndpoints",
         ]
         Resource = "*"
       },
@@ -74,6 +87,30 @@ resource "aws_iam_policy" "cognito_lambdas" {
         ]
         Resource = data.aws_ssm_parameter.user_management["user_management_users_table_arn"].value
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+        ]
+        Resource = aws_dynamodb_table.user_contacts.arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem",
+        ]
+        Resource = aws_dynamodb_table.user_management_idempotency.arn
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["s3:GetObject"]
+        Resource = "${aws_s3_bucket.contact_filter.arn}/contact-filter/*"
+      },
     ]
   })
 }
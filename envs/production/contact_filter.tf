@@ -0,0 +1,148 @@
+resource "aws_s3_bucket" "contact_filter" {
+  bucket_prefix = "user-management-contact-filter-"
+}
+
+resource "aws_s3_bucket_public_access_block" "contact_filter" {
+  bucket                  = aws_s3_bucket.contact_filter.id
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+data "aws_iam_policy_document" "user_management_contact_filter_updater_lambda_assume" {
+  statement {
+    effect  = "Allow"
+    actions = ["sts:AssumeRole"]
+
+    principals {
+      type        = "Service"
+      identifiers = ["lambda.amazonaws.com"]
+    }
+  }
+}
+
+resource "aws_iam_role" "user_management_contact_filter_updater" {
+  name               = "user-management-contact-filter-updater"
+  assume_role_policy = data.aws_iam_policy_document.user_management_contact_filter_updater_lambda_assume.json
+  path               = "/service/"
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_contact_filter_updater_logging" {
+  role       = aws_iam_role.user_management_contact_filter_updater.name
+  policy_arn = data.aws_iam_policy.lambda_logging.arn
+}
+
+data "aws_iam_policy_document" "user_management_contact_filter_updater" {
+  statement {
+    effect    = "Allow"
+    actions   = ["dynamodb:Scan"]
+    resources = [aws_dynamodb_table.user_contacts.arn]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:DescribeStream",
+      "dynamodb:GetRecords",
+      "dynamodb:GetShardIterator",
+      "dynamodb:ListStreams",
+    ]
+    resources = [aws_dynamodb_table.user_contacts.stream_arn]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "s3:GetObject",
+      "s3:PutObject",
+    ]
+    resources = ["${aws_s3_bucket.contact_filter.arn}/contact-filter/*"]
+  }
+}
+
+resource "aws_iam_policy" "user_management_contact_filter_updater" {
+  name   = "user-management-contact-filter-updater"
+  path   = "/service/"
+  policy = data.aws_iam_policy_document.user_management_contact_filter_updater.json
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_contact_filter_updater" {
+  role       = aws_iam_role.user_management_contact_filter_updater.name
+  policy_arn = aws_iam_policy.user_management_contact_filter_updater.arn
+}
+
+resource "aws_lambda_function" "user_management_contact_filter_updater" {
+  filename      = "${path.module}/dummy_lambda.zip"
+  runtime       = "python3.13"
+  handler       = "index.handler"
+  function_name = "user-management-contact-filter-updater"
+  role          = aws_iam_role.user_management_contact_filter_updater.arn
+  memory_size   = 256
+  timeout       = 300
+
+  // Stream batches and rebuilds rewrite the same snapshot, one at a time.
+  reserved_concurrent_executions = 1
+
+  environment {
+    variables = {
+      POWERTOOLS_SERVICE_NAME             = "contact-filter-updater"
+      APP_CONTACTS_TABLE__NAME            = aws_dynamodb_table.user_contacts.name
+      APP_CONTACT_FILTER__SNAPSHOT_BUCKET = aws_s3_bucket.contact_filter.bucket
+    }
+  }
+
+  logging_config {
+    log_format            = "JSON"
+    application_log_level = "INFO"
+    system_log_level      = "WARN"
+  }
+
+  lifecycle {
+    ignore_changes = [
+      runtime,
+      handler,
+    ]
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "user_management_contact_filter_updater" {
+  event_source_arn                   = aws_dynamodb_table.user_contacts.stream_arn
+  function_name                      = aws_lambda_function.user_management_contact_filter_updater.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 1000
+  maximum_batching_window_in_seconds = 30
+
+  filter_criteria {
+    filter {
+      pattern = jsonencode({
+        eventName = ["INSERT", "MODIFY"]
+        dynamodb = {
+          NewImage = {
+            verified = { BOOL = [true] }
+          }
+        }
+      })
+    }
+  }
+}
+
+// The daily rebuild drops deleted contacts and resizes the filter.
+resource "aws_cloudwatch_event_rule" "user_management_contact_filter_updater" {
+  name                = "user-management-contact-filter-updater"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "user_management_contact_filter_updater" {
+  rule      = aws_cloudwatch_event_rule.user_management_contact_filter_updater.name
+  target_id = "user-management-contact-filter-updater"
+  arn       = aws_lambda_function.user_management_contact_filter_updater.arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_to_invoke_user_management_contact_filter_updater" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.user_management_contact_filter_updater.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.user_management_contact_filter_updater.arn
+}
@@ -0,0 +1,35 @@
+resource "aws_dynamodb_table" "user_contacts" {
+  name         = "user-management-user-contacts"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "contact"
+
+  // Feeds verified contacts to the contact filter updater.
+  stream_enabled   = true
+  stream_view_type = "NEW_IMAGE"
+
+  attribute {
+    name = "contact"
+    type = "S"
+  }
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  // Finds the claims of a deleted user so they can be released.
+  global_secondary_index {
+    name            = "user_id-index"
+    hash_key        = "user_id"
+    projection_type = "KEYS_ONLY"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  point_in_time_recovery {
+    enabled = true
+  }
+}
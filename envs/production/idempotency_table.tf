@@ -0,0 +1,15 @@
+resource "aws_dynamodb_table" "user_management_idempotency" {
+  name         = "user-management-idempotency"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "idempotency_key"
+
+  attribute {
+    name = "idempotency_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
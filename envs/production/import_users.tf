@@ -0,0 +1,109 @@
+// Tenant migrations upload CSV or JSONL files here, then invoke the import
+// lambda with {"bucket": ..., "key": ...} until it reports completed.
+resource "aws_s3_bucket" "user_imports" {
+  bucket_prefix = "user-management-imports-"
+}
+
+resource "aws_s3_bucket_public_access_block" "user_imports" {
+  bucket                  = aws_s3_bucket.user_imports.id
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+data "aws_iam_policy_document" "user_management_import_users_lambda_assume" {
+  statement {
+    effect  = "Allow"
+    actions = ["sts:AssumeRole"]
+
+    principals {
+      type        = "Service"
+      identifiers = ["lambda.amazonaws.com"]
+    }
+  }
+}
+
+resource "aws_iam_role" "user_management_import_users" {
+  name               = "user-management-import-users"
+  assume_role_policy = data.aws_iam_policy_document.user_management_import_users_lambda_assume.json
+  path               = "/service/"
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_import_users_logging" {
+  role       = aws_iam_role.user_management_import_users.name
+  policy_arn = data.aws_iam_policy.lambda_logging.arn
+}
+
+data "aws_iam_policy_document" "user_management_import_users" {
+  statement {
+    effect    = "Allow"
+    actions   = ["s3:GetObject"]
+    resources = ["${aws_s3_bucket.user_imports.arn}/*"]
+  }
+
+  // Each user is written with its contact claims in one transaction.
+  statement {
+    effect  = "Allow"
+    actions = ["dynamodb:PutItem"]
+    resources = [
+      data.aws_ssm_parameter.user_management["user_management_users_table_arn"].value,
+      aws_dynamodb_table.user_contacts.arn,
+    ]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:GetItem",
+      "dynamodb:PutItem",
+      "dynamodb:DeleteItem",
+    ]
+    resources = [aws_dynamodb_table.user_management_jobs.arn]
+  }
+}
+
+resource "aws_iam_policy" "user_management_import_users" {
+  name   = "user-management-import-users"
+  path   = "/service/"
+  policy = data.aws_iam_policy_document.user_management_import_users.json
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_import_users" {
+  role       = aws_iam_role.user_management_import_users.name
+  policy_arn = aws_iam_policy.user_management_import_users.arn
+}
+
+resource "aws_lambda_function" "user_management_import_users" {
+  filename      = "${path.module}/dummy_lambda.zip"
+  runtime       = "python3.13"
+  handler       = "index.handler"
+  function_name = "user-management-import-users"
+  role          = aws_iam_role.user_management_import_users.arn
+  memory_size   = 512
+  timeout       = 900
+
+  environment {
+    variables = {
+      POWERTOOLS_SERVICE_NAME               = "import-users"
+      APP_USERS_TABLE__NAME                 = data.aws_ssm_parameter.user_management["user_management_users_table_name"].value
+      APP_CONTACTS_TABLE__NAME              = aws_dynamodb_table.user_contacts.name
+      APP_JOBS_TABLE__NAME                  = aws_dynamodb_table.user_management_jobs.name
+      APP_USER_IMPORT__MAX_WORKERS          = "8"
+      APP_AWS_CLIENTS__MAX_POOL_CONNECTIONS = "8"
+    }
+  }
+
+  logging_config {
+    log_format            = "JSON"
+    application_log_level = "INFO"
+    system_log_level      = "WARN"
+  }
+
+  lifecycle {
+    ignore_changes = [
+      runtime,
+      handler,
+    ]
+  }
+}
@@ -0,0 +1,15 @@
+resource "aws_dynamodb_table" "user_management_jobs" {
+  name         = "user-management-jobs"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "job_id"
+
+  attribute {
+    name = "job_id"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
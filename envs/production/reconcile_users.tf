@@ -0,0 +1,133 @@
+data "aws_iam_policy_document" "user_management_reconcile_users_lambda_assume" {
+  statement {
+    effect  = "Allow"
+    actions = ["sts:AssumeRole"]
+
+    principals {
+      type        = "Service"
+      identifiers = ["lambda.amazonaws.com"]
+    }
+  }
+}
+
+resource "aws_iam_role" "user_management_reconcile_users" {
+  name               = "user-management-reconcile-users"
+  assume_role_policy = data.aws_iam_policy_document.user_management_reconcile_users_lambda_assume.json
+  path               = "/service/"
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_reconcile_users_logging" {
+  role       = aws_iam_role.user_management_reconcile_users.name
+  policy_arn = data.aws_iam_policy.lambda_logging.arn
+}
+
+data "aws_iam_policy_document" "user_management_reconcile_users" {
+  statement {
+    effect = "Allow"
+    actions = [
+      "cognito-idp:ListUsers",
+      "cognito-idp:AdminDeleteUser",
+    ]
+    resources = [aws_cognito_user_pool.user_pool.arn]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:Scan",
+      "dynamodb:UpdateItem",
+    ]
+    resources = [data.aws_ssm_parameter.user_management["user_management_users_table_arn"].value]
+  }
+
+  statement {
+    effect = "Allow"
+    actions = [
+      "dynamodb:Query",
+      "dynamodb:UpdateItem",
+      "dynamodb:DeleteItem",
+    ]
+    resources = [
+      aws_dynamodb_table.user_contacts.arn,
+      "${aws_dynamodb_table.user_contacts.arn}/index/*",
+    ]
+  }
+
+  statement {
+    effect    = "Allow"
+    actions   = ["ssm:GetParameters"]
+    resources = [aws_ssm_parameter.cleanup_user_pool_id.arn]
+  }
+}
+
+resource "aws_iam_policy" "user_management_reconcile_users" {
+  name   = "user-management-reconcile-users"
+  path   = "/service/"
+  policy = data.aws_iam_policy_document.user_management_reconcile_users.json
+}
+
+resource "aws_iam_role_policy_attachment" "user_management_reconcile_users" {
+  role       = aws_iam_role.user_management_reconcile_users.name
+  policy_arn = aws_iam_policy.user_management_reconcile_users.arn
+}
+
+resource "aws_lambda_function" "user_management_reconcile_users" {
+  filename      = "${path.module}/dummy_lambda.zip"
+  runtime       = "python3.13"
+  handler       = "index.handler"
+  function_name = "user-management-reconcile-users"
+  role          = aws_iam_role.user_management_reconcile_users.arn
+  memory_size   = 512
+  timeout       = 900
+
+  // Sorted runs of both sides are spilled to /tmp.
+  ephemeral_storage {
+    size = 2048
+  }
+
+  reserved_concurrent_executions = 1
+
+  environment {
+    variables = {
+      POWERTOOLS_SERVICE_NAME  = "reconcile-users"
+      APP_USER_POOL__ID        = aws_ssm_parameter.cleanup_user_pool_id.name
+      APP_USERS_TABLE__NAME    = data.aws_ssm_parameter.user_management["user_management_users_table_name"].value
+      APP_CONTACTS_TABLE__NAME = aws_dynamodb_table.user_contacts.name
+      # Leaves most of the user list quota to the cleanup sweep.
+      APP_RATE_LIMITS__COGNITO_USER_LIST_PER_SECOND = "10"
+    }
+  }
+
+  logging_config {
+    log_format            = "JSON"
+    application_log_level = "INFO"
+    system_log_level      = "WARN"
+  }
+
+  lifecycle {
+    ignore_changes = [
+      runtime,
+      handler,
+    ]
+  }
+}
+
+// Reports only, invoke with {"repair": true} to fix what it found.
+resource "aws_cloudwatch_event_rule" "user_management_reconcile_users" {
+  name                = "user-management-reconcile-users"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "user_management_reconcile_users" {
+  rule      = aws_cloudwatch_event_rule.user_management_reconcile_users.name
+  target_id = "user-management-reconcile-users"
+  arn       = aws_lambda_function.user_management_reconcile_users.arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_to_invoke_user_management_reconcile_users" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.user_management_reconcile_users.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.user_management_reconcile_users.arn
+}
@@ -0,0 +1,23 @@
+# Keeps an initialized environment around for the Cognito triggers, which
+# have to answer within Cognito's 5 second window.
+resource "aws_cloudwatch_event_rule" "cognito_lambdas_warm_up" {
+  name                = "cognito-lambdas-warm-up"
+  schedule_expression = "rate(5 minutes)"
+}
+
+resource "aws_cloudwatch_event_target" "cognito_lambdas_warm_up" {
+  for_each  = local.cognito_lambdas_keys
+  rule      = aws_cloudwatch_event_rule.cognito_lambdas_warm_up.name
+  target_id = "warm-up-${each.key}"
+  arn       = aws_lambda_function.cognito_lambdas[each.key].arn
+  input     = jsonencode({ warmUp = true })
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_to_warm_up_cognito_lambdas" {
+  for_each      = local.cognito_lambdas_keys
+  statement_id  = "AllowWarmUpFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.cognito_lambdas[each.key].function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.cognito_lambdas_warm_up.arn
+}
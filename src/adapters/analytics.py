@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import gzip
+import json
+import queue
+import threading
+import time
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional
+
+from src.adapters.deadline import Deadline
+
+if TYPE_CHECKING:
+    from requests import Session
+
+    from src.settings import PosthogSettings, Settings
+
+USER_SIGNED_UP = "user signed up"
+USER_VERIFIED = "user verified"
+USER_DELETED = "user deleted"
+
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_SEND_TIMEOUT_SECONDS = 2.0
+DEFAULT_FLUSH_TIMEOUT_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class AnalyticsStats:
+    delivered: int
+    dropped: int
+    pending: int
+
+
+def _build_session() -> Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # Batches are sent one at a time by a single thread.
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    return session
+
+
+class AnalyticsClient:
+    def __init__(
+        self,
+        resolve_target: Callable[[], tuple[str, str]],
+        session_factory: Callable[[], Any] = _build_session,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        send_timeout_seconds: float = DEFAULT_SEND_TIMEOUT_SECONDS,
+        flush_timeout_seconds: float = DEFAULT_FLUSH_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        # The API key and host are only needed by the sender thread, so
+        # resolving them never holds up a handler.
+        self._resolve_target = resolve_target
+        self._session_factory = session_factory
+        self._session: Optional[Any] = None
+        self._max_batch_size = max_batch_size
+        self._send_timeout_seconds = send_timeout_seconds
+        self.flush_timeout_seconds = flush_timeout_seconds
+        self._clock = clock
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(max_queue_size)
+        self._settled = threading.Condition()
+        self._pending = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._sender_thread: Optional[threading.Thread] = None
+
+    def capture(
+        self,
+        event: str,
+        distinct_id: str,
+        properties: Optional[Mapping[str, Any]] = None,
+    ) -> bool:
+        captured = {
+            "event": event,
+            "distinct_id": distinct_id,
+            "properties": dict(properties or {}),
+            "timestamp": datetime.fromtimestamp(
+                self._clock(), timezone.utc
+            ).isoformat(),
+        }
+        with self._settled:
+            try:
+                self._queue.put_nowait(captured)
+            except queue.Full:
+                # Analytics never slow a handler down, a full buffer drops.
+                self._dropped += 1
+                return False
+            self._pending += 1
+        self._ensure_sender()
+        return True
+
+    def flush(self, timeout: float) -> bool:
+        # Events still pending on timeout stay queued, the sender picks
+        # them up again once the environment is thawed.
+        with self._settled:
+            return self._settled.wait_for(
+                lambda: self._pending == 0, max(0.0, timeout)
+            )
+
+    def stats(self) -> AnalyticsStats:
+        with self._settled:
+            return AnalyticsStats(
+                delivered=self._delivered,
+                dropped=self._dropped,
+                pending=self._pending,
+            )
+
+    def _ensure_sender(self) -> None:
+        with self._settled:
+            if self._sender_thread and self._sender_thread.is_alive():
+                return
+            self._sender_thread = threading.Thread(
+                target=self._send_forever,
+                name="analytics-sender",
+                daemon=True,
+            )
+            self._sender_thread.start()
+
+    def _send_forever(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            delivered = self._send(batch)
+            with self._settled:
+                if delivered:
+                    self._delivered += len(batch)
+                else:
+                    self._dropped += len(batch)
+                self._pending -= len(batch)
+                self._settled.notify_all()
+
+    def _send(self, batch: list[dict[str, Any]]) -> bool:
+        try:
+            api_key, api_host = self._resolve_target()
+            body = gzip.compress(
+                json.dumps({"api_key": api_key, "batch": batch}).encode()
+            )
+            response = self._get_session().post(
+                f"{api_host.rstrip('/')}/batch/",
+                data=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Content-Encoding": "gzip",
+                },
+                timeout=self._send_timeout_seconds,
+            )
+            response.raise_for_status()
+        except Exception:
+            return False
+        return True
+
+    def _get_session(self) -> Any:
+        if not self._session:
+            self._session = self._session_factory()
+        return self._session
+
+
+_analytics_client: Optional[AnalyticsClient] = None
+_analytics_client_lock = threading.Lock()
+
+
+def _build_client(
+    settings: Settings, posthog: PosthogSettings
+) -> AnalyticsClient:
+    def resolve_target() -> tuple[str, str]:
+        posthog_settings = settings.ensure_posthog_settings()
+        return posthog_settings.api_key, posthog_settings.api_host
+
+    return AnalyticsClient(
+        resolve_target,
+        max_queue_size=posthog.max_queue_size,
+        max_batch_size=posthog.max_batch_size,
+        send_timeout_seconds=posthog.send_timeout_seconds,
+        flush_timeout_seconds=posthog.flush_timeout_seconds,
+    )
+
+
+def get_analytics_client(settings: Settings) -> Optional[AnalyticsClient]:
+    global _analytics_client
+    if not settings.posthog:
+        return None
+    if not _analytics_client:
+        with _analytics_client_lock:
+            if not _analytics_client:
+                _analytics_client = _build_client(settings, settings.posthog)
+    return _analytics_client
+
+
+def capture(
+    settings: Settings,
+    event: str,
+    distinct_id: str,
+    properties: Optional[Mapping[str, Any]] = None,
+) -> None:
+    analytics_client = get_analytics_client(settings)
+    if analytics_client:
+        analytics_client.capture(event, distinct_id, properties)
+
+
+def flush(deadline: Deadline) -> bool:
+    analytics_client = _analytics_client
+    if not analytics_client:
+        return True
+    return analytics_client.flush(
+        min(
+            analytics_client.flush_timeout_seconds,
+            deadline.remaining_seconds(),
+        )
+    )
@@ -0,0 +1,148 @@
+import gzip
+import json
+import threading
+import time
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import requests
+
+from src.adapters.analytics import AnalyticsClient, get_analytics_client
+
+
+class PosthogStandIn(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _BatchHandler)
+        self.batches = []
+        self.status = 200
+        self.release = threading.Event()
+        self.release.set()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _BatchHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.server.release.wait()
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.server.batches.append((self.path, json.loads(body)))
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AnalyticsClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = PosthogStandIn()
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self.server.release.set)
+
+    def _client(self, **kwargs):
+        return AnalyticsClient(
+            lambda: ("api-key", self.server.url),
+            session_factory=requests.Session,
+            **kwargs,
+        )
+
+    def test_sends_compressed_batches_and_counts_deliveries(self):
+        client = self._client(max_batch_size=2)
+        self.server.release.clear()
+
+        for user_id in ("user-1", "user-2", "user-3"):
+            self.assertTrue(
+                client.capture("user signed up", user_id, {"pool": "p"})
+            )
+        self.server.release.set()
+
+        self.assertTrue(client.flush(timeout=5))
+        self.assertEqual(client.stats().delivered, 3)
+        self.assertEqual(client.stats().dropped, 0)
+        self.assertEqual(client.stats().pending, 0)
+
+        sent = [
+            event
+            for path, payload in self.server.batches
+            for event in payload["batch"]
+        ]
+        self.assertTrue(
+            all(path == "/batch/" for path, _ in self.server.batches)
+        )
+        self.assertTrue(
+            all(
+                payload["api_key"] == "api-key"
+                for _, payload in self.server.batches
+            )
+        )
+        self.assertLessEqual(
+            max(len(payload["batch"]) for _, payload in self.server.batches),
+            2,
+        )
+        self.assertEqual(
+            [event["distinct_id"] for event in sent],
+            ["user-1", "user-2", "user-3"],
+        )
+        self.assertEqual(sent[0]["event"], "user signed up")
+        self.assertEqual(sent[0]["properties"], {"pool": "p"})
+
+    def test_drops_events_when_buffer_is_full(self):
+        client = self._client(max_queue_size=1, max_batch_size=1)
+        self.server.release.clear()
+
+        # The first event is held by the sender, the second fills the queue.
+        self.assertTrue(client.capture("user verified", "user-1"))
+        while client._queue.qsize():
+            time.sleep(0.001)
+        self.assertTrue(client.capture("user verified", "user-2"))
+        self.assertFalse(client.capture("user verified", "user-3"))
+
+        self.assertFalse(client.flush(timeout=0.05))
+        self.assertEqual(client.stats().pending, 2)
+
+        self.server.release.set()
+        self.assertTrue(client.flush(timeout=5))
+        self.assertEqual(client.stats().delivered, 2)
+        self.assertEqual(client.stats().dropped, 1)
+
+    def test_counts_rejected_batches_as_dropped(self):
+        client = self._client()
+        self.server.status = 503
+
+        client.capture("user deleted", "user-1")
+        client.capture("user deleted", "user-2")
+
+        self.assertTrue(client.flush(timeout=5))
+        self.assertEqual(client.stats().delivered, 0)
+        self.assertEqual(client.stats().dropped, 2)
+
+    def test_flush_without_events_returns_immediately(self):
+        client = self._client()
+
+        self.assertTrue(client.flush(timeout=0))
+        self.assertIsNone(client._sender_thread)
+
+
+class GetAnalyticsClientTests(unittest.TestCase):
+    def test_is_disabled_without_posthog_settings(self):
+        settings = MagicMock()
+        settings.posthog = None
+
+        self.assertIsNone(get_analytics_client(settings))
+        settings.ensure_posthog_settings.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
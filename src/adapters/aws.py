@@ -1,29 +1,254 @@
-import boto3
+from __future__ import annotations
 
-from typing import Optional
+import threading
 
-from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
-from mypy_boto3_cognito_idp.type_defs import UserTypeTypeDef
-from mypy_boto3_dynamodb import DynamoDBClient
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Optional
 
-_cognito_client: Optional[CognitoIdentityProviderClient] = None
+import src.adapters.deadline as deadline_adapter
 
+if TYPE_CHECKING:
+    from datetime import datetime
 
-def get_cognito_client() -> CognitoIdentityProviderClient:
-    global _cognito_client
-    if not _cognito_client:
-        _cognito_client = boto3.client("cognito-idp")
-    return _cognito_client
+    from botocore.config import Config
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+    from mypy_boto3_cognito_idp.type_defs import (
+        AttributeTypeTypeDef,
+        UserTypeTypeDef,
+    )
+    from mypy_boto3_dynamodb import DynamoDBClient
 
+    from src.adapters.deadline import Deadline
+    from src.adapters.contact_filter import S3Client
+    from src.adapters.ssm import SSMClient
+    from src.settings import AWSClientSettings
 
-_dynamodb_client: Optional[DynamoDBClient] = None
+# boto3 is imported on first client creation so handlers only pay for it
+# when they actually talk to AWS. Clients are cached per service and per
+# deadline budget tier, since timeouts and retries are fixed at creation.
 
+# Services this package talks to, as named by boto3.
+ServiceName = Literal["cognito-idp", "dynamodb", "s3", "ssm"]
 
-def get_dynamodb_client() -> DynamoDBClient:
-    global _dynamodb_client
-    if not _dynamodb_client:
-        _dynamodb_client = boto3.client("dynamodb")
-    return _dynamodb_client
+_clients: dict[tuple[ServiceName, Optional[float]], Any] = {}
+_clients_lock = threading.Lock()
+
+_client_settings: Optional[AWSClientSettings] = None
+
+# Cheap reads used to open a connection to each service endpoint. Their
+# answers are ignored, only the pooled connection they leave matters.
+WARM_UP_OPERATIONS: dict[ServiceName, tuple[str, dict[str, Any]]] = {
+    "cognito-idp": ("list_user_pools", {"MaxResults": 1}),
+    "dynamodb": ("describe_endpoints", {}),
+    "ssm": ("describe_parameters", {"MaxResults": 1}),
+}
+
+
+def get_client_settings() -> AWSClientSettings:
+    global _client_settings
+    if not _client_settings:
+        from src.settings import AWSClientSettings
+
+        _client_settings = AWSClientSettings()
+    return _client_settings
+
+
+def configure(client_settings: AWSClientSettings) -> None:
+    global _client_settings
+    with _clients_lock:
+        _client_settings = client_settings
+        _clients.clear()
+
+
+def _client_config(
+    client_settings: AWSClientSettings, budget_tier: Optional[float]
+) -> Config:
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=client_settings.max_pool_connections,
+        connect_timeout=client_settings.connect_timeout_seconds,
+        read_timeout=client_settings.read_timeout_seconds,
+        retries={
+            "mode": client_settings.retry_mode,
+            "total_max_attempts": client_settings.max_attempts,
+        },
+        tcp_keepalive=client_settings.tcp_keepalive,
+    )
+    if not budget_tier:
+        return config
+
+    # Budget tiers only ever shorten the configured timeouts and attempts.
+    return config.merge(
+        deadline_adapter.client_config_for_budget(
+            budget_tier,
+            max_connect_timeout_seconds=client_settings.connect_timeout_seconds,
+            max_read_timeout_seconds=client_settings.read_timeout_seconds,
+            max_attempts=client_settings.max_attempts,
+            retry_mode=client_settings.retry_mode,
+        )
+    )
+
+
+def create_client(
+    service_name: ServiceName,
+    deadline: Optional[Deadline] = None,
+    region_name: Optional[str] = None,
+) -> Any:
+    # Uncached, for callers that keep their own clients, like the ones of
+    # user pools in another region.
+    import boto3
+
+    client_settings = get_client_settings()
+    return boto3.client(
+        service_name,
+        config=_client_config(
+            client_settings, deadline.budget_tier() if deadline else None
+        ),
+        endpoint_url=client_settings.endpoint_urls.get(service_name),
+        region_name=region_name,
+    )
+
+
+def _get_client(service_name: ServiceName, deadline: Optional[Deadline]) -> Any:
+    budget_tier = deadline.budget_tier() if deadline else None
+    key = (service_name, budget_tier)
+
+    client = _clients.get(key)
+    if client:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if not client:
+            client = create_client(service_name, deadline)
+            _clients[key] = client
+    return client
+
+
+def warm_up(
+    service_names: Iterable[ServiceName],
+    budget_seconds: Optional[float] = None,
+) -> None:
+    # The clients warmed are the ones a deadline of this budget would use.
+    deadline = (
+        deadline_adapter.Deadline(
+            budget_seconds * 1000, safety_margin_ms=0, clock=lambda: 0.0
+        )
+        if budget_seconds
+        else None
+    )
+    for service_name in service_names:
+        client = _get_client(service_name, deadline)
+        operation_name, kwargs = WARM_UP_OPERATIONS[service_name]
+        try:
+            getattr(client, operation_name)(**kwargs)
+        except Exception:
+            pass
+
+
+def warm_up_on_init(service_names: Iterable[ServiceName]) -> None:
+    client_settings = get_client_settings()
+    if client_settings.warm_up:
+        warm_up(service_names, client_settings.warm_up_budget_seconds)
+
+
+def get_cognito_client(
+    deadline: Optional[Deadline] = None,
+) -> CognitoIdentityProviderClient:
+    return _get_client("cognito-idp", deadline)
+
+
+def get_dynamodb_client(deadline: Optional[Deadline] = None) -> DynamoDBClient:
+    return _get_client("dynamodb", deadline)
+
+
+def get_ssm_client() -> SSMClient:
+    return _get_client("ssm", None)
+
+
+def get_s3_client() -> S3Client:
+    return _get_client("s3", None)
+
+
+# Attributes kept by CognitoUser, everything else in a user is dropped.
+USER_VIEW_ATTRIBUTES = (
+    "sub",
+    "email",
+    "email_verified",
+    "phone_number",
+    "phone_number_verified",
+)
+_USER_VIEW_ATTRIBUTE_INDEX = {
+    name: index for index, name in enumerate(USER_VIEW_ATTRIBUTES)
+}
+
+
+class CognitoUser:
+    """Compact view of a listed Cognito user, holding only what we use."""
+
+    __slots__ = ("username", "status", "created_at", "_attributes", "_values")
+
+    def __init__(
+        self,
+        username: str,
+        status: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+        attributes: Optional[Iterable[AttributeTypeTypeDef]] = None,
+    ):
+        self.username = username
+        self.status = status
+        self.created_at = created_at
+        self._attributes = attributes
+        self._values: Optional[tuple[str, ...]] = None
+
+    @classmethod
+    def from_user(cls, user: UserTypeTypeDef) -> CognitoUser:
+        return cls(
+            user["Username"],
+            user.get("UserStatus"),
+            user.get("UserCreateDate"),
+            user.get("Attributes"),
+        )
+
+    def get_attribute(self, name: str) -> str:
+        values = self._values
+        if values is None:
+            # Indexed on first access, the raw attribute list is released.
+            indexed = [""] * len(USER_VIEW_ATTRIBUTES)
+            for attribute in self._attributes or ():
+                index = _USER_VIEW_ATTRIBUTE_INDEX.get(attribute["Name"])
+                if index is not None:
+                    indexed[index] = attribute.get("Value", "")
+            values = self._values = tuple(indexed)
+            self._attributes = None
+        return values[_USER_VIEW_ATTRIBUTE_INDEX[name]]
+
+    @property
+    def sub(self) -> str:
+        return self.get_attribute("sub")
+
+    @property
+    def email(self) -> str:
+        return self.get_attribute("email")
+
+    @property
+    def email_verified(self) -> bool:
+        return self.get_attribute("email_verified").lower() == "true"
+
+    @property
+    def phone_number(self) -> str:
+        return self.get_attribute("phone_number")
+
+    @property
+    def phone_number_verified(self) -> bool:
+        return self.get_attribute("phone_number_verified").lower() == "true"
+
+    def user_attributes(self) -> dict[str, str]:
+        return {
+            name: value
+            for name in USER_VIEW_ATTRIBUTES
+            if (value := self.get_attribute(name))
+        }
 
 
 def get_attribute_value(user: UserTypeTypeDef, name: str) -> str:
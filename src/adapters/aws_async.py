@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, TypeVar
+
+import src.adapters.aws as aws_adapter
+
+if TYPE_CHECKING:
+    from src.adapters.deadline import Deadline
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if not _executor:
+        with _executor_lock:
+            if not _executor:
+                # boto3 clients are thread safe. A worker per pooled
+                # connection lets every call in flight hold a connection.
+                _executor = ThreadPoolExecutor(
+                    max_workers=(
+                        aws_adapter.get_client_settings().max_pool_connections
+                    ),
+                    thread_name_prefix="aws-async",
+                )
+    return _executor
+
+
+def run_blocking(
+    func: Callable[..., T], /, *args: Any, **kwargs: Any
+) -> Awaitable[T]:
+    return asyncio.get_running_loop().run_in_executor(
+        _get_executor(), partial(func, *args, **kwargs)
+    )
+
+
+class AsyncClient:
+    """Awaitable view of a boto3 client, sharing its connection pool."""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def __getattr__(self, operation_name: str) -> Callable[..., Awaitable]:
+        operation = getattr(self._client, operation_name)
+
+        def call(**kwargs: Any) -> Awaitable:
+            return run_blocking(operation, **kwargs)
+
+        return call
+
+
+def get_async_dynamodb_client(
+    deadline: Optional[Deadline] = None,
+) -> AsyncClient:
+    # Views are cheap, the boto3 client and its pool are the shared part.
+    return AsyncClient(aws_adapter.get_dynamodb_client(deadline))
+
+
+def get_async_cognito_client(
+    deadline: Optional[Deadline] = None,
+) -> AsyncClient:
+    return AsyncClient(aws_adapter.get_cognito_client(deadline))
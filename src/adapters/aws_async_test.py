@@ -0,0 +1,31 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from .aws_async import AsyncClient, run_blocking
+
+
+class AsyncClientTests(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_operations_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        client = MagicMock()
+        client.get_item.side_effect = lambda **kwargs: threading.get_ident()
+
+        call_thread = await AsyncClient(client).get_item(TableName="table")
+
+        self.assertNotEqual(call_thread, loop_thread)
+        client.get_item.assert_called_once_with(TableName="table")
+
+    async def test_errors_are_raised_to_the_caller(self):
+        client = MagicMock()
+        client.get_item.side_effect = ValueError("boom")
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            await AsyncClient(client).get_item(TableName="table")
+
+    async def test_run_blocking_passes_arguments(self):
+        self.assertEqual(await run_blocking(divmod, 7, 2), (3, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
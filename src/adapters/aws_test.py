@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.settings import AWSClientSettings
+
+from . import aws
+from .deadline import Deadline
+
+
+class AWSClientTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(aws.configure, AWSClientSettings())
+        patcher = patch("boto3.client")
+        self.boto3_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _config(self):
+        return self.boto3_client.call_args.kwargs["config"]
+
+    def test_clients_use_configured_pool_and_retries(self):
+        aws.configure(
+            AWSClientSettings(
+                max_pool_connections=32,
+                retry_mode="adaptive",
+                max_attempts=4,
+                tcp_keepalive=True,
+                endpoint_urls={"dynamodb": "http://localhost:8000"},
+            )
+        )
+
+        aws.get_dynamodb_client()
+
+        config = self._config()
+        self.assertEqual(config.max_pool_connections, 32)
+        self.assertEqual(
+            config.retries, {"mode": "adaptive", "total_max_attempts": 4}
+        )
+        self.assertTrue(config.tcp_keepalive)
+        self.assertEqual(
+            self.boto3_client.call_args.kwargs["endpoint_url"],
+            "http://localhost:8000",
+        )
+
+    def test_budget_only_shortens_configured_timeouts(self):
+        aws.configure(
+            AWSClientSettings(
+                connect_timeout_seconds=0.1,
+                read_timeout_seconds=0.2,
+                max_pool_connections=16,
+            )
+        )
+
+        aws.get_cognito_client(Deadline(64_000, safety_margin_ms=0))
+
+        config = self._config()
+        self.assertEqual(config.connect_timeout, 0.1)
+        self.assertEqual(config.read_timeout, 0.2)
+        self.assertEqual(config.max_pool_connections, 16)
+        self.assertEqual(config.retries["mode"], "standard")
+
+    def test_configure_drops_cached_clients(self):
+        aws.get_dynamodb_client()
+        aws.configure(AWSClientSettings(max_pool_connections=2))
+
+        aws.get_dynamodb_client()
+
+        self.assertEqual(self.boto3_client.call_count, 2)
+        self.assertEqual(self._config().max_pool_connections, 2)
+
+    def test_created_clients_target_region_and_are_not_cached(self):
+        aws.create_client("dynamodb", region_name="eu-west-1")
+        aws.create_client("dynamodb", region_name="eu-west-1")
+
+        self.assertEqual(self.boto3_client.call_count, 2)
+        self.assertEqual(
+            self.boto3_client.call_args.kwargs["region_name"], "eu-west-1"
+        )
+        self.assertEqual(aws._clients, {})
+
+    def test_warm_up_ignores_failed_calls(self):
+        client = MagicMock()
+        client.describe_endpoints.side_effect = RuntimeError("denied")
+        self.boto3_client.return_value = client
+
+        aws.warm_up(["dynamodb"], budget_seconds=4.0)
+
+        client.describe_endpoints.assert_called_once_with()
+        self.assertIn(("dynamodb", 4.0), aws._clients)
+
+    def test_warm_up_on_init_is_disabled_by_default(self):
+        aws.warm_up_on_init(["dynamodb"])
+
+        self.boto3_client.assert_not_called()
+
+
+class CognitoUserTests(unittest.TestCase):
+    def test_indexes_attributes_on_first_access(self):
+        user = aws.CognitoUser.from_user(
+            {
+                "Username": "user-1",
+                "UserStatus": "CONFIRMED",
+                "Attributes": [
+                    {"Name": "sub", "Value": "sub-1"},
+                    {"Name": "email", "Value": "user@example.com"},
+                    {"Name": "email_verified", "Value": "True"},
+                    {"Name": "custom:plan", "Value": "pro"},
+                ],
+                "Enabled": True,
+            }
+        )
+
+        self.assertEqual(user.username, "user-1")
+        self.assertEqual(user.status, "CONFIRMED")
+        self.assertIsNotNone(user._attributes)
+        self.assertEqual(user.sub, "sub-1")
+        self.assertIsNone(user._attributes)
+        self.assertTrue(user.email_verified)
+        self.assertFalse(user.phone_number_verified)
+        self.assertEqual(
+            user.user_attributes(),
+            {
+                "sub": "sub-1",
+                "email": "user@example.com",
+                "email_verified": "True",
+            },
+        )
+
+    def test_keeps_no_instance_dict(self):
+        user = aws.CognitoUser("user-1")
+
+        self.assertFalse(hasattr(user, "__dict__"))
+        self.assertEqual(user.email, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import struct
+
+from typing import Iterator, Optional
+
+SNAPSHOT_MAGIC = b"BLM1"
+# Magic, size in bits, hash count and item count.
+_SNAPSHOT_HEADER = struct.Struct(">4sQIQ")
+
+
+class InvalidBloomFilterSnapshotError(ValueError):
+    def __init__(self):
+        super().__init__("Bloom filter snapshot is invalid.")
+
+
+class BloomFilter:
+    def __init__(
+        self,
+        size_bits: int,
+        hash_count: int,
+        bits: Optional[bytearray] = None,
+        item_count: int = 0,
+    ):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.item_count = item_count
+        self._bits = bits if bits is not None else bytearray(-(-size_bits // 8))
+
+    @classmethod
+    def for_capacity(
+        cls, capacity: int, false_positive_rate: float
+    ) -> BloomFilter:
+        size_bits = max(
+            8,
+            math.ceil(
+                -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+            ),
+        )
+        hash_count = max(1, round(size_bits / max(1, capacity) * math.log(2)))
+        return cls(size_bits, hash_count)
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing of a single digest stands in for k hash functions.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.item_count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def estimated_false_positive_rate(self) -> float:
+        return (
+            1 - math.exp(-self.hash_count * self.item_count / self.size_bits)
+        ) ** self.hash_count
+
+    def to_bytes(self) -> bytes:
+        return (
+            _SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, self.size_bits, self.hash_count, self.item_count
+            )
+            + self._bits
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> BloomFilter:
+        try:
+            magic, size_bits, hash_count, item_count = (
+                _SNAPSHOT_HEADER.unpack_from(data)
+            )
+        except struct.error as exc:
+            raise InvalidBloomFilterSnapshotError() from exc
+
+        bits = bytearray(data[_SNAPSHOT_HEADER.size :])
+        if magic != SNAPSHOT_MAGIC or len(bits) != -(-size_bits // 8):
+            raise InvalidBloomFilterSnapshotError()
+        return cls(size_bits, hash_count, bits, item_count)
@@ -0,0 +1,58 @@
+import unittest
+
+from .bloom_filter import BloomFilter, InvalidBloomFilterSnapshotError
+
+
+class BloomFilterTests(unittest.TestCase):
+    def test_contains_added_items(self):
+        contact_filter = BloomFilter.for_capacity(100, 0.01)
+        contact_filter.add("email#user@example.com")
+
+        self.assertIn("email#user@example.com", contact_filter)
+        self.assertNotIn("email#other@example.com", contact_filter)
+        self.assertEqual(contact_filter.item_count, 1)
+
+    def test_is_sized_for_capacity_and_false_positive_rate(self):
+        contact_filter = BloomFilter.for_capacity(1000, 0.01)
+
+        # About 9.6 bits and 7 hashes per item for a 1% rate.
+        self.assertEqual(contact_filter.size_bits, 9586)
+        self.assertEqual(contact_filter.hash_count, 7)
+        self.assertEqual(contact_filter.size_bytes, 1199)
+
+    def test_false_positive_rate_stays_near_configured_rate(self):
+        contact_filter = BloomFilter.for_capacity(2000, 0.01)
+        for i in range(2000):
+            contact_filter.add(f"email#user-{i}@example.com")
+
+        false_positives = sum(
+            f"email#other-{i}@example.com" in contact_filter
+            for i in range(10000)
+        )
+
+        self.assertLess(false_positives / 10000, 0.02)
+        self.assertAlmostEqual(
+            contact_filter.estimated_false_positive_rate(), 0.01, delta=0.002
+        )
+
+    def test_round_trips_through_snapshot(self):
+        contact_filter = BloomFilter.for_capacity(100, 0.01)
+        contact_filter.add("email#user@example.com")
+
+        restored = BloomFilter.from_bytes(contact_filter.to_bytes())
+
+        self.assertIn("email#user@example.com", restored)
+        self.assertEqual(restored.size_bits, contact_filter.size_bits)
+        self.assertEqual(restored.hash_count, contact_filter.hash_count)
+        self.assertEqual(restored.item_count, 1)
+
+    def test_rejects_invalid_snapshot(self):
+        data = BloomFilter.for_capacity(100, 0.01).to_bytes()
+
+        for invalid in (b"", b"XXXX" + data[4:], data[:-1]):
+            with self.assertRaises(InvalidBloomFilterSnapshotError):
+                BloomFilter.from_bytes(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import time
+
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+# Checkpoints of jobs that stopped running are dropped by the table TTL.
+CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class CheckpointStore:
+    def __init__(
+        self,
+        dynamodb_client: DynamoDBClient,
+        table_name: str,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._dynamodb_client = dynamodb_client
+        self._table_name = table_name
+        self._clock = clock
+
+    def load(self, job_id: str) -> Optional[dict[str, Any]]:
+        try:
+            response = self._dynamodb_client.get_item(
+                TableName=self._table_name,
+                Key={"job_id": {"S": job_id}},
+                ProjectionExpression="checkpoint",
+                ConsistentRead=True,
+            )
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError(f"Unable to load checkpoint of {job_id}.") from exc
+
+        checkpoint = response.get("Item", {}).get("checkpoint", {}).get("S")
+        return json.loads(checkpoint) if checkpoint else None
+
+    def save(self, job_id: str, checkpoint: dict[str, Any]) -> None:
+        now = int(self._clock())
+        try:
+            self._dynamodb_client.put_item(
+                TableName=self._table_name,
+                Item={
+                    "job_id": {"S": job_id},
+                    "checkpoint": {"S": json.dumps(checkpoint)},
+                    "updated_at": {"N": str(now)},
+                    "expires_at": {"N": str(now + CHECKPOINT_TTL_SECONDS)},
+                },
+            )
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError(f"Unable to save checkpoint of {job_id}.") from exc
+
+    def clear(self, job_id: str) -> None:
+        try:
+            self._dynamodb_client.delete_item(
+                TableName=self._table_name,
+                Key={"job_id": {"S": job_id}},
+            )
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError(
+                f"Unable to clear checkpoint of {job_id}."
+            ) from exc
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from .checkpoints import CHECKPOINT_TTL_SECONDS, CheckpointStore
+
+
+class CheckpointStoreTests(unittest.TestCase):
+    def test_saves_checkpoint_with_expiration(self):
+        client = MagicMock()
+        store = CheckpointStore(client, "jobs-table", clock=lambda: 1000.0)
+
+        store.save("job-1", {"pagination_token": "token"})
+
+        client.put_item.assert_called_once_with(
+            TableName="jobs-table",
+            Item={
+                "job_id": {"S": "job-1"},
+                "checkpoint": {"S": '{"pagination_token": "token"}'},
+                "updated_at": {"N": "1000"},
+                "expires_at": {"N": str(1000 + CHECKPOINT_TTL_SECONDS)},
+            },
+        )
+
+    def test_loads_saved_checkpoint(self):
+        client = MagicMock()
+        client.get_item.return_value = {
+            "Item": {"checkpoint": {"S": '{"pagination_token": "token"}'}}
+        }
+        store = CheckpointStore(client, "jobs-table")
+
+        self.assertEqual(store.load("job-1"), {"pagination_token": "token"})
+        client.get_item.assert_called_once_with(
+            TableName="jobs-table",
+            Key={"job_id": {"S": "job-1"}},
+            ProjectionExpression="checkpoint",
+            ConsistentRead=True,
+        )
+
+    def test_returns_none_without_checkpoint(self):
+        client = MagicMock()
+        client.get_item.return_value = {}
+
+        self.assertIsNone(CheckpointStore(client, "jobs-table").load("job-1"))
+
+    def test_clear_deletes_checkpoint(self):
+        client = MagicMock()
+
+        CheckpointStore(client, "jobs-table").clear("job-1")
+
+        client.delete_item.assert_called_once_with(
+            TableName="jobs-table", Key={"job_id": {"S": "job-1"}}
+        )
+
+    def test_wraps_aws_errors(self):
+        client = MagicMock()
+        client.put_item.side_effect = ClientError(
+            {"Error": {"Code": "Error", "Message": "boom"}}, "PutItem"
+        )
+
+        with self.assertRaises(ValueError):
+            CheckpointStore(client, "jobs-table").save("job-1", {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional, Protocol
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.aws as aws_adapter
+
+from src.adapters.bloom_filter import BloomFilter
+
+if TYPE_CHECKING:
+    from src.settings import ContactFilterSettings
+
+
+class S3Client(Protocol):
+    def get_object(
+        self, *, Bucket: str, Key: str, **kwargs: Any
+    ) -> dict[str, Any]: ...
+
+    def put_object(
+        self, *, Bucket: str, Key: str, Body: bytes, **kwargs: Any
+    ) -> dict[str, Any]: ...
+
+
+class Snapshot(NamedTuple):
+    data: bytes
+    etag: str
+
+
+class SnapshotStore:
+    def __init__(self, s3_client: S3Client, bucket: str, key: str):
+        self._s3_client = s3_client
+        self._bucket = bucket
+        self._key = key
+
+    def load(self, if_none_match: Optional[str] = None) -> Optional[Snapshot]:
+        # None when there is no snapshot yet or it has not changed.
+        request: dict[str, Any] = {"Bucket": self._bucket, "Key": self._key}
+        if if_none_match:
+            request["IfNoneMatch"] = if_none_match
+        try:
+            response = self._s3_client.get_object(**request)
+            data = response["Body"].read()
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code")
+            if code in ("NoSuchKey", "304", "NotModified"):
+                return None
+            raise ValueError("Unable to load contact filter snapshot.") from exc
+        except BotoCoreError as exc:
+            raise ValueError("Unable to load contact filter snapshot.") from exc
+        return Snapshot(data, response.get("ETag", ""))
+
+    def save(self, data: bytes) -> None:
+        try:
+            self._s3_client.put_object(
+                Bucket=self._bucket, Key=self._key, Body=data
+            )
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError("Unable to save contact filter snapshot.") from exc
+
+
+class ContactFilterCache:
+    def __init__(
+        self,
+        snapshot_store_factory: Callable[[], SnapshotStore],
+        refresh_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._snapshot_store_factory = snapshot_store_factory
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._filter: Optional[BloomFilter] = None
+        self._etag: Optional[str] = None
+        self._expires_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def get(self) -> Optional[BloomFilter]:
+        # Without a filter every contact takes the authoritative lookup, so
+        # a missing or broken snapshot only costs latency.
+        if self._expires_at is None:
+            self._refresh()
+        elif self._expires_at <= self._clock():
+            self._refresh_in_background()
+        return self._filter
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        refresh_thread = self._refresh_thread
+        if refresh_thread:
+            refresh_thread.join(timeout)
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh, daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh(self) -> None:
+        try:
+            snapshot = self._snapshot_store_factory().load(self._etag)
+            if snapshot:
+                contact_filter = BloomFilter.from_bytes(snapshot.data)
+                self._filter, self._etag = contact_filter, snapshot.etag
+        except ValueError:
+            pass
+        self._expires_at = self._clock() + self._refresh_seconds
+
+
+_contact_filter_cache: Optional[ContactFilterCache] = None
+
+
+def get_contact_filter(
+    settings: Optional[ContactFilterSettings],
+) -> Optional[BloomFilter]:
+    global _contact_filter_cache
+    if not settings:
+        return None
+    if not _contact_filter_cache:
+        _contact_filter_cache = ContactFilterCache(
+            lambda: SnapshotStore(
+                aws_adapter.get_s3_client(),
+                settings.snapshot_bucket,
+                settings.snapshot_key,
+            ),
+            settings.refresh_seconds,
+        )
+    return _contact_filter_cache.get()
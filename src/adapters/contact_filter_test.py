@@ -0,0 +1,96 @@
+import unittest
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from .bloom_filter import BloomFilter
+from .contact_filter import ContactFilterCache, Snapshot, SnapshotStore
+
+
+def _client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code}}, "GetObject")
+
+
+def _snapshot(*contacts: str, etag: str = '"etag"') -> Snapshot:
+    contact_filter = BloomFilter.for_capacity(100, 0.01)
+    for contact in contacts:
+        contact_filter.add(contact)
+    return Snapshot(contact_filter.to_bytes(), etag)
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    def test_loads_snapshot_unless_unchanged(self):
+        client = MagicMock()
+        client.get_object.return_value = {
+            "Body": BytesIO(b"data"),
+            "ETag": '"etag"',
+        }
+        store = SnapshotStore(client, "bucket", "key")
+
+        self.assertEqual(store.load('"old"'), Snapshot(b"data", '"etag"'))
+        client.get_object.assert_called_once_with(
+            Bucket="bucket", Key="key", IfNoneMatch='"old"'
+        )
+
+        client.get_object.side_effect = _client_error("304")
+        self.assertIsNone(store.load('"etag"'))
+
+    def test_missing_snapshot_loads_nothing(self):
+        client = MagicMock()
+        client.get_object.side_effect = _client_error("NoSuchKey")
+
+        self.assertIsNone(SnapshotStore(client, "bucket", "key").load())
+
+    def test_raises_when_snapshot_cannot_be_loaded(self):
+        client = MagicMock()
+        client.get_object.side_effect = _client_error("AccessDenied")
+
+        with self.assertRaises(ValueError):
+            SnapshotStore(client, "bucket", "key").load()
+
+
+class ContactFilterCacheTests(unittest.TestCase):
+    def test_loads_filter_once_until_stale(self):
+        store = MagicMock()
+        store.load.return_value = _snapshot("email#user@example.com")
+        now = [0.0]
+        cache = ContactFilterCache(lambda: store, 300, clock=lambda: now[0])
+
+        contact_filter = cache.get()
+        self.assertIn("email#user@example.com", contact_filter)
+        self.assertIs(cache.get(), contact_filter)
+        store.load.assert_called_once_with(None)
+
+        store.load.return_value = _snapshot(
+            "email#other@example.com", etag='"new"'
+        )
+        now[0] = 301.0
+        cache.get()
+        cache.wait_for_refresh(5)
+
+        self.assertIn("email#other@example.com", cache.get())
+        store.load.assert_called_with('"etag"')
+
+    def test_unavailable_snapshot_leaves_no_filter(self):
+        store = MagicMock()
+        store.load.side_effect = ValueError("Unable to load.")
+
+        self.assertIsNone(ContactFilterCache(lambda: store, 300).get())
+
+    def test_unchanged_snapshot_keeps_filter(self):
+        store = MagicMock()
+        store.load.side_effect = [_snapshot("email#user@example.com"), None]
+        now = [0.0]
+        cache = ContactFilterCache(lambda: store, 300, clock=lambda: now[0])
+        contact_filter = cache.get()
+
+        now[0] = 301.0
+        cache.get()
+        cache.wait_for_refresh(5)
+
+        self.assertIs(cache.get(), contact_filter)
+
+
+if __name__ == "__main__":
+    unittest.main()
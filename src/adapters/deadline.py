@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+import time
+
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
+
+if TYPE_CHECKING:
+    from botocore.config import Config
+
+# Time kept aside to turn an exhausted budget into a clean error before the
+# Lambda runtime or Cognito gives up on the invocation.
+DEFAULT_SAFETY_MARGIN_MS = 300
+
+MAX_CONNECT_TIMEOUT_SECONDS = 1.0
+MAX_READ_TIMEOUT_SECONDS = 5.0
+MAX_ATTEMPTS = 3
+
+# Clients are cached per budget tier, so budgets are rounded down to one of
+# these values before deriving timeouts from them.
+BUDGET_TIERS_SECONDS = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+
+class DeadlineExceededError(RuntimeError):
+    def __init__(self):
+        super().__init__("Request took too long to complete. Please try again.")
+
+
+class Deadline:
+    def __init__(
+        self,
+        remaining_ms: float,
+        safety_margin_ms: float = DEFAULT_SAFETY_MARGIN_MS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._expires_at = clock() + (remaining_ms - safety_margin_ms) / 1000
+
+    @classmethod
+    def from_context(
+        cls,
+        context: Any,
+        safety_margin_ms: float = DEFAULT_SAFETY_MARGIN_MS,
+    ) -> Deadline:
+        get_remaining_time = getattr(
+            context, "get_remaining_time_in_millis", None
+        )
+        if not callable(get_remaining_time):
+            return cls.unbounded()
+        return cls(get_remaining_time(), safety_margin_ms)
+
+    @classmethod
+    def unbounded(cls) -> Deadline:
+        return cls(math.inf, safety_margin_ms=0)
+
+    @property
+    def is_bounded(self) -> bool:
+        return not math.isinf(self._expires_at)
+
+    def remaining_seconds(self) -> float:
+        return max(0.0, self._expires_at - self._clock())
+
+    def is_expired(self) -> bool:
+        return self.remaining_seconds() <= 0
+
+    def ensure_time_left(self, seconds: float = 0.0) -> None:
+        if self.remaining_seconds() <= seconds:
+            raise DeadlineExceededError()
+
+    def timeout(self, preferred_seconds: float) -> float:
+        self.ensure_time_left()
+        return min(preferred_seconds, self.remaining_seconds())
+
+    def budget_tier(self) -> Optional[float]:
+        if not self.is_bounded:
+            return None
+        remaining = self.remaining_seconds()
+        for tier in reversed(BUDGET_TIERS_SECONDS):
+            if remaining >= tier:
+                return tier
+        return BUDGET_TIERS_SECONDS[0]
+
+
+def client_config_for_budget(
+    budget_seconds: float,
+    max_connect_timeout_seconds: float = MAX_CONNECT_TIMEOUT_SECONDS,
+    max_read_timeout_seconds: float = MAX_READ_TIMEOUT_SECONDS,
+    max_attempts: int = MAX_ATTEMPTS,
+    retry_mode: Literal["legacy", "standard", "adaptive"] = "standard",
+) -> Config:
+    from botocore.config import Config
+
+    connect_timeout = min(max_connect_timeout_seconds, budget_seconds / 8)
+    read_timeout = min(max_read_timeout_seconds, budget_seconds / 4)
+    fitting_attempts = int(budget_seconds // (connect_timeout + read_timeout))
+
+    return Config(
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries={
+            "mode": retry_mode,
+            "total_max_attempts": max(1, min(max_attempts, fitting_attempts)),
+        },
+    )
+
+
+NO_DEADLINE = Deadline.unbounded()
@@ -0,0 +1,92 @@
+import unittest
+
+from .deadline import (
+    MAX_ATTEMPTS,
+    MAX_CONNECT_TIMEOUT_SECONDS,
+    MAX_READ_TIMEOUT_SECONDS,
+    Deadline,
+    DeadlineExceededError,
+    client_config_for_budget,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeContext:
+    def __init__(self, remaining_ms: int):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_ms
+
+
+class DeadlineTests(unittest.TestCase):
+    def test_keeps_safety_margin(self):
+        clock = FakeClock()
+        deadline = Deadline(3000, safety_margin_ms=500, clock=clock)
+
+        self.assertEqual(deadline.remaining_seconds(), 2.5)
+
+        clock.now += 2.5
+        self.assertTrue(deadline.is_expired())
+
+    def test_ensure_time_left_raises_when_budget_is_spent(self):
+        clock = FakeClock()
+        deadline = Deadline(1300, clock=clock)
+
+        deadline.ensure_time_left(0.5)
+        with self.assertRaises(DeadlineExceededError):
+            deadline.ensure_time_left(1.0)
+
+    def test_timeout_is_capped_by_remaining_time(self):
+        deadline = Deadline(1300, clock=FakeClock())
+
+        self.assertEqual(deadline.timeout(5.0), 1.0)
+        self.assertEqual(deadline.timeout(0.25), 0.25)
+
+    def test_from_context_uses_remaining_time(self):
+        deadline = Deadline.from_context(FakeContext(5300))
+
+        self.assertTrue(deadline.is_bounded)
+        self.assertAlmostEqual(deadline.remaining_seconds(), 5.0, places=1)
+
+    def test_from_context_without_remaining_time_is_unbounded(self):
+        deadline = Deadline.from_context(object())
+
+        self.assertFalse(deadline.is_bounded)
+        self.assertIsNone(deadline.budget_tier())
+        deadline.ensure_time_left(3600)
+
+    def test_budget_tier_rounds_down(self):
+        clock = FakeClock()
+
+        self.assertEqual(Deadline(3300, clock=clock).budget_tier(), 2.0)
+        self.assertEqual(Deadline(9300, clock=clock).budget_tier(), 8.0)
+        self.assertEqual(Deadline(400, clock=clock).budget_tier(), 0.5)
+
+
+class ClientConfigForBudgetTests(unittest.TestCase):
+    def test_short_budget_gets_short_timeouts_and_one_attempt(self):
+        config = client_config_for_budget(1.0)
+
+        self.assertEqual(config.connect_timeout, 0.125)
+        self.assertEqual(config.read_timeout, 0.25)
+        self.assertEqual(config.retries["total_max_attempts"], 2)
+
+    def test_long_budget_is_capped(self):
+        config = client_config_for_budget(64.0)
+
+        self.assertEqual(config.connect_timeout, MAX_CONNECT_TIMEOUT_SECONDS)
+        self.assertEqual(config.read_timeout, MAX_READ_TIMEOUT_SECONDS)
+        self.assertEqual(config.retries["total_max_attempts"], MAX_ATTEMPTS)
+        self.assertEqual(config.retries["mode"], "standard")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+    from src.settings import IdempotencySettings
+
+STATUS_IN_PROGRESS = "IN_PROGRESS"
+STATUS_COMPLETED = "COMPLETED"
+
+# How long an attempt without a deadline may hold its record.
+DEFAULT_IN_PROGRESS_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.1
+
+# An attempt takes over the record if it does not exist, has expired or was
+# left in progress by an attempt that ran out of time.
+_RESERVE_CONDITION = (
+    "attribute_not_exists(idempotency_key) OR expires_at < :now"
+    " OR (#status = :in_progress AND in_progress_expires_at < :now)"
+)
+
+
+class IdempotencyInProgressError(ValueError):
+    def __init__(self):
+        super().__init__(
+            "A previous attempt is still being processed. Please try again."
+        )
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        table_name: str,
+        expires_after_seconds: int,
+        local_cache_max_items: int,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._table_name = table_name
+        self._expires_after_seconds = expires_after_seconds
+        self._local_cache_max_items = local_cache_max_items
+        self._clock = clock
+        self._sleep = sleep
+        self._results: OrderedDict[str, tuple[dict[str, Any], float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        dynamodb_client: DynamoDBClient,
+        key: str,
+        work: Callable[[], dict[str, Any]],
+        deadline: Deadline = NO_DEADLINE,
+    ) -> dict[str, Any]:
+        result = self._get_cached_result(key)
+        if result is not None:
+            return result
+
+        try:
+            reserved = self._reserve(dynamodb_client, key, deadline)
+        except (BotoCoreError, ClientError):
+            # The record only saves repeated work, an unavailable table must
+            # not fail the request.
+            return work()
+
+        if not reserved:
+            result = self._wait_for_result(dynamodb_client, key, deadline)
+            self._cache_result(key, result)
+            return result
+
+        try:
+            result = work()
+        except BaseException:
+            self._release(dynamodb_client, key)
+            raise
+
+        self._complete(dynamodb_client, key, result)
+        self._cache_result(key, result)
+        return result
+
+    def _reserve(
+        self, dynamodb_client: DynamoDBClient, key: str, deadline: Deadline
+    ) -> bool:
+        now = int(self._clock())
+        in_progress_seconds = (
+            math.ceil(deadline.remaining_seconds())
+            if deadline.is_bounded
+            else DEFAULT_IN_PROGRESS_SECONDS
+        )
+        try:
+            with metrics_adapter.span("idempotency.reserve") as span:
+                response = dynamodb_client.put_item(
+                    TableName=self._table_name,
+                    Item={
+                        "idempotency_key": {"S": key},
+                        "status": {"S": STATUS_IN_PROGRESS},
+                        "in_progress_expires_at": {
+                            "N": str(now + in_progress_seconds)
+                        },
+                        "expires_at": {
+                            "N": str(now + self._expires_after_seconds)
+                        },
+                    },
+                    ConditionExpression=_RESERVE_CONDITION,
+                    ExpressionAttributeNames={"#status": "status"},
+                    ExpressionAttributeValues={
+                        ":now": {"N": str(now)},
+                        ":in_progress": {"S": STATUS_IN_PROGRESS},
+                    },
+                )
+                span.record_response(response)
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code")
+            if code == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def _wait_for_result(
+        self, dynamodb_client: DynamoDBClient, key: str, deadline: Deadline
+    ) -> dict[str, Any]:
+        # Another attempt holds the record. Cognito retries a trigger while
+        # the first attempt may still be running, so wait for its result as
+        # long as this invocation can afford to.
+        wait_until = self._clock() + DEFAULT_IN_PROGRESS_SECONDS
+        while True:
+            item = self._get_item(dynamodb_client, key)
+            if not item:
+                raise IdempotencyInProgressError()
+            if item.get("status", {}).get("S") == STATUS_COMPLETED:
+                return json.loads(item.get("result", {}).get("S") or "{}")
+
+            if deadline.is_bounded:
+                if deadline.remaining_seconds() <= POLL_INTERVAL_SECONDS:
+                    raise IdempotencyInProgressError()
+            elif self._clock() >= wait_until:
+                raise IdempotencyInProgressError()
+            self._sleep(POLL_INTERVAL_SECONDS)
+
+    def _get_item(
+        self, dynamodb_client: DynamoDBClient, key: str
+    ) -> Optional[dict[str, Any]]:
+        try:
+            response = dynamodb_client.get_item(
+                TableName=self._table_name,
+                Key={"idempotency_key": {"S": key}},
+                ProjectionExpression="#status, #result",
+                ExpressionAttributeNames={
+                    "#status": "status",
+                    "#result": "result",
+                },
+                ConsistentRead=True,
+            )
+        except (BotoCoreError, ClientError) as exc:
+            raise IdempotencyInProgressError() from exc
+        return response.get("Item")
+
+    def _complete(
+        self,
+        dynamodb_client: DynamoDBClient,
+        key: str,
+        result: dict[str, Any],
+    ) -> None:
+        # The work is done at this point. If the result cannot be saved a
+        # retry repeats the work once the in progress record expires.
+        try:
+            with metrics_adapter.span("idempotency.complete") as span:
+                response = dynamodb_client.update_item(
+                    TableName=self._table_name,
+                    Key={"idempotency_key": {"S": key}},
+                    UpdateExpression="SET #status = :completed, #result = :result",
+                    ExpressionAttributeNames={
+                        "#status": "status",
+                        "#result": "result",
+                    },
+                    ExpressionAttributeValues={
+                        ":completed": {"S": STATUS_COMPLETED},
+                        ":result": {"S": json.dumps(result)},
+                    },
+                )
+                span.record_response(response)
+        except (BotoCoreError, ClientError):
+            pass
+
+    def _release(self, dynamodb_client: DynamoDBClient, key: str) -> None:
+        # Failed attempts are not saved, the retry must run the work again.
+        try:
+            dynamodb_client.delete_item(
+                TableName=self._table_name,
+                Key={"idempotency_key": {"S": key}},
+            )
+        except (BotoCoreError, ClientError):
+            pass
+
+    def _get_cached_result(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            cached = self._results.get(key)
+            if not cached:
+                return None
+            result, expires_at = cached
+            if expires_at <= self._clock():
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return result
+
+    def _cache_result(self, key: str, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._results[key] = (
+                result,
+                self._clock() + self._expires_after_seconds,
+            )
+            self._results.move_to_end(key)
+            while len(self._results) > self._local_cache_max_items:
+                self._results.popitem(last=False)
+
+
+_idempotency_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store(settings: IdempotencySettings) -> IdempotencyStore:
+    global _idempotency_store
+    if not _idempotency_store:
+        _idempotency_store = IdempotencyStore(
+            settings.table_name,
+            settings.expires_after_seconds,
+            settings.local_cache_max_items,
+        )
+    return _idempotency_store
+
+
+def run_idempotently(
+    settings: Optional[IdempotencySettings],
+    dynamodb_client: DynamoDBClient,
+    key: str,
+    work: Callable[[], dict[str, Any]],
+    deadline: Deadline = NO_DEADLINE,
+) -> dict[str, Any]:
+    if not settings:
+        return work()
+    return get_idempotency_store(settings).run(
+        dynamodb_client, key, work, deadline=deadline
+    )
+
+
+def trigger_idempotency_key(
+    trigger_source: str, user_pool_id: str, user_name: str
+) -> str:
+    return f"{trigger_source}#{user_pool_id}#{user_name}"
@@ -0,0 +1,162 @@
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from .deadline import Deadline
+from .idempotency import (
+    IdempotencyInProgressError,
+    IdempotencyStore,
+    trigger_idempotency_key,
+)
+
+
+def _conditional_check_failed() -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+    )
+
+
+class IdempotencyStoreTests(unittest.TestCase):
+    def _store(self, clock=lambda: 1000.0, sleep=lambda seconds: None):
+        return IdempotencyStore(
+            "idempotency-table",
+            expires_after_seconds=3600,
+            local_cache_max_items=2,
+            clock=clock,
+            sleep=sleep,
+        )
+
+    def test_saves_result_of_first_attempt(self):
+        client = MagicMock()
+        work = MagicMock(return_value={"autoConfirmUser": False})
+
+        result = self._store().run(client, "key", work)
+
+        self.assertEqual(result, {"autoConfirmUser": False})
+        work.assert_called_once()
+        put_kwargs = client.put_item.call_args.kwargs
+        self.assertEqual(put_kwargs["Item"]["status"], {"S": "IN_PROGRESS"})
+        self.assertEqual(put_kwargs["Item"]["expires_at"], {"N": "4600"})
+        update_kwargs = client.update_item.call_args.kwargs
+        self.assertEqual(
+            update_kwargs["ExpressionAttributeValues"][":result"],
+            {"S": '{"autoConfirmUser": false}'},
+        )
+
+    def test_in_progress_record_expires_with_the_deadline(self):
+        client = MagicMock()
+        deadline = Deadline(remaining_ms=4500, safety_margin_ms=0)
+
+        self._store().run(client, "key", dict, deadline=deadline)
+
+        self.assertEqual(
+            client.put_item.call_args.kwargs["Item"]["in_progress_expires_at"],
+            {"N": "1005"},
+        )
+
+    def test_retry_in_same_process_uses_local_result(self):
+        client = MagicMock()
+        store = self._store()
+        store.run(client, "key", lambda: {"value": 1})
+        work = MagicMock()
+
+        self.assertEqual(store.run(client, "key", work), {"value": 1})
+
+        work.assert_not_called()
+        client.put_item.assert_called_once()
+
+    def test_retry_returns_saved_result(self):
+        client = MagicMock()
+        client.put_item.side_effect = _conditional_check_failed()
+        client.get_item.return_value = {
+            "Item": {
+                "status": {"S": "COMPLETED"},
+                "result": {"S": '{"value": 1}'},
+            }
+        }
+        work = MagicMock()
+
+        self.assertEqual(self._store().run(client, "key", work), {"value": 1})
+
+        work.assert_not_called()
+
+    def test_retry_waits_for_attempt_in_progress(self):
+        client = MagicMock()
+        client.put_item.side_effect = _conditional_check_failed()
+        client.get_item.side_effect = [
+            {"Item": {"status": {"S": "IN_PROGRESS"}}},
+            {
+                "Item": {
+                    "status": {"S": "COMPLETED"},
+                    "result": {"S": '{"value": 1}'},
+                }
+            },
+        ]
+        sleep = MagicMock()
+
+        result = self._store(sleep=sleep).run(
+            client, "key", MagicMock(), deadline=Deadline(remaining_ms=5000)
+        )
+
+        self.assertEqual(result, {"value": 1})
+        sleep.assert_called_once()
+
+    def test_retry_gives_up_when_deadline_is_near(self):
+        client = MagicMock()
+        client.put_item.side_effect = _conditional_check_failed()
+        client.get_item.return_value = {
+            "Item": {"status": {"S": "IN_PROGRESS"}}
+        }
+
+        with self.assertRaises(IdempotencyInProgressError):
+            self._store().run(
+                client,
+                "key",
+                MagicMock(),
+                deadline=Deadline(remaining_ms=50, safety_margin_ms=0),
+            )
+
+    def test_failed_attempt_releases_record(self):
+        client = MagicMock()
+        work = MagicMock(side_effect=ValueError("boom"))
+
+        with self.assertRaises(ValueError):
+            self._store().run(client, "key", work)
+
+        client.delete_item.assert_called_once_with(
+            TableName="idempotency-table",
+            Key={"idempotency_key": {"S": "key"}},
+        )
+        client.update_item.assert_not_called()
+
+    def test_unavailable_table_still_runs_work(self):
+        client = MagicMock()
+        client.put_item.side_effect = ClientError(
+            {"Error": {"Code": "InternalServerError"}}, "PutItem"
+        )
+
+        result = self._store().run(client, "key", lambda: {"value": 1})
+
+        self.assertEqual(result, {"value": 1})
+
+    def test_local_results_are_bounded(self):
+        client = MagicMock()
+        store = self._store()
+        for key in ("a", "b", "c"):
+            store.run(client, key, lambda: {})
+        work = MagicMock(return_value={})
+
+        store.run(client, "a", work)
+
+        work.assert_called_once()
+
+    def test_key_includes_trigger_and_user(self):
+        self.assertEqual(
+            trigger_idempotency_key("PreSignUp_SignUp", "pool", "user"),
+            "PreSignUp_SignUp#pool#user",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
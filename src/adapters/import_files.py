@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+
+from typing import Any, BinaryIO, Iterator, Literal, Optional
+
+ImportFormat = Literal["csv", "jsonl"]
+
+IMPORT_FORMATS: dict[str, ImportFormat] = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+class UnsupportedImportFormatError(ValueError):
+    def __init__(self, key: str):
+        super().__init__(f"Unsupported import file {key}.")
+
+
+def detect_import_format(key: str) -> ImportFormat:
+    for extension, import_format in IMPORT_FORMATS.items():
+        if key.lower().endswith(extension):
+            return import_format
+    raise UnsupportedImportFormatError(key)
+
+
+def iter_import_rows(
+    body: BinaryIO, import_format: ImportFormat
+) -> Iterator[Optional[dict[str, Any]]]:
+    # The body is decoded as it is read, so files of any size stream
+    # through in constant memory. Rows that cannot be parsed are yielded
+    # as None, one bad line must not stop an import.
+    text = codecs.getreader("utf-8-sig")(body)
+    if import_format == "csv":
+        yield from csv.DictReader(text)
+        return
+
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield row if isinstance(row, dict) else None
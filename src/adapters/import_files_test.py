@@ -0,0 +1,45 @@
+import unittest
+from io import BytesIO
+
+from .import_files import (
+    UnsupportedImportFormatError,
+    detect_import_format,
+    iter_import_rows,
+)
+
+
+class ImportFilesTests(unittest.TestCase):
+    def test_detects_format_from_key(self):
+        self.assertEqual(detect_import_format("tenant/users.CSV"), "csv")
+        self.assertEqual(detect_import_format("users.ndjson"), "jsonl")
+        with self.assertRaises(UnsupportedImportFormatError):
+            detect_import_format("users.xlsx")
+
+    def test_reads_csv_rows(self):
+        body = BytesIO(
+            b"\xef\xbb\xbfusername,email\r\n"
+            b'user-1,"first@example.com"\r\n'
+            b"user-2,\r\n"
+        )
+
+        self.assertEqual(
+            list(iter_import_rows(body, "csv")),
+            [
+                {"username": "user-1", "email": "first@example.com"},
+                {"username": "user-2", "email": ""},
+            ],
+        )
+
+    def test_reads_jsonl_rows_and_flags_bad_lines(self):
+        body = BytesIO(
+            b'{"username": "user-1"}\n\nnot json\n[1]\n{"username": "user-2"}'
+        )
+
+        self.assertEqual(
+            list(iter_import_rows(body, "jsonl")),
+            [{"username": "user-1"}, None, None, {"username": "user-2"}],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import random
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Optional
+
+if TYPE_CHECKING:
+    from src.settings import MetricsSettings
+
+STAGE_DURATION_METRIC = "StageDuration"
+QUOTA_UTILIZATION_METRIC = "QuotaUtilization"
+
+
+@dataclass
+class Span:
+    stage: str
+    duration_ms: float = 0.0
+    request_ids: list[str] = field(default_factory=list)
+    retry_attempts: int = 0
+    error: Optional[str] = None
+
+    def record_response(self, response: Mapping[str, Any]) -> None:
+        response_metadata = response.get("ResponseMetadata") or {}
+        request_id = response_metadata.get("RequestId")
+        if request_id:
+            self.request_ids.append(request_id)
+        self.retry_attempts += response_metadata.get("RetryAttempts", 0)
+
+    def record_error(self, exc: BaseException) -> None:
+        self.error = type(exc).__name__
+        # botocore errors carry the metadata of the last attempt.
+        response = getattr(exc, "response", None)
+        if isinstance(response, Mapping):
+            self.record_response(response)
+
+
+class _NoopSpan(Span):
+    def record_response(self, response: Mapping[str, Any]) -> None:
+        pass
+
+    def record_error(self, exc: BaseException) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan(stage="noop")
+
+
+class StageTimer:
+    def __init__(
+        self,
+        service: str,
+        namespace: str,
+        sample_rate: float = 1.0,
+        emit: Optional[Callable[[StageTimer, Span], None]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        sampler: Callable[[], float] = random.random,
+    ):
+        self.service = service
+        self.namespace = namespace
+        self._sample_rate = sample_rate
+        self._emit = emit or _emit_embedded_metric
+        self._clock = clock
+        self._sampler = sampler
+        self._sampled = False
+
+    def start_invocation(self) -> None:
+        # Sampling is decided once per invocation so that a sampled sign-up
+        # reports all of its stages.
+        self._sampled = self._sampler() < self._sample_rate
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[Span]:
+        if not self._sampled:
+            yield _NOOP_SPAN
+            return
+
+        span = Span(stage=stage)
+        started = self._clock()
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_error(exc)
+            raise
+        finally:
+            span.duration_ms = (self._clock() - started) * 1000
+            try:
+                self._emit(self, span)
+            except Exception:
+                # Metrics must never fail the invocation they describe.
+                pass
+
+
+def _emit_embedded_metric(stage_timer: StageTimer, span: Span) -> None:
+    from aws_lambda_powertools.metrics import MetricUnit, single_metric
+
+    with single_metric(
+        name=STAGE_DURATION_METRIC,
+        unit=MetricUnit.Milliseconds,
+        value=span.duration_ms,
+        namespace=stage_timer.namespace,
+        default_dimensions={"service": stage_timer.service},
+    ) as metric:
+        metric.add_dimension("stage", span.stage)
+        metric.add_dimension("outcome", "error" if span.error else "success")
+        metric.add_metadata("request_ids", span.request_ids)
+        metric.add_metadata("retry_attempts", span.retry_attempts)
+        if span.error:
+            metric.add_metadata("error", span.error)
+
+
+_stage_timer: Optional[StageTimer] = None
+_stage_timer_settings: Optional[MetricsSettings] = None
+
+
+def start_invocation(
+    service: str, metrics_settings: Optional[MetricsSettings]
+) -> None:
+    global _stage_timer, _stage_timer_settings
+
+    if not metrics_settings or not metrics_settings.enabled:
+        _stage_timer = None
+        return
+
+    if not _stage_timer or _stage_timer_settings is not metrics_settings:
+        _stage_timer = StageTimer(
+            service=service,
+            namespace=metrics_settings.namespace,
+            sample_rate=metrics_settings.sample_rate,
+        )
+        _stage_timer_settings = metrics_settings
+
+    _stage_timer.start_invocation()
+
+
+@contextmanager
+def span(stage: str) -> Iterator[Span]:
+    stage_timer = _stage_timer
+    if not stage_timer:
+        yield _NOOP_SPAN
+        return
+
+    with stage_timer.span(stage) as active_span:
+        yield active_span
+
+
+def _emit_quota_usage(
+    stage_timer: StageTimer, category: str, utilization: float, throttles: int
+) -> None:
+    from aws_lambda_powertools.metrics import MetricUnit, single_metric
+
+    with single_metric(
+        name=QUOTA_UTILIZATION_METRIC,
+        unit=MetricUnit.Percent,
+        value=utilization * 100,
+        namespace=stage_timer.namespace,
+        default_dimensions={"service": stage_timer.service},
+    ) as metric:
+        metric.add_dimension("category", category)
+        metric.add_metadata("throttles", throttles)
+
+
+def record_quota_usage(
+    category: str, utilization: float, throttles: int
+) -> None:
+    # Reported once per invocation, so it is not subject to sampling.
+    stage_timer = _stage_timer
+    if not stage_timer:
+        return
+    try:
+        _emit_quota_usage(stage_timer, category, utilization, throttles)
+    except Exception:
+        pass
@@ -0,0 +1,158 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from . import metrics as metrics_adapter
+from .metrics import StageTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _metrics_settings(enabled=True, sample_rate=1.0):
+    return SimpleNamespace(
+        enabled=enabled, namespace="Tests", sample_rate=sample_rate
+    )
+
+
+class StageTimerTests(unittest.TestCase):
+    def _timer(self, sample=0.0, sample_rate=1.0):
+        self.emitted = []
+        self.clock = FakeClock()
+        return StageTimer(
+            service="tests",
+            namespace="Tests",
+            sample_rate=sample_rate,
+            emit=lambda _, span: self.emitted.append(span),
+            clock=self.clock,
+            sampler=lambda: sample,
+        )
+
+    def test_records_duration_request_ids_and_retries(self):
+        timer = self._timer()
+        timer.start_invocation()
+
+        with timer.span("get_item") as span:
+            self.clock.now += 0.25
+            span.record_response(
+                {"ResponseMetadata": {"RequestId": "req-1", "RetryAttempts": 2}}
+            )
+
+        (span,) = self.emitted
+        self.assertEqual(span.stage, "get_item")
+        self.assertEqual(span.duration_ms, 250.0)
+        self.assertEqual(span.request_ids, ["req-1"])
+        self.assertEqual(span.retry_attempts, 2)
+        self.assertIsNone(span.error)
+
+    def test_records_client_errors(self):
+        timer = self._timer()
+        timer.start_invocation()
+        error = ClientError(
+            {
+                "Error": {"Code": "ThrottlingException"},
+                "ResponseMetadata": {"RequestId": "req-2", "RetryAttempts": 3},
+            },
+            "GetItem",
+        )
+
+        with self.assertRaises(ClientError):
+            with timer.span("get_item"):
+                raise error
+
+        (span,) = self.emitted
+        self.assertEqual(span.error, "ClientError")
+        self.assertEqual(span.request_ids, ["req-2"])
+        self.assertEqual(span.retry_attempts, 3)
+
+    def test_unsampled_invocations_emit_nothing(self):
+        timer = self._timer(sample=0.5, sample_rate=0.1)
+        timer.start_invocation()
+
+        with timer.span("get_item") as span:
+            span.record_response({"ResponseMetadata": {"RequestId": "req-3"}})
+
+        self.assertEqual(self.emitted, [])
+
+    def test_emit_failures_do_not_escape(self):
+        def failing_emit(stage_timer, span):
+            raise RuntimeError("boom")
+
+        timer = StageTimer(
+            service="tests",
+            namespace="Tests",
+            emit=failing_emit,
+            sampler=lambda: 0.0,
+        )
+        timer.start_invocation()
+
+        with timer.span("get_item"):
+            pass
+
+    def test_emits_embedded_metric_format(self):
+        timer = StageTimer(
+            service="tests", namespace="Tests", sampler=lambda: 0.0
+        )
+        timer.start_invocation()
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            with timer.span("admin_delete_user") as span:
+                span.record_response(
+                    {"ResponseMetadata": {"RequestId": "req-4"}}
+                )
+
+        record = json.loads(output.getvalue())
+        self.assertEqual(record["stage"], "admin_delete_user")
+        self.assertEqual(record["outcome"], "success")
+        self.assertEqual(record["request_ids"], ["req-4"])
+        self.assertEqual(record["retry_attempts"], 0)
+        self.assertEqual(
+            record["_aws"]["CloudWatchMetrics"][0]["Namespace"], "Tests"
+        )
+
+
+class ModuleSpanTests(unittest.TestCase):
+    def setUp(self):
+        for name in ("_stage_timer", "_stage_timer_settings"):
+            patcher = patch.object(metrics_adapter, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_span_is_a_noop_when_metrics_are_disabled(self):
+        metrics_adapter.start_invocation(
+            "tests", _metrics_settings(enabled=False)
+        )
+
+        with metrics_adapter.span("get_item") as span:
+            span.record_response({"ResponseMetadata": {"RequestId": "req-5"}})
+
+        self.assertEqual(span.request_ids, [])
+
+    def test_span_uses_configured_timer(self):
+        metrics_adapter.start_invocation("tests", _metrics_settings())
+        emitted = []
+
+        with patch.object(
+            metrics_adapter._stage_timer,
+            "_emit",
+            lambda _, span: emitted.append(span),
+        ):
+            with metrics_adapter.span("get_item"):
+                pass
+
+        self.assertEqual([span.stage for span in emitted], ["get_item"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+
+from botocore.exceptions import ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline, DeadlineExceededError
+
+if TYPE_CHECKING:
+    from src.settings import RateLimitSettings
+
+T = TypeVar("T")
+
+# Cognito quota categories, every operation of a category shares its quota.
+COGNITO_USER_CREATION = "cognito-user-creation"
+COGNITO_USER_LIST = "cognito-user-list"
+COGNITO_USER_UPDATE = "cognito-user-update"
+
+THROTTLING_ERROR_CODES = frozenset(
+    {"TooManyRequestsException", "ThrottlingException", "Throttling"}
+)
+
+# A throttled category halves its rate, down to a tenth of its quota, and
+# recovers a twentieth of its quota with every successful call.
+RATE_DECREASE_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.1
+RATE_INCREASE_FRACTION = 0.05
+BASE_BACKOFF_SECONDS = 0.1
+MAX_BACKOFF_SECONDS = 5.0
+MAX_THROTTLED_ATTEMPTS = 3
+USAGE_WINDOW_SECONDS = 10.0
+
+
+def is_throttling_error(exc: ClientError) -> bool:
+    return exc.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+@dataclass(frozen=True)
+class RateLimiterUsage:
+    category: str
+    max_rate_per_second: float
+    rate_per_second: float
+    used_per_second: float
+    throttles: int
+
+    @property
+    def utilization(self) -> float:
+        return self.used_per_second / self.max_rate_per_second
+
+
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        category: str,
+        max_rate_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.category = category
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._max_rate = max_rate_per_second
+        self._rate = max_rate_per_second
+        # Bursts are capped at one second worth of calls.
+        self._tokens = self._capacity = max(1.0, max_rate_per_second)
+        self._updated_at = clock()
+        self._consecutive_throttles = 0
+        self._throttles = 0
+        self._grants: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def set_max_rate(self, max_rate_per_second: float) -> None:
+        with self._lock:
+            self._max_rate = max_rate_per_second
+            self._rate = min(self._rate, max_rate_per_second)
+            self._capacity = max(1.0, max_rate_per_second)
+            self._tokens = min(self._tokens, self._capacity)
+
+    def _refill(self, now: float) -> None:
+        # _updated_at lies ahead of the clock while backing off, no tokens
+        # are added until it is reached.
+        if now <= self._updated_at:
+            return
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._updated_at) * self._rate,
+        )
+        self._updated_at = now
+
+    def _prune_grants(self, now: float) -> None:
+        while self._grants and self._grants[0] <= now - USAGE_WINDOW_SECONDS:
+            self._grants.popleft()
+
+    def acquire(self, deadline: Deadline = NO_DEADLINE) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            # Tokens are reserved up front, so waiting callers are served in
+            # the order they arrived.
+            wait = max(0.0, self._updated_at - now) + (
+                max(0.0, 1 - self._tokens) / self._rate
+            )
+            if wait and wait >= deadline.remaining_seconds():
+                raise DeadlineExceededError()
+            self._tokens -= 1
+            self._prune_grants(now)
+            self._grants.append(now + wait)
+
+        if wait:
+            self._sleep(wait)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_throttles = 0
+            self._rate = min(
+                self._max_rate,
+                self._rate + self._max_rate * RATE_INCREASE_FRACTION,
+            )
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._throttles += 1
+            self._consecutive_throttles += 1
+            self._rate = max(
+                self._max_rate * MIN_RATE_FRACTION,
+                self._rate * RATE_DECREASE_FACTOR,
+            )
+            # Exponential backoff with full jitter, shared by every caller.
+            backoff = self._jitter() * min(
+                MAX_BACKOFF_SECONDS,
+                BASE_BACKOFF_SECONDS * 2 ** (self._consecutive_throttles - 1),
+            )
+            self._tokens = min(self._tokens, 0.0)
+            self._updated_at = max(self._updated_at, now + backoff)
+
+    def call(
+        self,
+        operation: Callable[[], T],
+        deadline: Deadline = NO_DEADLINE,
+        max_attempts: int = MAX_THROTTLED_ATTEMPTS,
+    ) -> T:
+        attempt = 1
+        while True:
+            self.acquire(deadline)
+            try:
+                result = operation()
+            except ClientError as exc:
+                if not is_throttling_error(exc):
+                    raise
+                self.record_throttle()
+                if attempt >= max_attempts:
+                    raise
+                attempt += 1
+                continue
+            self.record_success()
+            return result
+
+    def usage(self) -> RateLimiterUsage:
+        with self._lock:
+            now = self._clock()
+            self._prune_grants(now)
+            used = sum(1 for granted_at in self._grants if granted_at <= now)
+            return RateLimiterUsage(
+                category=self.category,
+                max_rate_per_second=self._max_rate,
+                rate_per_second=self._rate,
+                used_per_second=used / USAGE_WINDOW_SECONDS,
+                throttles=self._throttles,
+            )
+
+
+# Default Cognito quotas, in requests per second.
+DEFAULT_RATES_PER_SECOND = {
+    COGNITO_USER_CREATION: 50.0,
+    COGNITO_USER_LIST: 30.0,
+    COGNITO_USER_UPDATE: 25.0,
+}
+
+_rate_limiters: dict[str, AdaptiveRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(category: str) -> AdaptiveRateLimiter:
+    rate_limiter = _rate_limiters.get(category)
+    if rate_limiter:
+        return rate_limiter
+
+    with _rate_limiters_lock:
+        rate_limiter = _rate_limiters.get(category)
+        if not rate_limiter:
+            rate_limiter = AdaptiveRateLimiter(
+                category, DEFAULT_RATES_PER_SECOND[category]
+            )
+            _rate_limiters[category] = rate_limiter
+    return rate_limiter
+
+
+def configure(settings: Optional[RateLimitSettings]) -> None:
+    if not settings:
+        return
+    for category, rate in (
+        (COGNITO_USER_CREATION, settings.cognito_user_creation_per_second),
+        (COGNITO_USER_LIST, settings.cognito_user_list_per_second),
+        (COGNITO_USER_UPDATE, settings.cognito_user_update_per_second),
+    ):
+        get_rate_limiter(category).set_max_rate(rate)
+
+
+def report_usage() -> list[RateLimiterUsage]:
+    usages = [rate_limiter.usage() for rate_limiter in _rate_limiters.values()]
+    for usage in usages:
+        metrics_adapter.record_quota_usage(
+            usage.category, usage.utilization, usage.throttles
+        )
+    return usages
@@ -0,0 +1,170 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from src.adapters.deadline import Deadline, DeadlineExceededError
+
+from .rate_limits import (
+    COGNITO_USER_UPDATE,
+    AdaptiveRateLimiter,
+    configure,
+    get_rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ThrottlingCognitoStandIn:
+    """Refills quota calls per second of the fake clock, like Cognito."""
+
+    def __init__(self, clock, quota):
+        self._clock = clock
+        self._quota = quota
+        self._tokens = float(quota)
+        self._updated_at = clock.now
+        self.deleted = 0
+        self.throttled = 0
+
+    def admin_delete_user(self, **kwargs):
+        elapsed = self._clock.now - self._updated_at
+        self._tokens = min(self._quota, self._tokens + elapsed * self._quota)
+        self._updated_at = self._clock.now
+        if self._tokens < 1:
+            self.throttled += 1
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": "TooManyRequestsException",
+                        "Message": "Rate exceeded",
+                    }
+                },
+                "AdminDeleteUser",
+            )
+        self._tokens -= 1
+        self.deleted += 1
+        return {}
+
+
+def _limiter(clock, rate, jitter=lambda: 1.0):
+    return AdaptiveRateLimiter(
+        "category", rate, clock=clock, sleep=clock.sleep, jitter=jitter
+    )
+
+
+class AdaptiveRateLimiterTests(unittest.TestCase):
+    def test_spaces_calls_once_burst_is_used(self):
+        clock = FakeClock()
+        rate_limiter = _limiter(clock, 4)
+
+        for _ in range(6):
+            rate_limiter.acquire()
+
+        self.assertEqual(clock.sleeps, [0.25, 0.25])
+
+    def test_throttle_halves_rate_and_backs_off(self):
+        clock = FakeClock()
+        rate_limiter = _limiter(clock, 10)
+
+        rate_limiter.record_throttle()
+        rate_limiter.acquire()
+
+        self.assertEqual(rate_limiter.usage().rate_per_second, 5.0)
+        # 100ms of backoff, then a token at the reduced rate.
+        self.assertAlmostEqual(clock.sleeps[0], 0.1 + 1 / 5)
+
+    def test_success_recovers_rate_up_to_quota(self):
+        rate_limiter = _limiter(FakeClock(), 10)
+        rate_limiter.record_throttle()
+
+        for _ in range(20):
+            rate_limiter.record_success()
+
+        self.assertEqual(rate_limiter.usage().rate_per_second, 10.0)
+
+    def test_wait_past_deadline_raises(self):
+        clock = FakeClock()
+        rate_limiter = _limiter(clock, 1)
+        rate_limiter.acquire()
+
+        with self.assertRaises(DeadlineExceededError):
+            rate_limiter.acquire(Deadline(500, safety_margin_ms=0, clock=clock))
+
+        self.assertEqual(clock.sleeps, [])
+
+    def test_gives_up_after_repeated_throttles(self):
+        clock = FakeClock()
+        cognito = ThrottlingCognitoStandIn(clock, quota=0)
+
+        with self.assertRaises(ClientError):
+            _limiter(clock, 10).call(
+                lambda: cognito.admin_delete_user(), max_attempts=3
+            )
+
+        self.assertEqual(cognito.throttled, 3)
+
+    def test_adapts_to_throttling_stand_in(self):
+        clock = FakeClock()
+        cognito = ThrottlingCognitoStandIn(clock, quota=5)
+        # The configured quota is twice what the stand-in accepts.
+        rate_limiter = _limiter(clock, 10, jitter=lambda: 0.5)
+
+        for _ in range(100):
+            rate_limiter.call(lambda: cognito.admin_delete_user())
+
+        usage = rate_limiter.usage()
+        self.assertEqual(cognito.deleted, 100)
+        self.assertLess(cognito.throttled, 20)
+        self.assertEqual(usage.throttles, cognito.throttled)
+        # The stand-in's burst of 5, then close to its 5 calls a second.
+        self.assertLess(clock.now - 100.0, (100 - 5) / 5 * 1.1)
+        self.assertGreater(usage.used_per_second, 5.0)
+        self.assertAlmostEqual(usage.utilization, usage.used_per_second / 10)
+
+    def test_usage_counts_calls_in_window(self):
+        clock = FakeClock()
+        rate_limiter = _limiter(clock, 10)
+        for _ in range(5):
+            rate_limiter.acquire()
+
+        self.assertEqual(rate_limiter.usage().used_per_second, 0.5)
+        clock.now += 10
+        self.assertEqual(rate_limiter.usage().used_per_second, 0.0)
+
+
+class RateLimiterRegistryTests(unittest.TestCase):
+    @patch("adapters.rate_limits._rate_limiters", {})
+    def test_limiters_are_shared_per_category(self):
+        self.assertIs(
+            get_rate_limiter(COGNITO_USER_UPDATE),
+            get_rate_limiter(COGNITO_USER_UPDATE),
+        )
+
+    @patch("adapters.rate_limits._rate_limiters", {})
+    def test_configure_sets_quota_shares(self):
+        configure(
+            SimpleNamespace(
+                cognito_user_creation_per_second=5.0,
+                cognito_user_list_per_second=2.0,
+                cognito_user_update_per_second=1.0,
+            )
+        )
+
+        usage = get_rate_limiter(COGNITO_USER_UPDATE).usage()
+        self.assertEqual(usage.max_rate_per_second, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
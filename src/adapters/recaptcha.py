@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from requests import Session
+
+VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+DEFAULT_VERDICT_TTL_SECONDS = 300.0
+DEFAULT_MAX_CACHED_VERDICTS = 1024
+
+
+class RecaptchaUnavailableError(ValueError):
+    def __init__(self):
+        super().__init__(
+            "Unable to verify reCAPTCHA at this time. Please try again."
+        )
+
+
+def _build_session() -> Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # A single host is ever contacted, keep a few warm connections to it.
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return session
+
+
+class RecaptchaClient:
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = _build_session,
+        verdict_ttl_seconds: float = DEFAULT_VERDICT_TTL_SECONDS,
+        max_cached_verdicts: int = DEFAULT_MAX_CACHED_VERDICTS,
+        clock: Callable[[], float] = time.monotonic,
+        verify_url: str = VERIFY_URL,
+    ):
+        self._session_factory = session_factory
+        self._session: Optional[Any] = None
+        self._verdict_ttl_seconds = verdict_ttl_seconds
+        self._max_cached_verdicts = max_cached_verdicts
+        self._clock = clock
+        self._verify_url = verify_url
+        self._verdicts: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verify(self, token: str, secret_key: str, timeout: float) -> bool:
+        # Tokens are single use, so a retried trigger must reuse the first
+        # verdict instead of asking Google again.
+        cache_key = hashlib.sha256(f"{secret_key}:{token}".encode()).hexdigest()
+
+        verdict = self._get_cached_verdict(cache_key)
+        if verdict is not None:
+            return verdict
+
+        if timeout <= 0:
+            raise RecaptchaUnavailableError()
+
+        try:
+            response = self._get_session().post(
+                self._verify_url,
+                data={"secret": secret_key, "response": token},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            verdict = bool(response.json().get("success", False))
+        except Exception as exc:
+            raise RecaptchaUnavailableError() from exc
+
+        self._cache_verdict(cache_key, verdict)
+        return verdict
+
+    def warm_up(self, timeout: float) -> None:
+        # Leaves a pooled connection to Google for the first verification.
+        self._get_session().head(self._verify_url, timeout=timeout)
+
+    def _get_session(self) -> Any:
+        if not self._session:
+            with self._lock:
+                if not self._session:
+                    self._session = self._session_factory()
+        return self._session
+
+    def _get_cached_verdict(self, cache_key: str) -> Optional[bool]:
+        with self._lock:
+            cached = self._verdicts.get(cache_key)
+            if not cached:
+                return None
+            verdict, expires_at = cached
+            if expires_at <= self._clock():
+                del self._verdicts[cache_key]
+                return None
+            self._verdicts.move_to_end(cache_key)
+            return verdict
+
+    def _cache_verdict(self, cache_key: str, verdict: bool) -> None:
+        with self._lock:
+            self._verdicts[cache_key] = (
+                verdict,
+                self._clock() + self._verdict_ttl_seconds,
+            )
+            self._verdicts.move_to_end(cache_key)
+            while len(self._verdicts) > self._max_cached_verdicts:
+                self._verdicts.popitem(last=False)
+
+
+_recaptcha_client: Optional[RecaptchaClient] = None
+
+
+def get_recaptcha_client() -> RecaptchaClient:
+    global _recaptcha_client
+    if not _recaptcha_client:
+        _recaptcha_client = RecaptchaClient()
+    return _recaptcha_client
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.adapters.recaptcha import RecaptchaClient, RecaptchaUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecaptchaClientTests(unittest.TestCase):
+    def _session(self, success=True):
+        session = MagicMock()
+        session.post.return_value.json.return_value = {"success": success}
+        return session
+
+    def test_verifies_token_with_timeout_on_shared_session(self):
+        session = self._session()
+        session_factory = MagicMock(return_value=session)
+        client = RecaptchaClient(session_factory=session_factory)
+
+        self.assertTrue(client.verify("token-1", "secret", timeout=1.5))
+        self.assertTrue(client.verify("token-2", "secret", timeout=1.5))
+
+        session_factory.assert_called_once()
+        _, kwargs = session.post.call_args
+        self.assertEqual(kwargs["timeout"], 1.5)
+        self.assertEqual(
+            kwargs["data"], {"secret": "secret", "response": "token-2"}
+        )
+
+    def test_reuses_verdict_for_retried_token(self):
+        session = self._session(success=False)
+        client = RecaptchaClient(session_factory=lambda: session)
+
+        self.assertFalse(client.verify("token", "secret", timeout=1))
+        self.assertFalse(client.verify("token", "secret", timeout=1))
+
+        session.post.assert_called_once()
+
+    def test_expired_verdicts_are_verified_again(self):
+        session = self._session()
+        clock = FakeClock()
+        client = RecaptchaClient(
+            session_factory=lambda: session,
+            verdict_ttl_seconds=10,
+            clock=clock,
+        )
+
+        client.verify("token", "secret", timeout=1)
+        clock.now = 11
+        client.verify("token", "secret", timeout=1)
+
+        self.assertEqual(session.post.call_count, 2)
+
+    def test_evicts_least_recently_used_verdicts(self):
+        session = self._session()
+        client = RecaptchaClient(
+            session_factory=lambda: session, max_cached_verdicts=1
+        )
+
+        client.verify("token-1", "secret", timeout=1)
+        client.verify("token-2", "secret", timeout=1)
+        client.verify("token-1", "secret", timeout=1)
+
+        self.assertEqual(session.post.call_count, 3)
+
+    def test_raises_when_budget_is_spent(self):
+        session = self._session()
+        client = RecaptchaClient(session_factory=lambda: session)
+
+        with self.assertRaises(RecaptchaUnavailableError):
+            client.verify("token", "secret", timeout=0)
+
+        session.post.assert_not_called()
+
+    def test_raises_when_verification_request_fails(self):
+        session = MagicMock()
+        session.post.side_effect = TimeoutError()
+        client = RecaptchaClient(session_factory=lambda: session)
+
+        with self.assertRaises(RecaptchaUnavailableError):
+            client.verify("token", "secret", timeout=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
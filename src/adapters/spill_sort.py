@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import tempfile
+import threading
+
+from operator import itemgetter
+from typing import Any, Iterator, List, Tuple
+
+SpillRecord = Tuple[str, Any]
+
+_record_key = itemgetter(0)
+
+
+def _read_run(path: str) -> Iterator[SpillRecord]:
+    with open(path, encoding="utf-8") as run:
+        for line in run:
+            key, value = json.loads(line)
+            yield key, value
+
+
+class SpillSorter:
+    """Sorts records by key, spilling sorted runs to disk past a size."""
+
+    def __init__(self, directory: str, max_items_in_memory: int):
+        self._directory = directory
+        self._max_items_in_memory = max_items_in_memory
+        self._buffer: List[SpillRecord] = []
+        self._runs: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def run_count(self) -> int:
+        return len(self._runs)
+
+    def add(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._buffer.append((key, value))
+            if len(self._buffer) < self._max_items_in_memory:
+                return
+            buffer, self._buffer = self._buffer, []
+        # Written outside the lock, producers keep filling the next run.
+        self._write_run(buffer)
+
+    def _write_run(self, records: List[SpillRecord]) -> None:
+        records.sort(key=_record_key)
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self._directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as run:
+            run.writelines(
+                json.dumps(record, separators=(",", ":")) + "\n"
+                for record in records
+            )
+        with self._lock:
+            self._runs.append(path)
+
+    def __iter__(self) -> Iterator[SpillRecord]:
+        # Merging holds one record per run besides the unspilled buffer.
+        self._buffer.sort(key=_record_key)
+        return heapq.merge(
+            self._buffer,
+            *(_read_run(path) for path in self._runs),
+            key=_record_key,
+        )
@@ -0,0 +1,38 @@
+import os
+import random
+import tempfile
+import unittest
+
+from .spill_sort import SpillSorter
+
+
+class SpillSorterTests(unittest.TestCase):
+    def test_sorts_records_across_spilled_runs(self):
+        keys = [f"user-{i:04d}" for i in range(1000)]
+        shuffled = random.Random(0).sample(keys, len(keys))
+
+        with tempfile.TemporaryDirectory() as directory:
+            sorter = SpillSorter(directory, max_items_in_memory=100)
+            for key in shuffled:
+                sorter.add(key, {"key": key})
+
+            self.assertEqual(sorter.run_count, 10)
+            self.assertEqual(len(os.listdir(directory)), 10)
+            records = list(sorter)
+
+        self.assertEqual([key for key, _ in records], keys)
+        self.assertEqual(records[0][1], {"key": "user-0000"})
+
+    def test_merges_unspilled_records(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sorter = SpillSorter(directory, max_items_in_memory=2)
+            for key in ("c", "a", "b"):
+                sorter.add(key, True)
+
+            self.assertEqual(
+                list(sorter), [("a", True), ("b", True), ("c", True)]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+from typing import Any, Callable, Iterable, Optional, Protocol
+
+import src.adapters.aws as aws_adapter
+
+# GetParameters accepts at most 10 names per call.
+GET_PARAMETERS_CHUNK_SIZE = 10
+DEFAULT_TTL_SECONDS = 300.0
+# Lambda keeps /tmp when an execution environment is initialized again.
+SNAPSHOT_PATH = "/tmp/ssm-parameters.json"
+
+
+class SSMClient(Protocol):
+    def get_parameters(
+        self, *, Names: list[str], WithDecryption: bool
+    ) -> dict[str, Any]: ...
+
+
+class MissingParameterError(ValueError):
+    def __init__(self, names: Iterable[str]):
+        super().__init__(
+            f"SSM parameters not found: {', '.join(sorted(names))}"
+        )
+
+
+class ParameterSnapshot:
+    """Parameter values kept on local disk, with their wall clock expiry."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self._path = path
+        self._clock = clock
+
+    def load(self) -> dict[str, tuple[str, float]]:
+        try:
+            with open(self._path, encoding="utf-8") as snapshot:
+                entries = json.load(snapshot)
+            now = self._clock()
+            return {
+                name: (str(value), float(expires_at))
+                for name, (value, expires_at) in entries.items()
+                if expires_at > now
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def save(self, entries: dict[str, tuple[str, float]]) -> None:
+        # Written aside and renamed, a crash never leaves a partial file.
+        temporary_path = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(
+                temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as snapshot:
+                json.dump(entries, snapshot)
+            os.replace(temporary_path, self._path)
+        except OSError:
+            pass
+
+
+class ParameterCache:
+    def __init__(
+        self,
+        client_factory: Callable[[], SSMClient],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        snapshot: Optional[ParameterSnapshot] = None,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self._client_factory = client_factory
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._snapshot = snapshot
+        self._values: dict[str, tuple[str, float]] = {}
+        self._persisted: set[str] = set()
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        if snapshot:
+            offset = clock() - wall_clock()
+            for name, (value, expires_at) in snapshot.load().items():
+                self._values[name] = (value, expires_at + offset)
+                self._persisted.add(name)
+
+    def get_many(
+        self, names: Iterable[str], persist: bool = False
+    ) -> dict[str, str]:
+        # Only names fetched with persist are written to the snapshot,
+        # secrets must never be.
+        names = list(dict.fromkeys(names))
+        now = self._clock()
+
+        with self._lock:
+            if persist:
+                self._persisted.update(names)
+            missing = [name for name in names if name not in self._values]
+            stale = [
+                name
+                for name in names
+                if name in self._values and self._values[name][1] <= now
+            ]
+
+        if missing:
+            self._fetch(missing)
+        if stale:
+            self._refresh_in_background(stale)
+
+        with self._lock:
+            return {name: self._values[name][0] for name in names}
+
+    def get(self, name: str) -> str:
+        return self.get_many([name])[name]
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        refresh_thread = self._refresh_thread
+        if refresh_thread:
+            refresh_thread.join(timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _fetch(self, names: list[str]) -> None:
+        client = self._client_factory()
+        values: dict[str, str] = {}
+        invalid: list[str] = []
+
+        for start in range(0, len(names), GET_PARAMETERS_CHUNK_SIZE):
+            response = client.get_parameters(
+                Names=names[start : start + GET_PARAMETERS_CHUNK_SIZE],
+                WithDecryption=True,
+            )
+            for parameter in response.get("Parameters", []):
+                values[parameter["Name"]] = parameter["Value"]
+            invalid.extend(response.get("InvalidParameters", []))
+
+        if invalid:
+            raise MissingParameterError(invalid)
+
+        expires_at = self._clock() + self._ttl_seconds
+        with self._lock:
+            for name, value in values.items():
+                self._values[name] = (value, expires_at)
+            if not self._snapshot or self._persisted.isdisjoint(values):
+                return
+            offset = self._wall_clock() - self._clock()
+            entries = {
+                name: (self._values[name][0], self._values[name][1] + offset)
+                for name in self._persisted
+                if name in self._values
+            }
+        self._snapshot.save(entries)
+
+    def _refresh_in_background(self, names: list[str]) -> None:
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            # Stale values keep being served while the refresh runs, and a
+            # failed refresh leaves them in place for the next attempt.
+            self._refresh_thread = threading.Thread(
+                target=self._refresh, args=(names,), daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh(self, names: list[str]) -> None:
+        try:
+            self._fetch(names)
+        except Exception:
+            pass
+
+
+_parameter_cache: Optional[ParameterCache] = None
+
+
+def get_parameter_cache() -> ParameterCache:
+    global _parameter_cache
+    if not _parameter_cache:
+        _parameter_cache = ParameterCache(
+            aws_adapter.get_ssm_client,
+            snapshot=ParameterSnapshot(SNAPSHOT_PATH),
+        )
+    return _parameter_cache
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+
+from src.adapters.ssm import (
+    MissingParameterError,
+    ParameterCache,
+    ParameterSnapshot,
+)
+
+
+class FakeSSMClient:
+    def __init__(self, values):
+        self.values = dict(values)
+        self.calls = []
+
+    def get_parameters(self, *, Names, WithDecryption):
+        self.calls.append(list(Names))
+        return {
+            "Parameters": [
+                {"Name": name, "Value": self.values[name]}
+                for name in Names
+                if name in self.values
+            ],
+            "InvalidParameters": [
+                name for name in Names if name not in self.values
+            ],
+        }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ParameterCacheTests(unittest.TestCase):
+    def test_fetches_names_in_chunks_of_ten(self):
+        client = FakeSSMClient({f"/param/{i}": str(i) for i in range(23)})
+        cache = ParameterCache(lambda: client)
+
+        values = cache.get_many(f"/param/{i}" for i in range(23))
+
+        self.assertEqual(values["/param/22"], "22")
+        self.assertEqual([len(call) for call in client.calls], [10, 10, 3])
+
+    def test_serves_cached_values_without_calling_ssm(self):
+        client = FakeSSMClient({"/a": "1", "/b": "2"})
+        cache = ParameterCache(lambda: client)
+
+        cache.get_many(["/a", "/b"])
+        values = cache.get_many(["/b", "/a", "/a"])
+
+        self.assertEqual(values, {"/a": "1", "/b": "2"})
+        self.assertEqual(len(client.calls), 1)
+
+    def test_only_fetches_names_missing_from_cache(self):
+        client = FakeSSMClient({"/a": "1", "/b": "2"})
+        cache = ParameterCache(lambda: client)
+
+        cache.get("/a")
+        cache.get_many(["/a", "/b"])
+
+        self.assertEqual(client.calls, [["/a"], ["/b"]])
+
+    def test_raises_for_missing_parameters(self):
+        client = FakeSSMClient({"/a": "1"})
+        cache = ParameterCache(lambda: client)
+
+        with self.assertRaisesRegex(MissingParameterError, "/missing"):
+            cache.get_many(["/a", "/missing"])
+
+    def test_refreshes_expired_values_in_background(self):
+        client = FakeSSMClient({"/secret": "old"})
+        clock = FakeClock()
+        cache = ParameterCache(lambda: client, ttl_seconds=60, clock=clock)
+
+        self.assertEqual(cache.get("/secret"), "old")
+
+        client.values["/secret"] = "rotated"
+        clock.now = 61
+
+        self.assertEqual(cache.get("/secret"), "old")
+        cache.wait_for_refresh(timeout=5)
+        self.assertEqual(cache.get("/secret"), "rotated")
+        self.assertEqual(len(client.calls), 2)
+
+    def test_keeps_stale_values_when_refresh_fails(self):
+        client = FakeSSMClient({"/secret": "old"})
+        clock = FakeClock()
+        cache = ParameterCache(lambda: client, ttl_seconds=60, clock=clock)
+        cache.get("/secret")
+
+        client.values.clear()
+        clock.now = 61
+        cache.get("/secret")
+        cache.wait_for_refresh(timeout=5)
+
+        self.assertEqual(cache.get("/secret"), "old")
+
+
+class ParameterSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "ssm-parameters.json")
+
+    def test_warm_start_serves_persisted_values_without_ssm(self):
+        client = FakeSSMClient({"/pool-id": "pool", "/secret": "secret"})
+        cache = ParameterCache(
+            lambda: client, snapshot=ParameterSnapshot(self.path)
+        )
+        cache.get_many(["/pool-id"], persist=True)
+        cache.get("/secret")
+
+        restarted_client = FakeSSMClient({})
+        restarted = ParameterCache(
+            lambda: restarted_client, snapshot=ParameterSnapshot(self.path)
+        )
+
+        self.assertEqual(restarted.get("/pool-id"), "pool")
+        self.assertEqual(restarted_client.calls, [])
+        with self.assertRaises(MissingParameterError):
+            restarted.get("/secret")
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_ignores_expired_and_corrupt_snapshots(self):
+        snapshot = ParameterSnapshot(self.path, clock=lambda: 1000.0)
+        snapshot.save({"/fresh": ("1", 1001.0), "/expired": ("2", 999.0)})
+
+        self.assertEqual(snapshot.load(), {"/fresh": ("1", 1001.0)})
+
+        with open(self.path, "w") as corrupt:
+            corrupt.write("{not json")
+        self.assertEqual(snapshot.load(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
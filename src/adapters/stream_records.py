@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+USER_ID_KEY = "user_id"
+
+
+class UserStreamRecord(NamedTuple):
+    event_name: str
+    user_id: str
+
+
+StreamRecordHandler = Callable[[UserStreamRecord], None]
+
+
+def iter_user_stream_records(
+    detail: Optional[Mapping[str, Any]],
+    event_names: Optional[Collection[str]] = None,
+) -> Iterator[UserStreamRecord]:
+    # Keys are read straight from the DynamoDB wire format. The users table
+    # is keyed by a string user_id, so no general deserializer is needed.
+    for record in (detail or {}).get("Records") or ():
+        event_name = record.get("eventName", "")
+        if event_names is not None and event_name not in event_names:
+            continue
+        stream_record = record.get("dynamodb") or {}
+        user_id = (
+            (stream_record.get("Keys") or {}).get(USER_ID_KEY) or {}
+        ).get("S")
+        if not user_id:
+            continue
+        yield UserStreamRecord(event_name, user_id)
+
+
+class StreamRecordDispatcher:
+    def __init__(self):
+        self._handlers: Dict[str, List[StreamRecordHandler]] = {}
+
+    @property
+    def event_names(self) -> Collection[str]:
+        return self._handlers.keys()
+
+    def register(self, event_name: str, handler: StreamRecordHandler) -> None:
+        self._handlers.setdefault(event_name, []).append(handler)
+
+    def dispatch(self, records: Iterable[UserStreamRecord]) -> int:
+        dispatched = 0
+        for record in records:
+            handlers = self._handlers.get(record.event_name)
+            if not handlers:
+                continue
+            for handler in handlers:
+                handler(record)
+            dispatched += 1
+        return dispatched
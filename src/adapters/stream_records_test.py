@@ -0,0 +1,98 @@
+import unittest
+
+from .stream_records import (
+    StreamRecordDispatcher,
+    UserStreamRecord,
+    iter_user_stream_records,
+)
+
+
+def _record(event_name, user_id, sequence_number="seq-1"):
+    return {
+        "eventID": f"event-{sequence_number}",
+        "eventName": event_name,
+        "dynamodb": {
+            "Keys": {"user_id": {"S": user_id}},
+            "SequenceNumber": sequence_number,
+        },
+    }
+
+
+class IterUserStreamRecordsTests(unittest.TestCase):
+    def test_reads_user_id_from_keys(self):
+        records = iter_user_stream_records(
+            {"Records": [_record("REMOVE", "user-1", "seq-7")]}
+        )
+
+        self.assertEqual(list(records), [UserStreamRecord("REMOVE", "user-1")])
+
+    def test_skips_records_without_user_id(self):
+        records = iter_user_stream_records(
+            {
+                "Records": [
+                    {"eventName": "REMOVE", "dynamodb": {}},
+                    {"eventName": "REMOVE"},
+                    {
+                        "eventName": "REMOVE",
+                        "dynamodb": {"Keys": {"user_id": {"N": "1"}}},
+                    },
+                ]
+            }
+        )
+
+        self.assertEqual(list(records), [])
+
+    def test_skips_unwanted_event_names_before_decoding(self):
+        records = iter_user_stream_records(
+            {
+                "Records": [
+                    _record("INSERT", "user-1", "seq-1"),
+                    _record("REMOVE", "user-2", "seq-2"),
+                ]
+            },
+            event_names={"REMOVE"},
+        )
+
+        self.assertEqual([record.user_id for record in records], ["user-2"])
+
+    def test_handles_missing_detail(self):
+        self.assertEqual(list(iter_user_stream_records(None)), [])
+        self.assertEqual(list(iter_user_stream_records({"Records": None})), [])
+
+
+class StreamRecordDispatcherTests(unittest.TestCase):
+    def test_dispatches_by_event_name(self):
+        inserted, removed = [], []
+        dispatcher = StreamRecordDispatcher()
+        dispatcher.register("INSERT", inserted.append)
+        dispatcher.register("REMOVE", removed.append)
+
+        dispatched = dispatcher.dispatch(
+            iter_user_stream_records(
+                {
+                    "Records": [
+                        _record("INSERT", "user-1", "seq-1"),
+                        _record("MODIFY", "user-1", "seq-2"),
+                        _record("REMOVE", "user-1", "seq-3"),
+                    ]
+                }
+            )
+        )
+
+        self.assertEqual(dispatched, 2)
+        self.assertEqual(inserted, [UserStreamRecord("INSERT", "user-1")])
+        self.assertEqual(removed, [UserStreamRecord("REMOVE", "user-1")])
+
+    def test_calls_every_handler_of_an_event(self):
+        calls = []
+        dispatcher = StreamRecordDispatcher()
+        dispatcher.register("REMOVE", lambda record: calls.append("first"))
+        dispatcher.register("REMOVE", lambda record: calls.append("second"))
+
+        dispatcher.dispatch([UserStreamRecord("REMOVE", "user-1")])
+
+        self.assertEqual(calls, ["first", "second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
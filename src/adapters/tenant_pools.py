@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import src.adapters.aws as aws_adapter
+import src.adapters.ssm as ssm_adapter
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+    from src.adapters.deadline import Deadline
+    from src.settings import Settings, TenantPoolSettings, TenantRoutingSettings
+
+USER_POOL_ID_PATTERN = re.compile(r"^[\w-]+_[0-9a-zA-Z]+$")
+
+
+class UnknownUserPoolError(ValueError):
+    def __init__(self, user_pool_id: str):
+        super().__init__(f"User pool {user_pool_id} is not served here.")
+
+
+class TenantPool:
+    def __init__(
+        self,
+        user_pool_id: str,
+        settings: Settings,
+        region_name: Optional[str] = None,
+    ):
+        self.user_pool_id = user_pool_id
+        self.settings = settings
+        self.region_name = region_name
+        self._dynamodb_clients: dict[Optional[float], Any] = {}
+        self._lock = threading.Lock()
+
+    def get_dynamodb_client(
+        self, deadline: Optional[Deadline] = None
+    ) -> DynamoDBClient:
+        # Pools in the function's own region share its clients and their
+        # warm connections.
+        if not self.region_name:
+            return aws_adapter.get_dynamodb_client(deadline)
+
+        budget_tier = deadline.budget_tier() if deadline else None
+        with self._lock:
+            client = self._dynamodb_clients.get(budget_tier)
+            if not client:
+                client = aws_adapter.create_client(
+                    "dynamodb", deadline, self.region_name
+                )
+                self._dynamodb_clients[budget_tier] = client
+        return client
+
+
+class TenantPoolRouter:
+    def __init__(
+        self,
+        load_pool_settings: Callable[[str], TenantPoolSettings],
+        build_pool: Callable[[str, TenantPoolSettings], TenantPool],
+        max_cached_pools: int,
+        refresh_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._load_pool_settings = load_pool_settings
+        self._build_pool = build_pool
+        self._max_cached_pools = max_cached_pools
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._pools: OrderedDict[
+            str, tuple[TenantPoolSettings, TenantPool, float]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_pool_id: str) -> TenantPool:
+        with self._lock:
+            cached = self._pools.get(user_pool_id)
+            if cached:
+                self._pools.move_to_end(user_pool_id)
+                if cached[2] > self._clock():
+                    return cached[1]
+
+        pool_settings = self._load_pool_settings(user_pool_id)
+        # A pool whose settings did not change keeps its clients.
+        if cached and cached[0] == pool_settings:
+            pool = cached[1]
+        else:
+            pool = self._build_pool(user_pool_id, pool_settings)
+
+        with self._lock:
+            self._pools[user_pool_id] = (
+                pool_settings,
+                pool,
+                self._clock() + self._refresh_seconds,
+            )
+            self._pools.move_to_end(user_pool_id)
+            while len(self._pools) > self._max_cached_pools:
+                self._pools.popitem(last=False)
+        return pool
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pools)
+
+
+def _load_pool_settings(
+    routing_settings: TenantRoutingSettings, user_pool_id: str
+) -> TenantPoolSettings:
+    from src.settings import TenantPoolSettings
+
+    if not USER_POOL_ID_PATTERN.match(user_pool_id):
+        raise UnknownUserPoolError(user_pool_id)
+
+    parameter_name = (
+        f"{routing_settings.parameter_prefix.rstrip('/')}/{user_pool_id}"
+    )
+    try:
+        value = ssm_adapter.get_parameter_cache().get_many(
+            [parameter_name], persist=True
+        )[parameter_name]
+    except ssm_adapter.MissingParameterError as exc:
+        raise UnknownUserPoolError(user_pool_id) from exc
+
+    try:
+        return TenantPoolSettings.model_validate_json(value)
+    except ValueError as exc:
+        raise ValueError(
+            f"Settings of user pool {user_pool_id} are invalid."
+        ) from exc
+
+
+_tenant_pool_router: Optional[TenantPoolRouter] = None
+_tenant_pool_router_lock = threading.Lock()
+
+
+def _get_router(
+    settings: Settings, routing_settings: TenantRoutingSettings
+) -> TenantPoolRouter:
+    global _tenant_pool_router
+    if not _tenant_pool_router:
+        with _tenant_pool_router_lock:
+            if not _tenant_pool_router:
+                _tenant_pool_router = TenantPoolRouter(
+                    lambda user_pool_id: _load_pool_settings(
+                        routing_settings, user_pool_id
+                    ),
+                    lambda user_pool_id, pool_settings: TenantPool(
+                        user_pool_id,
+                        settings.for_user_pool(user_pool_id, pool_settings),
+                        pool_settings.region_name,
+                    ),
+                    routing_settings.max_cached_pools,
+                    routing_settings.refresh_seconds,
+                )
+    return _tenant_pool_router
+
+
+def route(settings: Settings, user_pool_id: str) -> TenantPool:
+    # Without routing a function serves the single pool it is deployed for.
+    if not settings.tenant_routing:
+        return TenantPool(user_pool_id, settings)
+    return _get_router(settings, settings.tenant_routing).get(user_pool_id)
@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.settings import TenantPoolSettings, TenantRoutingSettings
+
+from src.adapters.deadline import Deadline
+from src.adapters.ssm import ParameterCache
+from src.adapters.ssm_test import FakeSSMClient
+from src.adapters.tenant_pools import (
+    TenantPool,
+    TenantPoolRouter,
+    UnknownUserPoolError,
+    _load_pool_settings,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool_settings(users_table="users", region_name=None):
+    return TenantPoolSettings.model_validate(
+        {
+            "users_table": {"name": users_table},
+            "contacts_table": {"name": "contacts"},
+            "region_name": region_name,
+        }
+    )
+
+
+class TenantPoolRouterTests(unittest.TestCase):
+    def _router(self, configs, max_cached_pools=2):
+        self.clock = FakeClock()
+        self.load = MagicMock(side_effect=lambda pool_id: configs[pool_id])
+        self.build = MagicMock(
+            side_effect=lambda pool_id, pool_settings: TenantPool(
+                pool_id, MagicMock(), pool_settings.region_name
+            )
+        )
+        return TenantPoolRouter(
+            self.load,
+            self.build,
+            max_cached_pools=max_cached_pools,
+            refresh_seconds=60,
+            clock=self.clock,
+        )
+
+    def test_caches_resolved_pools(self):
+        router = self._router({"pool_a": _pool_settings()})
+
+        pool = router.get("pool_a")
+
+        self.assertIs(router.get("pool_a"), pool)
+        self.load.assert_called_once_with("pool_a")
+        self.build.assert_called_once()
+
+    def test_evicts_least_recently_used_pools(self):
+        router = self._router(
+            {name: _pool_settings() for name in ("pool_a", "pool_b", "pool_c")}
+        )
+
+        router.get("pool_a")
+        router.get("pool_b")
+        router.get("pool_a")
+        router.get("pool_c")
+
+        self.assertEqual(len(router), 2)
+        router.get("pool_a")
+        self.assertEqual(self.load.call_count, 3)
+        router.get("pool_b")
+        self.assertEqual(self.load.call_count, 4)
+
+    def test_refresh_keeps_pool_while_settings_are_unchanged(self):
+        configs = {"pool_a": _pool_settings()}
+        router = self._router(configs)
+        pool = router.get("pool_a")
+
+        self.clock.now = 61
+        self.assertIs(router.get("pool_a"), pool)
+        self.assertEqual(self.load.call_count, 2)
+
+        configs["pool_a"] = _pool_settings(users_table="moved")
+        self.clock.now = 122
+        self.assertIsNot(router.get("pool_a"), pool)
+        self.assertEqual(self.build.call_count, 2)
+
+
+class LoadPoolSettingsTests(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeSSMClient(
+            {
+                "/tenants/eu-west-1_abc": _pool_settings(
+                    region_name="eu-west-1"
+                ).model_dump_json(),
+                "/tenants/eu-west-1_bad": "{}",
+            }
+        )
+        patcher = patch(
+            "src.adapters.tenant_pools.ssm_adapter.get_parameter_cache",
+            return_value=ParameterCache(lambda: self.client),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.routing_settings = TenantRoutingSettings(
+            parameter_prefix="/tenants/"
+        )
+
+    def test_reads_pool_settings_from_ssm(self):
+        pool_settings = _load_pool_settings(
+            self.routing_settings, "eu-west-1_abc"
+        )
+
+        self.assertEqual(pool_settings.region_name, "eu-west-1")
+        self.assertEqual(pool_settings.users_table.name, "users")
+
+    def test_rejects_unknown_and_malformed_pool_ids(self):
+        for user_pool_id in ("eu-west-1_missing", "../recaptcha/secret"):
+            with self.subTest(user_pool_id=user_pool_id):
+                with self.assertRaises(UnknownUserPoolError):
+                    _load_pool_settings(self.routing_settings, user_pool_id)
+        self.assertEqual(self.client.calls, [["/tenants/eu-west-1_missing"]])
+
+    def test_rejects_invalid_pool_settings(self):
+        with self.assertRaisesRegex(ValueError, "are invalid"):
+            _load_pool_settings(self.routing_settings, "eu-west-1_bad")
+
+
+class TenantPoolTests(unittest.TestCase):
+    @patch("src.adapters.tenant_pools.aws_adapter")
+    def test_keeps_own_clients_only_for_other_regions(self, aws_adapter):
+        deadline = Deadline(4000, safety_margin_ms=0)
+
+        TenantPool("home_pool", MagicMock()).get_dynamodb_client(deadline)
+        aws_adapter.get_dynamodb_client.assert_called_once_with(deadline)
+
+        pool = TenantPool("eu_pool", MagicMock(), "eu-west-1")
+        client = pool.get_dynamodb_client(deadline)
+
+        self.assertIs(pool.get_dynamodb_client(deadline), client)
+        aws_adapter.create_client.assert_called_once_with(
+            "dynamodb", deadline, "eu-west-1"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import functools
+import time
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Mapping, Tuple
+
+import src.adapters.aws as aws_adapter
+
+from src.adapters.deadline import Deadline
+
+# Scheduled pings invoke a handler with {"warmUp": true} as their event.
+WARM_UP_EVENT_KEY = "warmUp"
+DEADLINE_EXCEEDED = "DeadlineExceeded"
+
+WarmUpStep = Tuple[str, Callable[[], Any]]
+
+
+@dataclass
+class WarmUpReport:
+    warm_up: bool = True
+    steps_ms: Dict[str, float] = field(default_factory=dict)
+    failed_steps: Dict[str, str] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+
+def is_warm_up_event(event: Any) -> bool:
+    return isinstance(event, Mapping) and event.get(WARM_UP_EVENT_KEY) is True
+
+
+def run_warm_up(
+    steps: Iterable[WarmUpStep],
+    deadline: Deadline,
+    clock: Callable[[], float] = time.perf_counter,
+) -> WarmUpReport:
+    # A failed step is reported and the next one still runs, since each
+    # warms something the others do not depend on.
+    report = WarmUpReport()
+    started_at = clock()
+    for name, step in steps:
+        if deadline.is_expired():
+            report.failed_steps[name] = DEADLINE_EXCEEDED
+            continue
+        step_started_at = clock()
+        try:
+            step()
+        except Exception as exc:
+            report.failed_steps[name] = type(exc).__name__
+        report.steps_ms[name] = (clock() - step_started_at) * 1000
+    report.total_ms = (clock() - started_at) * 1000
+    return report
+
+
+def warm_up_clients(
+    service_names: Iterable[aws_adapter.ServiceName], deadline: Deadline
+) -> None:
+    # Clients are cached per budget tier, an invocation with the same
+    # timeout as the ping gets the clients warmed here.
+    aws_adapter.warm_up(
+        service_names,
+        deadline.remaining_seconds() if deadline.is_bounded else None,
+    )
+
+
+def handle_warm_up(
+    warm_up_steps: Callable[[Deadline], Iterable[WarmUpStep]],
+) -> Callable[[Callable[[Any, Any], Any]], Callable[[Any, Any], Any]]:
+    # Goes above event_source, pings are answered before the event is
+    # wrapped or any business logic runs.
+    def decorator(
+        handler: Callable[[Any, Any], Any],
+    ) -> Callable[[Any, Any], Any]:
+        @functools.wraps(handler)
+        def wrapper(event: Any, context: Any) -> Any:
+            if not is_warm_up_event(event):
+                return handler(event, context)
+            deadline = Deadline.from_context(context)
+            return asdict(run_warm_up(warm_up_steps(deadline), deadline))
+
+        return wrapper
+
+    return decorator
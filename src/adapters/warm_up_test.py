@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from .deadline import Deadline
+from .warm_up import (
+    DEADLINE_EXCEEDED,
+    handle_warm_up,
+    is_warm_up_event,
+    run_warm_up,
+    warm_up_clients,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class WarmUpTests(unittest.TestCase):
+    def test_recognizes_only_warm_up_pings(self):
+        self.assertTrue(is_warm_up_event({"warmUp": True}))
+        self.assertFalse(is_warm_up_event({"warmUp": "true"}))
+        self.assertFalse(is_warm_up_event({"Records": []}))
+        self.assertFalse(is_warm_up_event(None))
+
+    def test_times_each_step_and_keeps_going_after_failures(self):
+        clock = FakeClock()
+
+        def step(seconds, error=None):
+            def run():
+                clock.now += seconds
+                if error:
+                    raise error
+
+            return run
+
+        report = run_warm_up(
+            [
+                ("settings", step(0.25)),
+                ("ssm_parameters", step(0.5, ValueError("missing"))),
+                ("dynamodb", step(0.125)),
+            ],
+            Deadline.unbounded(),
+            clock=clock,
+        )
+
+        self.assertEqual(
+            report.steps_ms,
+            {"settings": 250.0, "ssm_parameters": 500.0, "dynamodb": 125.0},
+        )
+        self.assertEqual(report.failed_steps, {"ssm_parameters": "ValueError"})
+        self.assertEqual(report.total_ms, 875.0)
+
+    def test_skips_steps_once_deadline_expires(self):
+        clock = FakeClock()
+        deadline = Deadline(1000, safety_margin_ms=0, clock=clock)
+
+        def slow_step():
+            clock.now += 2
+
+        skipped = MagicMock()
+        report = run_warm_up(
+            [("settings", slow_step), ("dynamodb", skipped)], deadline
+        )
+
+        skipped.assert_not_called()
+        self.assertEqual(report.failed_steps, {"dynamodb": DEADLINE_EXCEEDED})
+        self.assertNotIn("dynamodb", report.steps_ms)
+
+    @patch("src.adapters.warm_up.aws_adapter.warm_up")
+    def test_warms_clients_for_the_ping_budget(self, mock_warm_up):
+        clock = FakeClock()
+
+        warm_up_clients(
+            ("dynamodb",), Deadline(4000, safety_margin_ms=0, clock=clock)
+        )
+        warm_up_clients(("cognito-idp",), Deadline.unbounded())
+
+        self.assertEqual(
+            mock_warm_up.call_args_list[0].args, (("dynamodb",), 4.0)
+        )
+        self.assertEqual(
+            mock_warm_up.call_args_list[1].args, (("cognito-idp",), None)
+        )
+
+    def test_answers_pings_without_calling_the_handler(self):
+        handler = MagicMock(return_value="handled")
+        step = MagicMock()
+        wrapped = handle_warm_up(lambda deadline: [("settings", step)])(handler)
+
+        report = wrapped({"warmUp": True}, object())
+
+        handler.assert_not_called()
+        step.assert_called_once()
+        self.assertTrue(report["warm_up"])
+        self.assertIn("settings", report["steps_ms"])
+
+        self.assertEqual(wrapped({"Records": []}, "context"), "handled")
+        handler.assert_called_once_with({"Records": []}, "context")
+
+
+if __name__ == "__main__":
+    unittest.main()
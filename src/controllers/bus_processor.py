@@ -2,7 +2,15 @@
 version: 1.0.0
 """
 
+from typing import Optional
+
+import src.adapters.analytics as analytics_adapter
 import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.deadline import Deadline
 
 from aws_lambda_powertools.utilities.data_classes import event_source
 from aws_lambda_powertools.utilities.data_classes.event_bridge_event import (
@@ -10,14 +18,62 @@ from aws_lambda_powertools.utilities.data_classes.event_bridge_event import (
 )
 
 from src.settings import Settings
-from src.facades import handle_bus_event
+from src.facades.handle_bus_event import handle_bus_event
+
+settings: Optional[Settings] = None
+
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("cognito-idp", "dynamodb"))
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+        rate_limits_adapter.configure(settings.rate_limits)
+    return settings
 
-settings = Settings.model_validate({})
-cognito_client = aws_adapter.get_cognito_client()
 
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        ("ssm_parameters", lambda: _get_settings().refresh_ssm_parameters()),
+        (
+            "clients",
+            lambda: warm_up_adapter.warm_up_clients(
+                ("cognito-idp", "dynamodb"), deadline
+            ),
+        ),
+    ]
 
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
 @event_source(data_class=EventBridgeEvent)
 def lambda_handler(event: EventBridgeEvent, context):
-    handle_bus_event(event, settings, cognito_client)
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation("bus-processor", settings.metrics)
+
+    deadline = Deadline.from_context(context)
+    cognito_client = aws_adapter.get_cognito_client(deadline)
+    dynamodb_client = aws_adapter.get_dynamodb_client(deadline)
+
+    try:
+        report = handle_bus_event(
+            event, settings, cognito_client, dynamodb_client, deadline=deadline
+        )
+    finally:
+        analytics_adapter.flush(deadline)
+    rate_limits_adapter.report_usage()
+
+    if report.failed_user_ids:
+        # EventBridge invokes this function asynchronously and has no
+        # partial failure response, so a failure redelivers the whole event.
+        # Only the recently deleted users each environment remembers keep
+        # the replay from deleting the other users of the event again.
+        raise RuntimeError(
+            "Failed to delete users from Cognito: "
+            + ", ".join(report.failed_user_ids)
+        )
 
-    return {"status": "ok"}
+    return {"status": "ok", "deleted": len(report.deleted_user_ids)}
@@ -0,0 +1,76 @@
+"""
+version: 1.0.0
+"""
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Optional
+
+import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.checkpoints import CheckpointStore
+from src.adapters.deadline import Deadline
+
+from aws_lambda_powertools.utilities.data_classes import event_source
+from aws_lambda_powertools.utilities.data_classes.event_bridge_event import (
+    EventBridgeEvent,
+)
+
+from src.settings import Settings
+from src.facades.sweep_unconfirmed_users import sweep_unconfirmed_users
+
+settings: Optional[Settings] = None
+
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("cognito-idp", "dynamodb"))
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+        rate_limits_adapter.configure(settings.rate_limits)
+    return settings
+
+
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        ("ssm_parameters", lambda: _get_settings().refresh_ssm_parameters()),
+        (
+            "clients",
+            lambda: warm_up_adapter.warm_up_clients(
+                ("cognito-idp", "dynamodb"), deadline
+            ),
+        ),
+    ]
+
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
+@event_source(data_class=EventBridgeEvent)
+def lambda_handler(event: EventBridgeEvent, context):
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation(
+        "cleanup-unconfirmed-users", settings.metrics
+    )
+
+    deadline = Deadline.from_context(context)
+    checkpoint_store = CheckpointStore(
+        aws_adapter.get_dynamodb_client(deadline),
+        settings.ensure_jobs_table_settings().name,
+    )
+
+    report = sweep_unconfirmed_users(
+        settings,
+        aws_adapter.get_cognito_client(deadline),
+        checkpoint_store,
+        datetime.now(timezone.utc),
+        deadline=deadline,
+    )
+    rate_limits_adapter.report_usage()
+
+    return asdict(report)
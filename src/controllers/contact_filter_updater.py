@@ -0,0 +1,61 @@
+"""
+version: 1.0.0
+"""
+
+from dataclasses import asdict
+from typing import Any, Optional
+
+import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.contact_filter import SnapshotStore
+from src.adapters.deadline import Deadline
+
+from src.settings import Settings
+from src.facades.refresh_contact_filter import refresh_contact_filter
+
+settings: Optional[Settings] = None
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+    return settings
+
+
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        (
+            "dynamodb",
+            lambda: warm_up_adapter.warm_up_clients(("dynamodb",), deadline),
+        ),
+        ("s3", aws_adapter.get_s3_client),
+    ]
+
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
+def lambda_handler(event: dict[str, Any], context):
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation("contact-filter-updater", settings.metrics)
+
+    filter_settings = settings.ensure_contact_filter_settings()
+    snapshot_store = SnapshotStore(
+        aws_adapter.get_s3_client(),
+        filter_settings.snapshot_bucket,
+        filter_settings.snapshot_key,
+    )
+
+    # Contacts table stream batches carry Records, the daily schedule does
+    # not and rebuilds the filter from the table.
+    report = refresh_contact_filter(
+        settings,
+        aws_adapter.get_dynamodb_client(),
+        snapshot_store,
+        records=event.get("Records"),
+    )
+
+    return asdict(report)
@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[2]
+
+# Milliseconds each handler module may spend being imported in a fresh
+# interpreter. Override with HANDLER_IMPORT_BUDGET_MS on slow runners.
+HANDLER_IMPORT_BUDGET_MS = {
+    "src.controllers.bus_processor": 250.0,
+    "src.controllers.cleanup_unconfirmed_users": 250.0,
+    "src.controllers.contact_filter_updater": 250.0,
+    "src.controllers.import_users": 250.0,
+    "src.controllers.post_confirmation_trigger": 250.0,
+    "src.controllers.pre_sign_up_trigger": 250.0,
+    "src.controllers.reconcile_users": 250.0,
+    "src.controllers.sign_up_api": 250.0,
+}
+
+HANDLER_FORBIDDEN_MODULES = {
+    "src.controllers.bus_processor": (
+        "src.facades.process_pre_sign_up",
+        "src.dto.sign_up",
+        "src.validators.validate_recaptcha",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.cleanup_unconfirmed_users": (
+        "src.facades.handle_bus_event",
+        "src.facades.process_pre_sign_up",
+        "src.dto.sign_up",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.contact_filter_updater": (
+        "src.facades.handle_bus_event",
+        "src.facades.process_pre_sign_up",
+        "src.dto.sign_up",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.import_users": (
+        "src.facades.handle_bus_event",
+        "src.facades.process_pre_sign_up",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.post_confirmation_trigger": (
+        "src.facades.handle_bus_event",
+        "src.facades.process_pre_sign_up",
+        "src.dto.sign_up",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.pre_sign_up_trigger": (
+        "src.facades.handle_bus_event",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.reconcile_users": (
+        "src.facades.handle_bus_event",
+        "src.facades.process_pre_sign_up",
+        "src.dto.sign_up",
+        "saas_python_lib.recaptcha",
+    ),
+    "src.controllers.sign_up_api": (
+        "src.facades.handle_bus_event",
+        "src.facades.process_pre_sign_up",
+    ),
+}
+
+IMPORT_SAMPLES = 3
+
+_PROBE = """
+import importlib
+import json
+import sys
+import time
+
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed_ms = (time.perf_counter() - started) * 1000
+
+aws_adapter = sys.modules.get("src.adapters.aws")
+clients = [
+    service_name
+    for service_name, _ in getattr(aws_adapter, "_clients", {})
+]
+probe = {"elapsed_ms": elapsed_ms, "modules": list(sys.modules)}
+probe["clients"] = clients
+print(json.dumps(probe))
+"""
+
+
+def _probe_import(module_name: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, module_name],
+        cwd=REPOSITORY_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class HandlerImportBudgetTests(unittest.TestCase):
+    def test_handlers_import_within_budget(self):
+        budget_override = os.getenv("HANDLER_IMPORT_BUDGET_MS")
+
+        for module_name, budget_ms in HANDLER_IMPORT_BUDGET_MS.items():
+            if budget_override:
+                budget_ms = float(budget_override)
+            with self.subTest(handler=module_name):
+                # The fastest sample is the least affected by runner noise.
+                elapsed_ms = min(
+                    _probe_import(module_name)["elapsed_ms"]
+                    for _ in range(IMPORT_SAMPLES)
+                )
+                self.assertLessEqual(
+                    elapsed_ms,
+                    budget_ms,
+                    f"{module_name} took {elapsed_ms:.1f}ms to import",
+                )
+
+    def test_handlers_only_import_what_they_use(self):
+        for module_name, forbidden in HANDLER_FORBIDDEN_MODULES.items():
+            with self.subTest(handler=module_name):
+                probe = _probe_import(module_name)
+                loaded = set(probe["modules"]) & set(forbidden)
+                self.assertEqual(loaded, set())
+                self.assertEqual(probe["clients"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
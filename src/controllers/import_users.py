@@ -0,0 +1,77 @@
+"""
+version: 1.0.0
+"""
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.checkpoints import CheckpointStore
+from src.adapters.deadline import Deadline
+from src.adapters.import_files import detect_import_format, iter_import_rows
+
+from src.settings import Settings
+from src.facades.import_users import JOB_ID_PREFIX, import_users
+
+settings: Optional[Settings] = None
+
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("dynamodb",))
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+    return settings
+
+
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        (
+            "dynamodb",
+            lambda: warm_up_adapter.warm_up_clients(("dynamodb",), deadline),
+        ),
+        ("s3", aws_adapter.get_s3_client),
+    ]
+
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
+def lambda_handler(event: dict[str, Any], context):
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation("import-users", settings.metrics)
+
+    deadline = Deadline.from_context(context)
+    bucket, key = event["bucket"], event["key"]
+    import_format = detect_import_format(key)
+    try:
+        response = aws_adapter.get_s3_client().get_object(
+            Bucket=bucket, Key=key
+        )
+    except (BotoCoreError, ClientError) as exc:
+        raise ValueError(f"Unable to read import file {key}.") from exc
+
+    dynamodb_client = aws_adapter.get_dynamodb_client(deadline)
+    # The ETag keeps a replaced file from resuming the previous checkpoint.
+    # An unfinished import completes when invoked again with the same event.
+    report = import_users(
+        settings,
+        dynamodb_client,
+        iter_import_rows(response["Body"], import_format),
+        CheckpointStore(
+            dynamodb_client, settings.ensure_jobs_table_settings().name
+        ),
+        f"{JOB_ID_PREFIX}#{bucket}/{key}#{response.get('ETag', '')}",
+        datetime.now(timezone.utc),
+        deadline=deadline,
+    )
+
+    return asdict(report)
@@ -3,26 +3,98 @@ version: 1.0.0
 """
 
 from src.settings import Settings
+import src.adapters.analytics as analytics_adapter
 import src.adapters.aws as aws_adapter
+import src.adapters.idempotency as idempotency_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.tenant_pools as tenant_pools_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.deadline import Deadline
 
 from datetime import datetime, timezone
+from typing import Optional
 
 from aws_lambda_powertools.utilities.data_classes import event_source
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
     PostConfirmationTriggerEvent,
 )
 
-from src.services.user import set_user_as_verified
+from src.services.user.set_user_as_verified import set_user_as_verified
+from src.services.user.contact_index import extract_contact_keys
+
+settings: Optional[Settings] = None
+
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("dynamodb",))
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+    return settings
 
-settings = Settings.model_validate({})
-users_table_settings = settings.ensure_users_table_settings()
-dynamodb_client = aws_adapter.get_dynamodb_client()
 
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        ("ssm_parameters", lambda: _get_settings().refresh_ssm_parameters()),
+        (
+            "dynamodb",
+            lambda: warm_up_adapter.warm_up_clients(("dynamodb",), deadline),
+        ),
+    ]
 
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
 @event_source(data_class=PostConfirmationTriggerEvent)
 def lambda_handler(event: PostConfirmationTriggerEvent, context):
-    now = datetime.now(timezone.utc)
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation(
+        "post-confirmation-trigger", settings.metrics
+    )
 
-    set_user_as_verified(
-        dynamodb_client, users_table_settings.name, event.user_name, now
+    tenant_pool = tenant_pools_adapter.route(settings, event.user_pool_id)
+    users_table_settings = tenant_pool.settings.ensure_users_table_settings()
+    contacts_table_settings = (
+        tenant_pool.settings.ensure_contacts_table_settings()
     )
+    deadline = Deadline.from_context(context)
+    dynamodb_client = aws_adapter.get_dynamodb_client(deadline)
+
+    def process() -> dict:
+        set_user_as_verified(
+            tenant_pool.get_dynamodb_client(deadline),
+            users_table_settings.name,
+            event.user_name,
+            datetime.now(timezone.utc),
+            contacts_table_settings.name,
+            extract_contact_keys(
+                event.request.user_attributes, verified_only=True
+            ),
+            deadline=deadline,
+        )
+        analytics_adapter.capture(
+            settings,
+            analytics_adapter.USER_VERIFIED,
+            event.user_name,
+            {"user_pool_id": event.user_pool_id},
+        )
+        return {}
+
+    try:
+        idempotency_adapter.run_idempotently(
+            settings.idempotency,
+            dynamodb_client,
+            idempotency_adapter.trigger_idempotency_key(
+                event.trigger_source, event.user_pool_id, event.user_name
+            ),
+            process,
+            deadline=deadline,
+        )
+    finally:
+        analytics_adapter.flush(deadline)
+    # Cognito expects the event back from a post confirmation trigger.
+    return event.raw_event
@@ -3,7 +3,16 @@ version: 1.0.0
 """
 
 from src.settings import Settings
+import src.adapters.analytics as analytics_adapter
 import src.adapters.aws as aws_adapter
+import src.adapters.contact_filter as contact_filter_adapter
+import src.adapters.idempotency as idempotency_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.recaptcha as recaptcha_adapter
+import src.adapters.tenant_pools as tenant_pools_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.deadline import Deadline
 
 from typing import Optional
 
@@ -12,25 +21,79 @@ from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import
     PreSignUpTriggerEvent,
 )
 
-from src.facades import process_pre_sign_up
+from src.facades.process_pre_sign_up import process_pre_sign_up
 
 settings: Optional[Settings] = None
 
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("dynamodb",))
 
-@event_source(data_class=PreSignUpTriggerEvent)
-def lambda_handler(event: PreSignUpTriggerEvent, context):
+
+def _get_settings() -> Settings:
     global settings
     if not settings:
         settings = Settings.model_validate({})
+    return settings
+
+
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    def warm_up_recaptcha() -> None:
+        recaptcha_settings = _get_settings().ensure_recaptcha_settings()
+        recaptcha_adapter.get_recaptcha_client().warm_up(
+            min(
+                recaptcha_settings.verify_timeout_seconds,
+                deadline.remaining_seconds(),
+            )
+        )
+
+    return [
+        ("settings", _get_settings),
+        ("ssm_parameters", lambda: _get_settings().refresh_ssm_parameters()),
+        (
+            "dynamodb",
+            lambda: warm_up_adapter.warm_up_clients(("dynamodb",), deadline),
+        ),
+        (
+            "contact_filter",
+            lambda: contact_filter_adapter.get_contact_filter(
+                _get_settings().contact_filter
+            ),
+        ),
+        ("recaptcha", warm_up_recaptcha),
+    ]
+
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
+@event_source(data_class=PreSignUpTriggerEvent)
+def lambda_handler(event: PreSignUpTriggerEvent, context):
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation("pre-sign-up-trigger", settings.metrics)
 
-    cognito_client = aws_adapter.get_cognito_client()
-    dynamodb_client = aws_adapter.get_dynamodb_client()
+    deadline = Deadline.from_context(context)
+    dynamodb_client = aws_adapter.get_dynamodb_client(deadline)
+    tenant_pool = tenant_pools_adapter.route(settings, event.user_pool_id)
 
-    processed = process_pre_sign_up(
-        event,
-        settings,
-        cognito_client,
-        dynamodb_client,
-    )
+    def process() -> dict:
+        processed = process_pre_sign_up(
+            event,
+            tenant_pool.settings,
+            tenant_pool.get_dynamodb_client(deadline),
+            deadline=deadline,
+        )
+        return processed.raw_event["response"]
 
-    return processed.raw_event
+    try:
+        # A retried trigger gets the response of the attempt that completed.
+        event.raw_event["response"] = idempotency_adapter.run_idempotently(
+            settings.idempotency,
+            dynamodb_client,
+            idempotency_adapter.trigger_idempotency_key(
+                event.trigger_source, event.user_pool_id, event.user_name
+            ),
+            process,
+            deadline=deadline,
+        )
+    finally:
+        analytics_adapter.flush(deadline)
+    return event.raw_event
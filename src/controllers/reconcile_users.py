@@ -0,0 +1,67 @@
+"""
+version: 1.0.0
+"""
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.deadline import Deadline
+
+from src.settings import ReconciliationSettings, Settings
+from src.facades.reconcile_users import reconcile_users
+
+settings: Optional[Settings] = None
+
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("cognito-idp", "dynamodb"))
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+        rate_limits_adapter.configure(settings.rate_limits)
+    return settings
+
+
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        ("ssm_parameters", lambda: _get_settings().refresh_ssm_parameters()),
+        (
+            "clients",
+            lambda: warm_up_adapter.warm_up_clients(
+                ("cognito-idp", "dynamodb"), deadline
+            ),
+        ),
+    ]
+
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
+def lambda_handler(event: dict[str, Any], context):
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation("reconcile-users", settings.metrics)
+
+    reconciliation_settings = (
+        settings.reconciliation or ReconciliationSettings()
+    )
+    deadline = Deadline.from_context(context)
+    # A manual invocation may ask for repairs the schedule does not make.
+    report = reconcile_users(
+        settings,
+        aws_adapter.get_dynamodb_client(deadline),
+        aws_adapter.get_cognito_client(deadline),
+        datetime.now(timezone.utc),
+        repair=bool(event.get("repair", reconciliation_settings.repair)),
+        deadline=deadline,
+    )
+    rate_limits_adapter.report_usage()
+
+    return asdict(report)
@@ -2,12 +2,161 @@
 version: 1.0.0
 """
 
+import base64
+import binascii
+import json
+
+from typing import Any, Optional
+
+import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+import src.adapters.warm_up as warm_up_adapter
+
+from src.adapters.deadline import Deadline, DeadlineExceededError
+
 from aws_lambda_powertools.utilities.data_classes import event_source
 from aws_lambda_powertools.utilities.data_classes.api_gateway_proxy_event import (
     APIGatewayProxyEventV2,
 )
+from pydantic import ValidationError
+
+from src.settings import Settings
+from src.dto.sign_up import SIGN_UP_REQUEST_ADAPTER
+from src.services.user.sign_up_user import (
+    InvalidPasswordError,
+    SignUpRejectedError,
+    SignUpThrottledError,
+    sign_up_user,
+)
+
+settings: Optional[Settings] = None
+
+# Opens connections during the init phase when warm-up is enabled.
+aws_adapter.warm_up_on_init(("cognito-idp",))
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _response(status_code: int, body: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "statusCode": status_code,
+        "headers": _JSON_HEADERS,
+        "body": json.dumps(body, separators=(",", ":")),
+    }
+
+
+def _error(
+    status_code: int,
+    code: str,
+    message: str,
+    details: Optional[list[dict[str, str]]] = None,
+) -> dict[str, Any]:
+    error: dict[str, Any] = {"code": code, "message": message}
+    if details:
+        error["details"] = details
+    return _response(status_code, {"error": error})
+
 
+def _read_body(
+    event: APIGatewayProxyEventV2, max_body_bytes: int
+) -> Optional[bytes]:
+    # Sizes are checked before anything is decoded or parsed.
+    body = event.body or ""
+    if event.is_base64_encoded:
+        if len(body) > (max_body_bytes + 2) // 3 * 4:
+            return None
+        try:
+            raw_body = base64.b64decode(body, validate=True)
+        except binascii.Error:
+            # Left to the validator, which reports it as invalid JSON.
+            return b""
+    else:
+        if len(body) > max_body_bytes:
+            return None
+        raw_body = body.encode()
 
+    return raw_body if len(raw_body) <= max_body_bytes else None
+
+
+def _get_settings() -> Settings:
+    global settings
+    if not settings:
+        settings = Settings.model_validate({})
+        rate_limits_adapter.configure(settings.rate_limits)
+    return settings
+
+
+def _warm_up_steps(deadline: Deadline) -> list[warm_up_adapter.WarmUpStep]:
+    return [
+        ("settings", _get_settings),
+        (
+            "cognito_idp",
+            lambda: warm_up_adapter.warm_up_clients(("cognito-idp",), deadline),
+        ),
+    ]
+
+
+@warm_up_adapter.handle_warm_up(_warm_up_steps)
 @event_source(data_class=APIGatewayProxyEventV2)
 def lambda_handler(event: APIGatewayProxyEventV2, context):
-    return {"event_body": event.body}
+    settings = _get_settings()
+
+    metrics_adapter.start_invocation("sign-up-api", settings.metrics)
+
+    sign_up_api_settings = settings.ensure_sign_up_api_settings()
+
+    if event.request_context.http.method != "POST":
+        return _error(405, "method_not_allowed", "Only POST is supported.")
+
+    body = _read_body(event, sign_up_api_settings.max_body_bytes)
+    if body is None:
+        return _error(
+            413,
+            "payload_too_large",
+            "Request body must not exceed "
+            f"{sign_up_api_settings.max_body_bytes} bytes.",
+        )
+
+    try:
+        with metrics_adapter.span("sign_up_api.validate_request"):
+            request = SIGN_UP_REQUEST_ADAPTER.validate_json(body)
+    except ValidationError as exc:
+        return _error(
+            422,
+            "invalid_request",
+            "Request body is invalid.",
+            [
+                {
+                    "field": ".".join(str(part) for part in error["loc"]),
+                    "message": error["msg"],
+                }
+                for error in exc.errors(include_url=False, include_input=False)
+            ],
+        )
+
+    deadline = Deadline.from_context(context)
+    try:
+        result = sign_up_user(
+            aws_adapter.get_cognito_client(deadline),
+            sign_up_api_settings.client_id,
+            request,
+            deadline=deadline,
+        )
+    except SignUpRejectedError as exc:
+        return _error(400, "sign_up_rejected", str(exc))
+    except InvalidPasswordError as exc:
+        return _error(400, "invalid_password", str(exc))
+    except SignUpThrottledError as exc:
+        return _error(429, "too_many_requests", str(exc))
+    except DeadlineExceededError as exc:
+        return _error(504, "timeout", str(exc))
+    except ValueError as exc:
+        return _error(502, "sign_up_failed", str(exc))
+    finally:
+        rate_limits_adapter.report_usage()
+
+    return _response(
+        201,
+        {"userId": result.user_id, "userConfirmed": result.user_confirmed},
+    )
@@ -0,0 +1,135 @@
+import base64
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.controllers import sign_up_api
+from src.services.user.sign_up_user import SignUpRejectedError, SignUpResult
+
+VALID_BODY = {
+    "email": "user@example.com",
+    "password": "correct horse",
+    "reCaptchaToken": "token",
+}
+
+
+def _event(body, method="POST", is_base64_encoded=False):
+    return {
+        "version": "2.0",
+        "routeKey": "ANY /sign-up/{proxy+}",
+        "rawPath": "/sign-up/",
+        "requestContext": {"http": {"method": method}},
+        "body": body,
+        "isBase64Encoded": is_base64_encoded,
+    }
+
+
+class SignUpApiTests(unittest.TestCase):
+    def setUp(self):
+        settings = MagicMock()
+        settings.metrics = None
+        settings.ensure_sign_up_api_settings.return_value = SimpleNamespace(
+            client_id="client-id", max_body_bytes=256
+        )
+        patchers = [
+            patch.object(sign_up_api, "settings", settings),
+            patch.object(sign_up_api.aws_adapter, "get_cognito_client"),
+            patch.object(sign_up_api, "sign_up_user"),
+        ]
+        mocks = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.sign_up_user = mocks[2]
+        self.sign_up_user.return_value = SignUpResult("sub-1", False)
+
+    def _call(self, event):
+        response = sign_up_api.lambda_handler(event, SimpleNamespace())
+        return response["statusCode"], json.loads(response["body"])
+
+    def test_signs_up_valid_request(self):
+        status, body = self._call(_event(json.dumps(VALID_BODY)))
+
+        self.assertEqual(status, 201)
+        self.assertEqual(body, {"userId": "sub-1", "userConfirmed": False})
+        request = self.sign_up_user.call_args.args[2]
+        self.assertEqual(request.email, "user@example.com")
+
+    def test_accepts_base64_encoded_body(self):
+        encoded = base64.b64encode(json.dumps(VALID_BODY).encode()).decode()
+
+        status, _ = self._call(_event(encoded, is_base64_encoded=True))
+
+        self.assertEqual(status, 201)
+
+    @patch.object(sign_up_api.warm_up_adapter, "warm_up_clients")
+    def test_warm_up_ping_initializes_without_signing_up(
+        self, mock_warm_up_clients
+    ):
+        response = sign_up_api.lambda_handler(
+            {"warmUp": True}, SimpleNamespace()
+        )
+
+        self.assertEqual(
+            list(response["steps_ms"]), ["settings", "cognito_idp"]
+        )
+        self.assertEqual(response["failed_steps"], {})
+        self.assertEqual(
+            mock_warm_up_clients.call_args.args[0], ("cognito-idp",)
+        )
+        self.sign_up_user.assert_not_called()
+
+    def test_rejects_oversized_body_before_parsing(self):
+        status, body = self._call(_event("x" * 257))
+
+        self.assertEqual(status, 413)
+        self.assertEqual(body["error"]["code"], "payload_too_large")
+        self.sign_up_user.assert_not_called()
+
+    def test_rejects_oversized_base64_body(self):
+        encoded = base64.b64encode(b"x" * 300).decode()
+
+        status, _ = self._call(_event(encoded, is_base64_encoded=True))
+
+        self.assertEqual(status, 413)
+
+    def test_reports_each_invalid_field_without_echoing_input(self):
+        status, body = self._call(
+            _event(json.dumps({"email": "nope", "password": "short"}))
+        )
+
+        self.assertEqual(status, 422)
+        fields = [detail["field"] for detail in body["error"]["details"]]
+        self.assertEqual(fields, ["email", "password", "reCaptchaToken"])
+        self.assertNotIn("short", json.dumps(body))
+
+    def test_rejects_malformed_json(self):
+        status, body = self._call(_event("{"))
+
+        self.assertEqual(status, 422)
+        self.assertEqual(body["error"]["code"], "invalid_request")
+
+    def test_rejects_other_methods(self):
+        status, _ = self._call(_event(None, method="GET"))
+
+        self.assertEqual(status, 405)
+
+    def test_maps_sign_up_errors(self):
+        self.sign_up_user.side_effect = SignUpRejectedError(
+            "Contact information is already in use."
+        )
+
+        status, body = self._call(_event(json.dumps(VALID_BODY)))
+
+        self.assertEqual(status, 400)
+        self.assertEqual(
+            body["error"],
+            {
+                "code": "sign_up_rejected",
+                "message": "Contact information is already in use.",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
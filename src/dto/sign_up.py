@@ -1,8 +1,25 @@
-from pydantic import BaseModel, Field, ValidationError
-from typing import Annotated
-from annotated_types import MinLen
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    TypeAdapter,
+    ValidationError,
+)
+from typing import Annotated, Optional
+from annotated_types import MaxLen, MinLen
 
-RecaptchaToken = Annotated[str, MinLen(1)]
+RecaptchaToken = Annotated[str, MinLen(1), MaxLen(4096)]
+EmailAddress = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        max_length=254,
+        pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
+    ),
+]
+PhoneNumber = Annotated[str, StringConstraints(pattern=r"^\+[1-9]\d{1,14}$")]
+Password = Annotated[str, MinLen(8), MaxLen(256)]
 
 
 class PreSignUpValidationData(BaseModel):
@@ -18,3 +35,23 @@ class PreSignUpValidationData(BaseModel):
             return PreSignUpValidationData(**(raw or {}))
         except ValidationError as e:
             raise ValueError(f"Invalid validation_data: {e}") from e
+
+
+class SignUpRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    email: EmailAddress
+    password: Password
+    phone_number: Optional[PhoneNumber] = Field(
+        default=None,
+        alias="phoneNumber",
+    )
+    recaptcha_token: RecaptchaToken = Field(
+        default=...,
+        alias="reCaptchaToken",
+        description="reCAPTCHA token from client",
+    )
+
+
+# Built once per container, so a request only pays for the validation.
+SIGN_UP_REQUEST_ADAPTER = TypeAdapter(SignUpRequest)
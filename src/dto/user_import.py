@@ -0,0 +1,37 @@
+from pydantic import BaseModel, ConfigDict, TypeAdapter, model_validator
+from typing import Any, Optional
+
+from src.dto.sign_up import EmailAddress, PhoneNumber
+
+
+class ImportedUser(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    username: str
+    email: Optional[EmailAddress] = None
+    email_verified: bool = False
+    phone_number: Optional[PhoneNumber] = None
+    phone_number_verified: bool = False
+
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_empty_fields(cls, data: Any) -> Any:
+        # Empty CSV cells stand for missing attributes.
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value != ""}
+        return data
+
+    def user_attributes(self) -> dict[str, str]:
+        user_attributes: dict[str, str] = {}
+        if self.email:
+            user_attributes["email"] = self.email
+            user_attributes["email_verified"] = str(self.email_verified).lower()
+        if self.phone_number:
+            user_attributes["phone_number"] = self.phone_number
+            user_attributes["phone_number_verified"] = str(
+                self.phone_number_verified
+            ).lower()
+        return user_attributes
+
+
+IMPORTED_USER_ADAPTER = TypeAdapter(ImportedUser)
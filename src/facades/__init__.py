@@ -1,7 +1,23 @@
-from .process_pre_sign_up import process_pre_sign_up
-from .handle_bus_event import handle_bus_event
+from typing import TYPE_CHECKING
+
+from src.lazy_imports import lazy_submodules
+
+if TYPE_CHECKING:
+    from .process_pre_sign_up import process_pre_sign_up
+    from .handle_bus_event import handle_bus_event
+    from .sweep_unconfirmed_users import sweep_unconfirmed_users
+    from .refresh_contact_filter import refresh_contact_filter
+    from .import_users import import_users
+    from .reconcile_users import reconcile_users
 
 __all__ = [
     "process_pre_sign_up",
     "handle_bus_event",
+    "sweep_unconfirmed_users",
+    "refresh_contact_filter",
+    "import_users",
+    "reconcile_users",
 ]
+
+
+__getattr__ = lazy_submodules(__name__, __all__)
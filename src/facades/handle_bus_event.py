@@ -1,55 +1,233 @@
-from typing import List
+from __future__ import annotations
+
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import BotoCoreError, ClientError
 
+import src.adapters.analytics as analytics_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+
 from aws_lambda_powertools.utilities.data_classes.event_bridge_event import (
     EventBridgeEvent,
 )
 
-from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
-from mypy_boto3_dynamodbstreams.type_defs import (
-    GetRecordsOutputTypeDef,
+from src.adapters.deadline import NO_DEADLINE, Deadline, DeadlineExceededError
+from src.adapters.stream_records import (
+    StreamRecordDispatcher,
+    UserStreamRecord,
+    iter_user_stream_records,
 )
+from src.services.user.release_contact_claims import release_contact_claims
+from src.settings import ContactsTableSettings, Settings
 
-from src.settings import Settings
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+    from mypy_boto3_dynamodb import DynamoDBClient
 
-deserializer = TypeDeserializer()
+# Stays below botocore's default of 10 pooled connections per client.
+DEFAULT_MAX_WORKERS = 8
+RECENTLY_DELETED_CAPACITY = 10_000
 
 
-def _extract_removed_user_ids(detail: GetRecordsOutputTypeDef) -> List[str]:
-    records = filter(
-        lambda record: record.get("eventName") == "REMOVE",
-        detail.get("Records") or [],
-    )
-    user_ids: List[str] = []
+class RecentlyDeletedUsers:
+    def __init__(self, capacity: int = RECENTLY_DELETED_CAPACITY):
+        self._capacity = capacity
+        self._keys: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            return key in self._keys
+
+    def add(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            while len(self._keys) > self._capacity:
+                self._keys.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
 
-    for record in records:
-        keys = record.get("dynamodb", {}).get("Keys", {})
-        user_keys = deserializer.deserialize({"M": keys})  # type: ignore
+# Redelivered batches are mostly served by the same warm environment, so
+# users it already deleted are not sent to Cognito a second time.
+_recently_deleted = RecentlyDeletedUsers()
 
-        user_id = user_keys.get("user_id", None)
-        if user_id:
-            user_ids.append(user_id)
 
-    return user_ids
+@dataclass(frozen=True)
+class UserDeletionResult:
+    user_id: str
+    deleted: bool
+    error: Optional[str] = None
+    # The user was removed from Cognito by this attempt, rather than found
+    # already gone or skipped as recently deleted.
+    deleted_now: bool = False
+
+
+@dataclass
+class BusEventReport:
+    results: List[UserDeletionResult] = field(default_factory=list)
+
+    @property
+    def deleted_user_ids(self) -> List[str]:
+        return [result.user_id for result in self.results if result.deleted]
+
+    @property
+    def failed_user_ids(self) -> List[str]:
+        return [result.user_id for result in self.results if not result.deleted]
+
+
+def _delete_user(
+    cognito_client: CognitoIdentityProviderClient,
+    dynamodb_client: DynamoDBClient,
+    user_pool_id: str,
+    contacts_table_settings: ContactsTableSettings,
+    user_id: str,
+    deadline: Deadline,
+) -> UserDeletionResult:
+    result = _delete_pool_user(cognito_client, user_pool_id, user_id, deadline)
+    if not result.deleted:
+        return result
+
+    # The user record is gone, so its contacts are free for new sign ups.
+    # A failed release fails the event, which is redelivered.
+    try:
+        release_contact_claims(
+            dynamodb_client,
+            contacts_table_settings.name,
+            contacts_table_settings.user_id_index_name,
+            user_id,
+            deadline=deadline,
+        )
+    except DeadlineExceededError:
+        return UserDeletionResult(
+            user_id=user_id,
+            deleted=False,
+            error="Deadline exceeded",
+            deleted_now=result.deleted_now,
+        )
+    except ValueError as exc:
+        return UserDeletionResult(
+            user_id=user_id,
+            deleted=False,
+            error=str(exc),
+            deleted_now=result.deleted_now,
+        )
+    return result
+
+
+def _delete_pool_user(
+    cognito_client: CognitoIdentityProviderClient,
+    user_pool_id: str,
+    user_id: str,
+    deadline: Deadline,
+) -> UserDeletionResult:
+    if deadline.is_expired():
+        return UserDeletionResult(
+            user_id=user_id, deleted=False, error="Deadline exceeded"
+        )
+
+    if (user_pool_id, user_id) in _recently_deleted:
+        return UserDeletionResult(user_id=user_id, deleted=True)
+
+    rate_limiter = rate_limits_adapter.get_rate_limiter(
+        rate_limits_adapter.COGNITO_USER_UPDATE
+    )
+    try:
+        with metrics_adapter.span("admin_delete_user") as span:
+            response = rate_limiter.call(
+                lambda: cognito_client.admin_delete_user(
+                    UserPoolId=user_pool_id,
+                    Username=user_id,
+                ),
+                deadline,
+            )
+            span.record_response(response)
+    except DeadlineExceededError:
+        return UserDeletionResult(
+            user_id=user_id, deleted=False, error="Deadline exceeded"
+        )
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") == (
+            "UserNotFoundException"
+        ):
+            _recently_deleted.add((user_pool_id, user_id))
+            return UserDeletionResult(user_id=user_id, deleted=True)
+        return UserDeletionResult(
+            user_id=user_id, deleted=False, error=str(exc)
+        )
+    except BotoCoreError as exc:
+        return UserDeletionResult(
+            user_id=user_id, deleted=False, error=str(exc)
+        )
+
+    _recently_deleted.add((user_pool_id, user_id))
+    return UserDeletionResult(user_id=user_id, deleted=True, deleted_now=True)
 
 
 def handle_bus_event(
     event: EventBridgeEvent,
     settings: Settings,
     cognito_client: CognitoIdentityProviderClient,
-) -> None:
+    dynamodb_client: DynamoDBClient,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    deadline: Deadline = NO_DEADLINE,
+) -> BusEventReport:
     user_pool_settings = settings.ensure_user_pool_settings()
+    contacts_table_settings = settings.ensure_contacts_table_settings()
 
-    user_ids = _extract_removed_user_ids(
-        GetRecordsOutputTypeDef(**event.detail or {})
-    )
-    for user_id in user_ids:
-        try:
-            cognito_client.admin_delete_user(
-                UserPoolId=user_pool_settings.id,
-                Username=user_id,
+    # Each user is handled by a single task, so deletions of the same user
+    # never race each other while different users are deleted in parallel.
+    removed_user_ids: Dict[str, None] = {}
+
+    def collect_removal(record: UserStreamRecord) -> None:
+        removed_user_ids[record.user_id] = None
+
+    dispatcher = StreamRecordDispatcher()
+    dispatcher.register("REMOVE", collect_removal)
+    with metrics_adapter.span("bus_event.extract_user_ids"):
+        dispatcher.dispatch(
+            iter_user_stream_records(event.detail, dispatcher.event_names)
+        )
+
+    user_ids = list(removed_user_ids)
+    if not user_ids:
+        return BusEventReport()
+
+    with (
+        metrics_adapter.span("bus_event.delete_users"),
+        ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(user_ids)))
+        ) as executor,
+    ):
+        results = list(
+            executor.map(
+                lambda user_id: _delete_user(
+                    cognito_client,
+                    dynamodb_client,
+                    user_pool_settings.id,
+                    contacts_table_settings,
+                    user_id,
+                    deadline,
+                ),
+                user_ids,
+            )
+        )
+
+    for result in results:
+        if result.deleted_now:
+            analytics_adapter.capture(
+                settings,
+                analytics_adapter.USER_DELETED,
+                result.user_id,
+                {"user_pool_id": user_pool_settings.id},
             )
-        except (BotoCoreError, ClientError) as exc:
-            raise RuntimeError("Failed to delete user from Cognito") from exc
+    return BusEventReport(results=results)
@@ -1,22 +1,139 @@
 import unittest
+from datetime import datetime, timezone
 from types import SimpleNamespace
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from .handle_bus_event import handle_bus_event
+from .handle_bus_event import RecentlyDeletedUsers, handle_bus_event
 
 from botocore.exceptions import ClientError
 
+from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
+    PreSignUpTriggerEvent,
+)
 from aws_lambda_powertools.utilities.data_classes.event_bridge_event import (
     EventBridgeEvent,
 )
 
+from src.services.user.register_unverified_user import (
+    register_unverified_user,
+)
+from src.services.user.set_user_as_verified import set_user_as_verified
+from src.settings import ContactsTableSettings, UsersTableSettings
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class InMemoryDynamoDB:
+    """Users and contacts tables with the conditions the services rely on."""
+
+    KEYS = {"users": "user_id", "contacts": "contact"}
+
+    def __init__(self):
+        self.tables = {name: {} for name in self.KEYS}
+
+    def _key(self, table_name, item):
+        return item[self.KEYS[table_name]]["S"]
+
+    def _holds(self, item, condition, values):
+        if not condition:
+            return True
+        for clause in condition.split(" OR "):
+            if clause.startswith("attribute_not_exists("):
+                if item is None:
+                    return True
+                continue
+            name, placeholder = clause.split(" = ")
+            if item is not None and item.get(name) == values[placeholder]:
+                return True
+        return False
+
+    def _check(self, kind, request):
+        table = self.tables[request["TableName"]]
+        key = request["Item"] if kind == "Put" else request["Key"]
+        return self._holds(
+            table.get(self._key(request["TableName"], key)),
+            request.get("ConditionExpression"),
+            request.get("ExpressionAttributeValues", {}),
+        )
+
+    def _apply(self, kind, request):
+        table = self.tables[request["TableName"]]
+        if kind == "Put":
+            table[self._key(request["TableName"], request["Item"])] = dict(
+                request["Item"]
+            )
+            return
+        key = self._key(request["TableName"], request["Key"])
+        item = table.setdefault(key, dict(request["Key"]))
+        set_part, _, remove_part = request["UpdateExpression"].partition(
+            " REMOVE "
+        )
+        for assignment in set_part.removeprefix("SET ").split(", "):
+            name, placeholder = assignment.split(" = ")
+            item[name] = request["ExpressionAttributeValues"][placeholder]
+        for name in filter(None, remove_part.split(", ")):
+            item.pop(name, None)
+
+    def transact_write_items(self, TransactItems):
+        operations = [next(iter(item.items())) for item in TransactItems]
+        reasons = [
+            {"Code": "None" if self._check(*op) else "ConditionalCheckFailed"}
+            for op in operations
+        ]
+        if any(reason["Code"] != "None" for reason in reasons):
+            raise ClientError(
+                {
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": reasons,
+                },
+                "TransactWriteItems",
+            )
+        for op in operations:
+            self._apply(*op)
+        return {}
+
+    def query(self, TableName, ExpressionAttributeValues, **kwargs):
+        user_id = ExpressionAttributeValues[":user_id"]
+        return {
+            "Items": [
+                {"contact": item["contact"]}
+                for item in self.tables[TableName].values()
+                if item.get("user_id") == user_id
+            ]
+        }
+
+    def delete_item(self, TableName, Key, **kwargs):
+        if not self._check(
+            "Delete", {"TableName": TableName, "Key": Key, **kwargs}
+        ):
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException"}},
+                "DeleteItem",
+            )
+        self.tables[TableName].pop(self._key(TableName, Key), None)
+        return {}
+
 
 class HandleBusEventTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch(
+            "facades.handle_bus_event._recently_deleted",
+            RecentlyDeletedUsers(),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.dynamodb_client = InMemoryDynamoDB()
+
     def _settings(self):
         settings = MagicMock()
         settings.ensure_user_pool_settings.return_value = SimpleNamespace(
             id="user-pool-id"
         )
+        settings.ensure_contacts_table_settings.return_value = (
+            ContactsTableSettings(name="contacts")
+        )
+        settings.posthog = None
         return settings
 
     def test_deletes_all_removed_user_ids(self):
@@ -45,9 +162,12 @@ class HandleBusEventTests(unittest.TestCase):
             }
         )
 
-        handle_bus_event(event, settings, cognito_client)
+        report = handle_bus_event(
+            event, settings, cognito_client, self.dynamodb_client
+        )
 
         settings.ensure_user_pool_settings.assert_called_once()
+        self.assertEqual(report.deleted_user_ids, ["user-1", "user-2"])
         self.assertEqual(cognito_client.admin_delete_user.call_count, 2)
         cognito_client.admin_delete_user.assert_any_call(
             UserPoolId="user-pool-id", Username="user-1"
@@ -63,32 +183,236 @@ class HandleBusEventTests(unittest.TestCase):
             {"detail": {"Records": [{"eventName": "MODIFY", "dynamodb": {}}]}}
         )
 
-        handle_bus_event(event, settings, cognito_client)
+        handle_bus_event(event, settings, cognito_client, self.dynamodb_client)
 
         settings.ensure_user_pool_settings.assert_called_once()
         cognito_client.admin_delete_user.assert_not_called()
 
-    def test_raises_when_cognito_delete_fails(self):
-        settings = self._settings()
-        cognito_client = MagicMock()
-        cognito_client.admin_delete_user.side_effect = ClientError(
-            {"Error": {"Code": "Error", "Message": "boom"}}, "AdminDeleteUser"
-        )
-        event = EventBridgeEvent(
+    def _removal_event(self, *user_ids):
+        return EventBridgeEvent(
             {
                 "detail": {
                     "Records": [
                         {
                             "eventName": "REMOVE",
-                            "dynamodb": {"Keys": {"user_id": {"S": "user-1"}}},
+                            "dynamodb": {
+                                "Keys": {"user_id": {"S": user_id}},
+                                "SequenceNumber": f"seq-{index}",
+                            },
                         }
+                        for index, user_id in enumerate(user_ids)
                     ]
                 }
             }
         )
 
-        with self.assertRaisesRegex(RuntimeError, "Failed to delete user"):
-            handle_bus_event(event, settings, cognito_client)
+    def _failing_cognito_client(self, *failing_user_ids):
+        cognito_client = MagicMock()
+
+        def admin_delete_user(UserPoolId, Username):
+            if Username in failing_user_ids:
+                raise ClientError(
+                    {"Error": {"Code": "Error", "Message": "boom"}},
+                    "AdminDeleteUser",
+                )
+
+        cognito_client.admin_delete_user.side_effect = admin_delete_user
+        return cognito_client
+
+    def test_reports_failed_deletions_without_stopping(self):
+        settings = self._settings()
+        cognito_client = self._failing_cognito_client("user-1")
+
+        report = handle_bus_event(
+            self._removal_event("user-1", "user-2"),
+            settings,
+            cognito_client,
+            self.dynamodb_client,
+        )
+
+        self.assertEqual(report.failed_user_ids, ["user-1"])
+        self.assertEqual(report.deleted_user_ids, ["user-2"])
+        self.assertIn("boom", report.results[0].error)
+
+    @patch("facades.handle_bus_event.analytics_adapter.capture")
+    def test_captures_only_deleted_users(self, mock_capture):
+        settings = self._settings()
+        cognito_client = self._failing_cognito_client("user-1")
+
+        handle_bus_event(
+            self._removal_event("user-1", "user-2"),
+            settings,
+            cognito_client,
+            self.dynamodb_client,
+        )
+
+        mock_capture.assert_called_once_with(
+            settings,
+            "user deleted",
+            "user-2",
+            {"user_pool_id": "user-pool-id"},
+        )
+
+    @patch("facades.handle_bus_event.analytics_adapter.capture")
+    def test_captures_only_users_deleted_by_this_attempt(self, mock_capture):
+        settings = self._settings()
+        cognito_client = MagicMock()
+        cognito_client.admin_delete_user.side_effect = ClientError(
+            {"Error": {"Code": "UserNotFoundException", "Message": "gone"}},
+            "AdminDeleteUser",
+        )
+        event = self._removal_event("user-1")
+
+        handle_bus_event(event, settings, cognito_client, self.dynamodb_client)
+        report = handle_bus_event(
+            event, settings, MagicMock(), self.dynamodb_client
+        )
+
+        self.assertEqual(report.deleted_user_ids, ["user-1"])
+        mock_capture.assert_not_called()
+
+    def test_treats_missing_users_as_deleted(self):
+        settings = self._settings()
+        cognito_client = MagicMock()
+        cognito_client.admin_delete_user.side_effect = ClientError(
+            {"Error": {"Code": "UserNotFoundException", "Message": "gone"}},
+            "AdminDeleteUser",
+        )
+
+        report = handle_bus_event(
+            self._removal_event("user-1"),
+            settings,
+            cognito_client,
+            self.dynamodb_client,
+        )
+
+        self.assertEqual(report.deleted_user_ids, ["user-1"])
+        self.assertEqual(report.failed_user_ids, [])
+
+    def test_deletes_repeated_user_once(self):
+        settings = self._settings()
+        cognito_client = MagicMock()
+
+        report = handle_bus_event(
+            self._removal_event("user-1", "user-2", "user-1"),
+            settings,
+            cognito_client,
+            self.dynamodb_client,
+            max_workers=2,
+        )
+
+        self.assertEqual(cognito_client.admin_delete_user.call_count, 2)
+        self.assertEqual(report.deleted_user_ids, ["user-1", "user-2"])
+
+    def test_redelivered_batch_only_retries_failed_users(self):
+        settings = self._settings()
+        event = self._removal_event("user-1", "user-2")
+
+        handle_bus_event(
+            event,
+            settings,
+            self._failing_cognito_client("user-1"),
+            self.dynamodb_client,
+        )
+
+        cognito_client = MagicMock()
+        report = handle_bus_event(
+            event, settings, cognito_client, self.dynamodb_client
+        )
+
+        cognito_client.admin_delete_user.assert_called_once_with(
+            UserPoolId="user-pool-id", Username="user-1"
+        )
+        self.assertEqual(report.deleted_user_ids, ["user-1", "user-2"])
+        self.assertEqual(report.failed_user_ids, [])
+
+    def _sign_up(self, user_id):
+        register_unverified_user(
+            PreSignUpTriggerEvent(
+                {
+                    "userPoolId": "user-pool-id",
+                    "userName": user_id,
+                    "request": {
+                        "userAttributes": {
+                            "sub": user_id,
+                            "email": "user@example.com",
+                        }
+                    },
+                    "response": {},
+                }
+            ),
+            UsersTableSettings(name="users"),
+            ContactsTableSettings(name="contacts"),
+            self.dynamodb_client,
+            NOW,
+        )
+        set_user_as_verified(
+            self.dynamodb_client,
+            "users",
+            user_id,
+            NOW,
+            "contacts",
+            ["email#user@example.com"],
+        )
+
+    def test_deleted_user_contacts_can_sign_up_again(self):
+        self._sign_up("user-1")
+        with self.assertRaises(ContactInUseError):
+            self._sign_up("user-2")
+
+        self.dynamodb_client.tables["users"].pop("user-1")
+        report = handle_bus_event(
+            self._removal_event("user-1"),
+            self._settings(),
+            MagicMock(),
+            self.dynamodb_client,
+        )
+
+        self.assertEqual(report.deleted_user_ids, ["user-1"])
+        self._sign_up("user-2")
+        self.assertEqual(
+            self.dynamodb_client.tables["contacts"]["email#user@example.com"][
+                "user_id"
+            ],
+            {"S": "user-2"},
+        )
+
+    def test_release_keeps_claims_of_newer_owners(self):
+        self._sign_up("user-1")
+        # The index still lists the contact for the deleted user.
+        self.dynamodb_client.query = MagicMock(
+            return_value={
+                "Items": [{"contact": {"S": "email#user@example.com"}}]
+            }
+        )
+
+        report = handle_bus_event(
+            self._removal_event("user-2"),
+            self._settings(),
+            MagicMock(),
+            self.dynamodb_client,
+        )
+
+        self.assertEqual(report.deleted_user_ids, ["user-2"])
+        self.assertIn(
+            "email#user@example.com", self.dynamodb_client.tables["contacts"]
+        )
+
+    def test_fails_deletion_when_claims_cannot_be_released(self):
+        self.dynamodb_client.query = MagicMock(
+            side_effect=ClientError(
+                {"Error": {"Code": "Error", "Message": "boom"}}, "Query"
+            )
+        )
+
+        report = handle_bus_event(
+            self._removal_event("user-1"),
+            self._settings(),
+            MagicMock(),
+            self.dynamodb_client,
+        )
+
+        self.assertEqual(report.failed_user_ids, ["user-1"])
 
 
 if __name__ == "__main__":
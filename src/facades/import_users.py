@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import itertools
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+)
+
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.dto.user_import import IMPORTED_USER_ADAPTER, ImportedUser
+from src.services.user.contact_index import extract_contact_keys
+from src.services.user.write_imported_user import write_imported_user
+from src.settings import Settings, UserImportSettings
+from src.validators.validate_user_username import validate_user_username
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+JOB_ID_PREFIX = "import-users"
+# Time kept to finish the writes in flight and save the checkpoint.
+CHECKPOINT_MARGIN_SECONDS = 10.0
+# Tasks written between two checkpoints, per worker.
+TASKS_PER_WORKER = 4
+# Users a task writes one after another, one transaction each.
+USERS_PER_TASK = 25
+MAX_REPORTED_INVALID_ROWS = 100
+MAX_REPORTED_FAILED_ROWS = 100
+
+
+class CheckpointStore(Protocol):
+    def load(self, job_id: str) -> Optional[dict]: ...
+
+    def save(self, job_id: str, checkpoint: dict) -> None: ...
+
+    def clear(self, job_id: str) -> None: ...
+
+
+@dataclass
+class ImportReport:
+    # Input rows consumed, the import resumes after them.
+    position: int = 0
+    imported: int = 0
+    invalid: int = 0
+    failed: int = 0
+    invalid_rows: List[int] = field(default_factory=list)
+    failed_rows: List[int] = field(default_factory=list)
+    completed: bool = False
+
+
+@dataclass(frozen=True)
+class _Row:
+    position: int
+    user: ImportedUser
+    contact_keys: List[str]
+
+
+def _parse_row(row: Optional[Mapping[str, Any]]) -> Optional[ImportedUser]:
+    if row is None:
+        return None
+    try:
+        user = IMPORTED_USER_ADAPTER.validate_python(row)
+        validate_user_username(user.username)
+    except ValueError:
+        return None
+    return user
+
+
+def _write_users(
+    dynamodb_client: DynamoDBClient,
+    rows: List[_Row],
+    users_table_name: str,
+    contacts_table_name: str,
+    job_id: str,
+    now: datetime,
+    max_attempts: int,
+    sleep: Callable[[float], None],
+) -> List[int]:
+    # Returns the positions of the rows that could not be written, a
+    # contact or user already owned by someone else fails its row.
+    failed_rows = []
+    for row in rows:
+        try:
+            write_imported_user(
+                dynamodb_client,
+                users_table_name,
+                contacts_table_name,
+                row.user.username,
+                row.contact_keys,
+                job_id,
+                now,
+                max_attempts=max_attempts,
+                sleep=sleep,
+            )
+        except ValueError:
+            failed_rows.append(row.position)
+    return failed_rows
+
+
+def _extend_capped(rows: List[int], new_rows: List[int], cap: int) -> None:
+    rows.extend(new_rows[: max(0, cap - len(rows))])
+
+
+def import_users(
+    settings: Settings,
+    dynamodb_client: DynamoDBClient,
+    rows: Iterable[Optional[Mapping[str, Any]]],
+    checkpoint_store: CheckpointStore,
+    job_id: str,
+    now: datetime,
+    deadline: Deadline = NO_DEADLINE,
+    sleep: Callable[[float], None] = time.sleep,
+) -> ImportReport:
+    import_settings = settings.user_import or UserImportSettings()
+    users_table_name = settings.ensure_users_table_settings().name
+    contacts_table_name = settings.ensure_contacts_table_settings().name
+    window_size = import_settings.max_workers * TASKS_PER_WORKER
+
+    checkpoint = checkpoint_store.load(job_id)
+    report = ImportReport(**checkpoint) if checkpoint else ImportReport()
+
+    # Rows are only counted once the tasks holding them are written, so
+    # a resumed import neither skips nor double counts a row.
+    tasks: List[List[_Row]] = []
+    invalid_rows: List[int] = []
+    # A row claiming a contact of an earlier row of another user is invalid.
+    # Rows consumed before a resume are not remembered, a claim they wrote
+    # still fails the row as a conflict.
+    contact_owners: dict[str, str] = {}
+
+    def write_window(executor: ThreadPoolExecutor, position: int) -> None:
+        futures = [
+            executor.submit(
+                _write_users,
+                dynamodb_client,
+                task,
+                users_table_name,
+                contacts_table_name,
+                job_id,
+                now,
+                import_settings.max_write_attempts,
+                sleep,
+            )
+            for task in tasks
+        ]
+        for task, future in zip(tasks, futures, strict=True):
+            failed_rows = future.result()
+            report.imported += len(task) - len(failed_rows)
+            report.failed += len(failed_rows)
+            _extend_capped(
+                report.failed_rows, failed_rows, MAX_REPORTED_FAILED_ROWS
+            )
+
+        report.invalid += len(invalid_rows)
+        _extend_capped(
+            report.invalid_rows, invalid_rows, MAX_REPORTED_INVALID_ROWS
+        )
+        report.position = position
+        tasks.clear()
+        invalid_rows.clear()
+        checkpoint_store.save(job_id, asdict(report))
+
+    with ThreadPoolExecutor(
+        max_workers=import_settings.max_workers,
+        thread_name_prefix="import",
+    ) as executor:
+        position = report.position
+        for row in itertools.islice(rows, report.position, None):
+            position += 1
+            user = _parse_row(row)
+            contact_keys = (
+                extract_contact_keys(user.user_attributes(), verified_only=True)
+                if user
+                else []
+            )
+            if not user or any(
+                contact_owners.get(contact_key, user.username) != user.username
+                for contact_key in contact_keys
+            ):
+                invalid_rows.append(position)
+                continue
+            contact_owners.update(
+                (contact_key, user.username) for contact_key in contact_keys
+            )
+
+            if not tasks or len(tasks[-1]) == USERS_PER_TASK:
+                if len(tasks) == window_size:
+                    write_window(executor, position - 1)
+                    if deadline.remaining_seconds() <= (
+                        CHECKPOINT_MARGIN_SECONDS
+                    ):
+                        return report
+                tasks.append([])
+            tasks[-1].append(_Row(position, user, contact_keys))
+
+        write_window(executor, position)
+
+    checkpoint_store.clear(job_id)
+    report.completed = True
+    return report
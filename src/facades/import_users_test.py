@@ -0,0 +1,260 @@
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from src.adapters.deadline import Deadline
+
+from .import_users import import_users
+
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+JOB_ID = "import-users#bucket/users.csv#etag"
+
+
+def _username(index: int) -> str:
+    return f"0fcbc418-e084-478c-9af0-{index:012d}"
+
+
+def _row(index: int, **fields):
+    return {
+        "username": _username(index),
+        "email": f"user-{index}@example.com",
+        "email_verified": "true",
+        **fields,
+    }
+
+
+class FakeDynamoDBClient:
+    KEYS = {"users": "user_id", "contacts": "contact"}
+
+    def __init__(self, throttled_user_ids=()):
+        self._throttled_user_ids = set(throttled_user_ids)
+        self._lock = threading.Lock()
+        self.transactions = []
+        self.items = {}
+
+    def _holds(self, put):
+        item = self.items.get(
+            (put["TableName"], put["Item"][self.KEYS[put["TableName"]]]["S"])
+        )
+        if item is None:
+            return True
+        values = put["ExpressionAttributeValues"]
+        return any(
+            item.get(name) == values[placeholder]
+            for name, placeholder in (
+                clause.split(" = ")
+                for clause in put["ConditionExpression"].split(" OR ")
+                if " = " in clause
+            )
+        )
+
+    def transact_write_items(self, TransactItems):
+        puts = [item["Put"] for item in TransactItems]
+        if puts[0]["Item"]["user_id"]["S"] in self._throttled_user_ids:
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException"}},
+                "TransactWriteItems",
+            )
+        with self._lock:
+            self.transactions.append(TransactItems)
+            reasons = [
+                {
+                    "Code": "None"
+                    if self._holds(put)
+                    else "ConditionalCheckFailed"
+                }
+                for put in puts
+            ]
+            if any(reason["Code"] != "None" for reason in reasons):
+                raise ClientError(
+                    {
+                        "Error": {"Code": "TransactionCanceledException"},
+                        "CancellationReasons": reasons,
+                    },
+                    "TransactWriteItems",
+                )
+            for put in puts:
+                key = put["Item"][self.KEYS[put["TableName"]]]["S"]
+                self.items[(put["TableName"], key)] = put["Item"]
+        return {}
+
+
+class FakeCheckpointStore:
+    def __init__(self, checkpoint=None):
+        self.checkpoints = {JOB_ID: checkpoint} if checkpoint else {}
+        self.saved = []
+
+    def load(self, job_id):
+        return self.checkpoints.get(job_id)
+
+    def save(self, job_id, checkpoint):
+        self.saved.append(checkpoint)
+        self.checkpoints[job_id] = checkpoint
+
+    def clear(self, job_id):
+        self.checkpoints.pop(job_id, None)
+
+
+def _settings(max_workers=2):
+    settings = MagicMock()
+    settings.user_import.max_workers = max_workers
+    settings.user_import.max_write_attempts = 2
+    settings.ensure_users_table_settings.return_value.name = "users"
+    settings.ensure_contacts_table_settings.return_value.name = "contacts"
+    return settings
+
+
+def _import(client, rows, checkpoint_store, **kwargs):
+    return import_users(
+        _settings(),
+        client,
+        rows,
+        checkpoint_store,
+        JOB_ID,
+        NOW,
+        sleep=lambda seconds: None,
+        **kwargs,
+    )
+
+
+class ImportUsersTests(unittest.TestCase):
+    def test_writes_users_and_verified_contacts(self):
+        client = FakeDynamoDBClient()
+        store = FakeCheckpointStore()
+        rows = [_row(i) for i in range(30)]
+        rows.append(_row(30, email_verified="false"))
+
+        report = _import(client, rows, store)
+
+        self.assertTrue(report.completed)
+        self.assertEqual(report.imported, 31)
+        self.assertEqual(len(client.transactions), 31)
+        user = client.items[("users", _username(0))]
+        self.assertNotIn("expires_at", user)
+        self.assertEqual(user["verified_at"], {"N": "1768003200"})
+        self.assertEqual(user["import_job_id"], {"S": JOB_ID})
+        self.assertEqual(
+            client.items[("contacts", "email#user-0@example.com")]["verified"],
+            {"BOOL": True},
+        )
+        self.assertNotIn(
+            ("contacts", "email#user-30@example.com"), client.items
+        )
+        self.assertEqual(store.checkpoints, {})
+
+    def test_reports_invalid_rows(self):
+        client = FakeDynamoDBClient()
+        rows = [
+            _row(1),
+            None,
+            _row(2, username="not-a-uuid"),
+            _row(3, email="not-an-email"),
+            {"email": "missing-username@example.com"},
+        ]
+
+        report = _import(client, rows, FakeCheckpointStore())
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.invalid, 4)
+        self.assertEqual(report.invalid_rows, [2, 3, 4, 5])
+
+    def test_reports_contacts_repeated_in_the_file_as_invalid(self):
+        client = FakeDynamoDBClient()
+        rows = [_row(1), _row(2, email="User-1@example.com"), _row(1)]
+
+        report = _import(client, rows, FakeCheckpointStore())
+
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(report.invalid_rows, [2])
+        self.assertEqual(
+            client.items[("contacts", "email#user-1@example.com")]["user_id"],
+            {"S": _username(1)},
+        )
+
+    def test_reports_conflicts_as_failed_rows(self):
+        client = FakeDynamoDBClient()
+        client.items[("contacts", "email#user-2@example.com")] = {
+            "user_id": {"S": "someone-else"},
+            "verified": {"BOOL": True},
+        }
+        client.items[("users", _username(3))] = {"user_id": {"S": _username(3)}}
+
+        report = _import(
+            client, [_row(i) for i in range(1, 5)], FakeCheckpointStore()
+        )
+
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(report.failed, 2)
+        self.assertEqual(report.failed_rows, [2, 3])
+        self.assertNotIn(("users", _username(2)), client.items)
+        self.assertEqual(
+            client.items[("users", _username(3))],
+            {"user_id": {"S": _username(3)}},
+        )
+
+    def test_takes_over_unverified_claims(self):
+        client = FakeDynamoDBClient()
+        client.items[("contacts", "email#user-1@example.com")] = {
+            "user_id": {"S": "pending-sign-up"},
+            "verified": {"BOOL": False},
+        }
+
+        report = _import(client, [_row(1)], FakeCheckpointStore())
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(
+            client.items[("contacts", "email#user-1@example.com")]["user_id"],
+            {"S": _username(1)},
+        )
+
+    def test_reports_users_left_unwritten_as_failed_rows(self):
+        client = FakeDynamoDBClient(throttled_user_ids={_username(2)})
+        store = FakeCheckpointStore()
+
+        report = _import(client, [_row(i) for i in range(4)], store)
+
+        self.assertEqual(report.imported, 3)
+        self.assertEqual(report.failed, 1)
+        self.assertEqual(report.failed_rows, [3])
+        self.assertEqual(store.saved[-1]["failed_rows"], [3])
+
+    def test_checkpoints_and_resumes_when_deadline_is_near(self):
+        client = FakeDynamoDBClient()
+        store = FakeCheckpointStore()
+        rows = [_row(i) for i in range(250)]
+
+        report = _import(
+            client,
+            rows,
+            store,
+            deadline=Deadline(remaining_ms=5000, safety_margin_ms=0),
+        )
+
+        # Two workers write eight tasks of 25 users per checkpoint.
+        self.assertFalse(report.completed)
+        self.assertEqual(report.position, 200)
+        self.assertEqual(store.checkpoints[JOB_ID]["position"], 200)
+
+        report = _import(client, iter(rows), store)
+
+        self.assertTrue(report.completed)
+        self.assertEqual(report.position, 250)
+        self.assertEqual(report.imported, 250)
+        self.assertEqual(len(client.items), 500)
+
+    def test_rewrites_users_written_before_the_last_checkpoint(self):
+        client = FakeDynamoDBClient()
+        rows = [_row(i) for i in range(3)]
+        _import(client, rows, FakeCheckpointStore())
+
+        report = _import(client, rows, FakeCheckpointStore())
+
+        self.assertEqual(report.imported, 3)
+        self.assertEqual(report.failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,62 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
+from typing import TYPE_CHECKING
 
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
     PreSignUpTriggerEvent,
 )
-from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
-from mypy_boto3_dynamodb import DynamoDBClient
 
-from saas_python_lib.recaptcha import verify_recaptcha
+import src.adapters.analytics as analytics_adapter
+import src.adapters.aws_async as aws_async_adapter
+import src.adapters.contact_filter as contact_filter_adapter
+import src.adapters.metrics as metrics_adapter
+import src.adapters.recaptcha as recaptcha_adapter
 
-from src.settings import Settings
-from src.validators import (
-    validate_recaptcha,
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.settings import ReCaptchaSettings, Settings
+from src.dto.sign_up import PreSignUpValidationData
+from src.validators.validate_recaptcha import validate_recaptcha
+from src.validators.enforce_user_contact_uniqueness import (
+    ContactInUseError,
     enforce_user_contact_uniqueness,
-    validate_user_username,
 )
-from src.dto.sign_up import PreSignUpValidationData
-from src.services.user import is_contact_in_use, register_unverified_user
+from src.validators.validate_user_username import validate_user_username
+from src.validators.run_concurrent_checks import (
+    run_concurrent_checks,
+    run_concurrent_checks_async,
+)
+from src.services.user.contact_index import CONTACT_ATTRIBUTES
+from src.services.user.is_contact_in_use import (
+    is_contact_in_use,
+    is_contact_in_use_async,
+)
+from src.services.user.register_unverified_user import (
+    register_unverified_user,
+    register_unverified_user_async,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+    from src.adapters.aws_async import AsyncClient
+
+# Time kept for the rest of the trigger once reCAPTCHA has answered.
+RESPONSE_MARGIN_MS = 500
+
+# Separate pools keep the nested contact lookups from waiting on the very
+# workers that run the outer checks.
+_check_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="pre-sign-up-check"
+)
+_contact_lookup_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="pre-sign-up-contact"
+)
+
+
+def _recaptcha_timeout(
+    recaptcha_settings: ReCaptchaSettings, deadline: Deadline
+) -> float:
+    return min(
+        recaptcha_settings.verify_timeout_seconds,
+        deadline.remaining_seconds() - RESPONSE_MARGIN_MS / 1000,
+    )
+
+
+def _validate_input(event: PreSignUpTriggerEvent) -> PreSignUpValidationData:
+    with metrics_adapter.span("pre_sign_up.validate_input"):
+        validate_user_username(event.user_name)
+
+        return PreSignUpValidationData.load_from_dict(
+            event.request.validation_data
+        )
+
+
+def _reject_auto_confirmation(event: PreSignUpTriggerEvent) -> None:
+    for attr in ("auto_confirm_user", "auto_verify_email", "auto_verify_phone"):
+        setattr(event.response, attr, False)
+
+
+def _capture_sign_up(event: PreSignUpTriggerEvent, settings: Settings) -> None:
+    analytics_adapter.capture(
+        settings,
+        analytics_adapter.USER_SIGNED_UP,
+        event.user_name,
+        {"user_pool_id": event.user_pool_id},
+    )
 
 
 def process_pre_sign_up(
     event: PreSignUpTriggerEvent,
     settings: Settings,
-    cognito_client: CognitoIdentityProviderClient,
     dynamodb_client: DynamoDBClient,
+    deadline: Deadline = NO_DEADLINE,
 ) -> PreSignUpTriggerEvent:
     now = datetime.now(timezone.utc)
 
-    # recaptcha_settings = settings.ensure_recaptcha_settings()
+    recaptcha_settings = settings.ensure_recaptcha_settings()
     users_table_settings = settings.ensure_users_table_settings()
+    contacts_table_settings = settings.ensure_contacts_table_settings()
 
-    validate_user_username(event.user_name)
+    validation_data = _validate_input(event)
 
-    # validation_data = PreSignUpValidationData.load_from_dict(
-    #     event.request.validation_data
-    # )
+    deadline.ensure_time_left()
+    recaptcha_client = recaptcha_adapter.get_recaptcha_client()
+    recaptcha_timeout = _recaptcha_timeout(recaptcha_settings, deadline)
 
-    # print("Validating reCAPTCHA token...")
-    # print(f"reCAPTCHA token: {validation_data.recaptcha_token}")
-    # print(f"Secret key size: {len(recaptcha_settings.secret_key)} characters")
-    # validate_recaptcha(
-    #     validation_data.recaptcha_token,
-    #     recaptcha_settings.secret_key,
-    #     verify_recaptcha,
-    # )
+    def recaptcha_check() -> None:
+        with metrics_adapter.span("pre_sign_up.recaptcha"):
+            validate_recaptcha(
+                validation_data.recaptcha_token,
+                recaptcha_settings.secret_key,
+                partial(recaptcha_client.verify, timeout=recaptcha_timeout),
+            )
 
-    # def contact_uniqueness_validator(attribute_name, attribute_value) -> bool:
-    #     return is_contact_in_use(
-    #         cognito_client=cognito_client,
-    #         user_pool_id=event.user_pool_id,
-    #         attribute_name=attribute_name,
-    #         attribute_value=attribute_value,
-    #     )
+    contact_filter = contact_filter_adapter.get_contact_filter(
+        settings.contact_filter
+    )
 
-    # enforce_user_contact_uniqueness(event, contact_uniqueness_validator)
+    def contact_uniqueness_validator(attribute_name, attribute_value) -> bool:
+        return is_contact_in_use(
+            dynamodb_client=dynamodb_client,
+            contacts_table_name=contacts_table_settings.name,
+            attribute_name=attribute_name,
+            attribute_value=attribute_value,
+            deadline=deadline,
+            contact_filter=contact_filter,
+        )
 
-    register_unverified_user(event, users_table_settings, dynamodb_client, now)
+    def contact_uniqueness_check() -> None:
+        with metrics_adapter.span("pre_sign_up.contact_uniqueness"):
+            enforce_user_contact_uniqueness(
+                event,
+                contact_uniqueness_validator,
+                executor=_contact_lookup_executor,
+            )
 
-    for attr in ("auto_confirm_user", "auto_verify_email", "auto_verify_phone"):
-        setattr(event.response, attr, False)
+    # reCAPTCHA goes first so its failure is reported before contact
+    # errors, which keeps unverified callers from probing for contacts.
+    with metrics_adapter.span("pre_sign_up.checks"):
+        run_concurrent_checks(
+            [recaptcha_check, contact_uniqueness_check], _check_executor
+        )
+
+    register_unverified_user(
+        event,
+        users_table_settings,
+        contacts_table_settings,
+        dynamodb_client,
+        now,
+        deadline=deadline,
+    )
+
+    _reject_auto_confirmation(event)
+    _capture_sign_up(event, settings)
+
+    return event
+
+
+async def process_pre_sign_up_async(
+    event: PreSignUpTriggerEvent,
+    settings: Settings,
+    dynamodb_client: AsyncClient,
+    deadline: Deadline = NO_DEADLINE,
+) -> PreSignUpTriggerEvent:
+    now = datetime.now(timezone.utc)
+
+    recaptcha_settings = settings.ensure_recaptcha_settings()
+    users_table_settings = settings.ensure_users_table_settings()
+    contacts_table_settings = settings.ensure_contacts_table_settings()
+
+    validation_data = _validate_input(event)
+
+    deadline.ensure_time_left()
+    recaptcha_client = recaptcha_adapter.get_recaptcha_client()
+    recaptcha_timeout = _recaptcha_timeout(recaptcha_settings, deadline)
+
+    async def recaptcha_check() -> None:
+        with metrics_adapter.span("pre_sign_up.recaptcha"):
+            await aws_async_adapter.run_blocking(
+                validate_recaptcha,
+                validation_data.recaptcha_token,
+                recaptcha_settings.secret_key,
+                partial(recaptcha_client.verify, timeout=recaptcha_timeout),
+            )
+
+    contact_filter = contact_filter_adapter.get_contact_filter(
+        settings.contact_filter
+    )
+
+    async def contact_uniqueness_check() -> None:
+        user_attributes = event.request.user_attributes or {}
+        with metrics_adapter.span("pre_sign_up.contact_uniqueness"):
+            in_use = await asyncio.gather(
+                *(
+                    is_contact_in_use_async(
+                        dynamodb_client=dynamodb_client,
+                        contacts_table_name=contacts_table_settings.name,
+                        attribute_name=attribute_name,
+                        attribute_value=user_attributes.get(attribute_name),
+                        deadline=deadline,
+                        contact_filter=contact_filter,
+                    )
+                    for attribute_name in CONTACT_ATTRIBUTES
+                )
+            )
+            if any(in_use):
+                raise ContactInUseError()
+
+    # Same ordering as the sync checks, reCAPTCHA failures are reported
+    # before contact errors.
+    with metrics_adapter.span("pre_sign_up.checks"):
+        await run_concurrent_checks_async(
+            [recaptcha_check, contact_uniqueness_check]
+        )
+
+    await register_unverified_user_async(
+        event,
+        users_table_settings,
+        contacts_table_settings,
+        dynamodb_client,
+        now,
+        deadline=deadline,
+    )
+
+    _reject_auto_confirmation(event)
+    _capture_sign_up(event, settings)
 
     return event
@@ -1,19 +1,34 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
     PreSignUpTriggerEvent,
 )
 
 
+from src.adapters.deadline import Deadline, DeadlineExceededError
 from src.validators.validate_user_username import InvalidUserNameError
 from src.validators.validate_recaptcha import InvalidReCaptchaError
 from src.validators.enforce_user_contact_uniqueness import ContactInUseError
 
-from .process_pre_sign_up import process_pre_sign_up
+from .process_pre_sign_up import (
+    process_pre_sign_up,
+    process_pre_sign_up_async,
+)
 
 
 class ProcessPreSignUpTests(unittest.TestCase):
+    def setUp(self):
+        # Checks abandoned after a failure keep running in the background,
+        # so each test drains its own pools before the next one starts.
+        for name in ("_check_executor", "_contact_lookup_executor"):
+            executor = ThreadPoolExecutor(max_workers=2)
+            patcher = patch(f"facades.process_pre_sign_up.{name}", executor)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+            self.addCleanup(executor.shutdown, wait=True)
+
     def _event(self, username="0fcbc418-e084-478c-9af0-fa616f1761f0"):
         return PreSignUpTriggerEvent(
             {
@@ -34,14 +49,23 @@ class ProcessPreSignUpTests(unittest.TestCase):
     def _settings(self):
         recaptcha_settings = MagicMock()
         recaptcha_settings.secret_key = "secret-key"
+        recaptcha_settings.verify_timeout_seconds = 2.0
 
         users_table_settings = MagicMock()
         users_table_settings.name = "users-table"
         users_table_settings.expire_unverified_users_minutes = 15
 
+        contacts_table_settings = MagicMock()
+        contacts_table_settings.name = "contacts-table"
+
         settings = MagicMock()
+        settings.contact_filter = None
+        settings.posthog = None
         settings.ensure_recaptcha_settings.return_value = recaptcha_settings
         settings.ensure_users_table_settings.return_value = users_table_settings
+        settings.ensure_contacts_table_settings.return_value = (
+            contacts_table_settings
+        )
 
         return settings
 
@@ -50,7 +74,7 @@ class ProcessPreSignUpTests(unittest.TestCase):
         settings = self._settings()
 
         with self.assertRaises(InvalidUserNameError):
-            process_pre_sign_up(event, settings, MagicMock(), MagicMock())
+            process_pre_sign_up(event, settings, MagicMock())
 
     @patch("facades.process_pre_sign_up.validate_recaptcha")
     def test_validate_recaptcha_failure(self, mock_validate_recaptcha):
@@ -60,7 +84,7 @@ class ProcessPreSignUpTests(unittest.TestCase):
         mock_validate_recaptcha.side_effect = InvalidReCaptchaError()
 
         with self.assertRaises(InvalidReCaptchaError):
-            process_pre_sign_up(event, settings, MagicMock(), MagicMock())
+            process_pre_sign_up(event, settings, MagicMock())
 
         mock_validate_recaptcha.assert_called_once()
 
@@ -75,7 +99,7 @@ class ProcessPreSignUpTests(unittest.TestCase):
         mock_is_contact_in_use.return_value = True
 
         with self.assertRaises(ContactInUseError):
-            process_pre_sign_up(event, settings, MagicMock(), MagicMock())
+            process_pre_sign_up(event, settings, MagicMock())
 
         mock_validate_recaptcha.assert_called_once()
 
@@ -94,7 +118,7 @@ class ProcessPreSignUpTests(unittest.TestCase):
         mock_enforce_user_contact_uniqueness.side_effect = ContactInUseError()
 
         with self.assertRaises(ContactInUseError):
-            process_pre_sign_up(event, settings, MagicMock(), MagicMock())
+            process_pre_sign_up(event, settings, MagicMock())
 
         mock_is_contact_in_use.assert_not_called()
         mock_validate_recaptcha.assert_called_once()
@@ -113,13 +137,155 @@ class ProcessPreSignUpTests(unittest.TestCase):
         event = self._event()
         settings = self._settings()
 
-        process_pre_sign_up(event, settings, MagicMock(), MagicMock())
+        process_pre_sign_up(event, settings, MagicMock())
 
         mock_validate_recaptcha.assert_called_once()
         mock_is_contact_in_use.assert_not_called()
         mock_enforce_user_contact_uniqueness.assert_called_once()
         mock_register_unverified_user.assert_called_once()
 
+    @patch("facades.process_pre_sign_up.analytics_adapter.capture")
+    @patch("facades.process_pre_sign_up.validate_recaptcha")
+    @patch("facades.process_pre_sign_up.is_contact_in_use")
+    @patch("facades.process_pre_sign_up.register_unverified_user")
+    def test_captures_sign_up_only_once_registered(
+        self,
+        mock_register_unverified_user,
+        mock_is_contact_in_use,
+        mock_validate_recaptcha,
+        mock_capture,
+    ):
+        event = self._event()
+        settings = self._settings()
+        mock_is_contact_in_use.return_value = False
+
+        process_pre_sign_up(event, settings, MagicMock())
+
+        mock_capture.assert_called_once_with(
+            settings,
+            "user signed up",
+            event.user_name,
+            {"user_pool_id": "pool-id"},
+        )
+
+        mock_capture.reset_mock()
+        mock_register_unverified_user.side_effect = ValueError("boom")
+        with self.assertRaises(ValueError):
+            process_pre_sign_up(self._event(), settings, MagicMock())
+        mock_capture.assert_not_called()
+
+    @patch("facades.process_pre_sign_up.validate_recaptcha")
+    @patch("facades.process_pre_sign_up.is_contact_in_use")
+    @patch("facades.process_pre_sign_up.register_unverified_user")
+    def test_does_not_register_when_recaptcha_fails(
+        self,
+        mock_register_unverified_user,
+        mock_is_contact_in_use,
+        mock_validate_recaptcha,
+    ):
+        event = self._event()
+        settings = self._settings()
+
+        mock_is_contact_in_use.return_value = False
+        mock_validate_recaptcha.side_effect = InvalidReCaptchaError()
+
+        with self.assertRaises(InvalidReCaptchaError):
+            process_pre_sign_up(event, settings, MagicMock())
+
+        mock_register_unverified_user.assert_not_called()
+
+    @patch("facades.process_pre_sign_up.validate_recaptcha")
+    def test_recaptcha_timeout_fits_remaining_time(
+        self, mock_validate_recaptcha
+    ):
+        event = self._event()
+        settings = self._settings()
+        settings.ensure_recaptcha_settings.return_value.verify_timeout_seconds = 2
+
+        mock_validate_recaptcha.side_effect = InvalidReCaptchaError()
+
+        with self.assertRaises(InvalidReCaptchaError):
+            process_pre_sign_up(
+                event,
+                settings,
+                MagicMock(),
+                deadline=Deadline(1800, clock=lambda: 0.0),
+            )
+
+        args, _ = mock_validate_recaptcha.call_args
+        self.assertEqual(args[0], "token")
+        self.assertEqual(args[2].keywords["timeout"], 1.0)
+
+    @patch("facades.process_pre_sign_up.register_unverified_user")
+    def test_does_not_register_when_deadline_expired(
+        self, mock_register_unverified_user
+    ):
+        event = self._event()
+        settings = self._settings()
+        dynamodb_client = MagicMock()
+
+        with self.assertRaises(DeadlineExceededError):
+            process_pre_sign_up(
+                event,
+                settings,
+                dynamodb_client,
+                deadline=Deadline(300, clock=lambda: 0.0),
+            )
+
+        dynamodb_client.get_item.assert_not_called()
+        mock_register_unverified_user.assert_not_called()
+
+
+class ProcessPreSignUpAsyncTests(unittest.IsolatedAsyncioTestCase):
+    _event = ProcessPreSignUpTests._event
+    _settings = ProcessPreSignUpTests._settings
+
+    def _dynamodb_client(self, verified=False):
+        dynamodb_client = MagicMock()
+        dynamodb_client.get_item = AsyncMock(
+            return_value={"Item": {"verified": {"BOOL": verified}}}
+        )
+        dynamodb_client.transact_write_items = AsyncMock(return_value={})
+        return dynamodb_client
+
+    @patch("facades.process_pre_sign_up.validate_recaptcha")
+    async def test_registers_user_after_checks(self, mock_validate_recaptcha):
+        event = self._event()
+        dynamodb_client = self._dynamodb_client()
+
+        processed = await process_pre_sign_up_async(
+            event, self._settings(), dynamodb_client
+        )
+
+        mock_validate_recaptcha.assert_called_once()
+        self.assertEqual(dynamodb_client.get_item.await_count, 2)
+        dynamodb_client.transact_write_items.assert_awaited_once()
+        self.assertFalse(processed.response.auto_confirm_user)
+
+    @patch("facades.process_pre_sign_up.validate_recaptcha")
+    async def test_contact_in_use_raises(self, mock_validate_recaptcha):
+        dynamodb_client = self._dynamodb_client(verified=True)
+
+        with self.assertRaises(ContactInUseError):
+            await process_pre_sign_up_async(
+                self._event(), self._settings(), dynamodb_client
+            )
+
+        dynamodb_client.transact_write_items.assert_not_awaited()
+
+    @patch("facades.process_pre_sign_up.validate_recaptcha")
+    async def test_recaptcha_failure_is_reported_first(
+        self, mock_validate_recaptcha
+    ):
+        mock_validate_recaptcha.side_effect = InvalidReCaptchaError()
+
+        with self.assertRaises(InvalidReCaptchaError):
+            await process_pre_sign_up_async(
+                self._event(),
+                self._settings(),
+                self._dynamodb_client(verified=True),
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
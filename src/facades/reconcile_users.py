@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import tempfile
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline, DeadlineExceededError
+from src.adapters.spill_sort import SpillRecord, SpillSorter
+from src.services.user.contact_index import (
+    CONTACT_ATTRIBUTES,
+    VERIFIED_ATTRIBUTE_MAP,
+    extract_contact_keys,
+)
+from src.services.user.list_pool_users import list_pool_users
+from src.services.user.release_contact_claims import release_contact_claims
+from src.services.user.scan_users import scan_users
+from src.services.user.set_user_as_verified import set_user_as_verified
+from src.settings import (
+    ContactsTableSettings,
+    ReconciliationSettings,
+    Settings,
+)
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+ORPHANED_POOL_USER = "orphaned_pool_user"
+MISSING_VERIFIED_AT = "missing_verified_at"
+MISSING_POOL_USER = "missing_pool_user"
+MAX_SAMPLES = 100
+
+CONTACT_ATTRIBUTE_NAMES = (
+    *CONTACT_ATTRIBUTES,
+    *(VERIFIED_ATTRIBUTE_MAP[name] for name in CONTACT_ATTRIBUTES),
+)
+
+
+@dataclass
+class ReconciliationReport:
+    table_users: int = 0
+    pool_users: int = 0
+    mismatches: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[str]] = field(default_factory=dict)
+    repaired: int = 0
+    repair_failed: int = 0
+
+    def record(self, mismatch: str, user_id: str) -> None:
+        self.mismatches[mismatch] = self.mismatches.get(mismatch, 0) + 1
+        samples = self.samples.setdefault(mismatch, [])
+        if len(samples) < MAX_SAMPLES:
+            samples.append(user_id)
+
+
+def _spill_table_users(
+    dynamodb_client: DynamoDBClient,
+    users_table_name: str,
+    segment: int,
+    total_segments: int,
+    sorter: SpillSorter,
+) -> int:
+    scanned = 0
+    for item in scan_users(
+        dynamodb_client, users_table_name, segment, total_segments
+    ):
+        user_id = item.get("user_id", {}).get("S")
+        if user_id:
+            sorter.add(user_id, "verified_at" in item)
+            scanned += 1
+    return scanned
+
+
+def _spill_pool_users(
+    cognito_client: CognitoIdentityProviderClient,
+    user_pool_id: str,
+    sorter: SpillSorter,
+    deadline: Deadline,
+) -> int:
+    # A partial listing would report every user it missed as missing from
+    # the pool, so running out of time fails the reconciliation instead.
+    listed = 0
+    for user in list_pool_users(
+        cognito_client, user_pool_id, CONTACT_ATTRIBUTE_NAMES, deadline
+    ):
+        # Only what the diff and the repairs need is spilled.
+        sorter.add(
+            user.username,
+            [
+                user.status,
+                user.created_at.timestamp() if user.created_at else None,
+                extract_contact_keys(
+                    user.user_attributes(), verified_only=True
+                ),
+            ],
+        )
+        listed += 1
+    return listed
+
+
+def _join(
+    table_records: Iterator[SpillRecord], pool_records: Iterator[SpillRecord]
+) -> Iterator[Tuple[str, Optional[Any], Optional[Any]]]:
+    # Both sides are sorted by user id, so a single pass pairs them up.
+    table = next(table_records, None)
+    pool = next(pool_records, None)
+    while table is not None or pool is not None:
+        if table is not None and (pool is None or table[0] < pool[0]):
+            yield table[0], table[1], None
+            table = next(table_records, None)
+        elif pool is not None and (table is None or pool[0] < table[0]):
+            yield pool[0], None, pool[1]
+            pool = next(pool_records, None)
+        elif table is not None and pool is not None:
+            yield table[0], table[1], pool[1]
+            table = next(table_records, None)
+            pool = next(pool_records, None)
+
+
+def _delete_pool_user(
+    cognito_client: CognitoIdentityProviderClient,
+    user_pool_id: str,
+    user_id: str,
+    deadline: Deadline,
+) -> bool:
+    rate_limiter = rate_limits_adapter.get_rate_limiter(
+        rate_limits_adapter.COGNITO_USER_UPDATE
+    )
+    try:
+        with metrics_adapter.span("admin_delete_user") as span:
+            response = rate_limiter.call(
+                lambda: cognito_client.admin_delete_user(
+                    UserPoolId=user_pool_id, Username=user_id
+                ),
+                deadline,
+            )
+            span.record_response(response)
+    except ClientError as exc:
+        return exc.response.get("Error", {}).get("Code") == (
+            "UserNotFoundException"
+        )
+    except (BotoCoreError, DeadlineExceededError):
+        return False
+    return True
+
+
+def _release_claims(
+    dynamodb_client: DynamoDBClient,
+    contacts_table_settings: ContactsTableSettings,
+    user_id: str,
+    deadline: Deadline,
+) -> bool:
+    # Claims written before the user record went missing would otherwise
+    # keep the contacts of the deleted user taken.
+    try:
+        release_contact_claims(
+            dynamodb_client,
+            contacts_table_settings.name,
+            contacts_table_settings.user_id_index_name,
+            user_id,
+            deadline=deadline,
+        )
+    except (ValueError, DeadlineExceededError):
+        return False
+    return True
+
+
+def reconcile_users(
+    settings: Settings,
+    dynamodb_client: DynamoDBClient,
+    cognito_client: CognitoIdentityProviderClient,
+    now: datetime,
+    repair: bool = False,
+    deadline: Deadline = NO_DEADLINE,
+) -> ReconciliationReport:
+    reconciliation_settings = (
+        settings.reconciliation or ReconciliationSettings()
+    )
+    users_table_settings = settings.ensure_users_table_settings()
+    contacts_table_settings = settings.ensure_contacts_table_settings()
+    user_pool_id = settings.ensure_user_pool_settings().id
+    total_segments = reconciliation_settings.total_segments
+    # Pool users created after the table was scanned have a record the scan
+    # missed, so only older ones count as orphaned.
+    orphan_cutoff = (
+        now - timedelta(hours=reconciliation_settings.orphan_grace_period_hours)
+    ).timestamp()
+
+    report = ReconciliationReport()
+    with tempfile.TemporaryDirectory(
+        prefix="reconcile-users-", dir=reconciliation_settings.spill_directory
+    ) as spill_directory:
+        table_sorter = SpillSorter(
+            spill_directory, reconciliation_settings.spill_max_items
+        )
+        pool_sorter = SpillSorter(
+            spill_directory, reconciliation_settings.spill_max_items
+        )
+
+        # ListUsers pages through a single token, it runs alongside the
+        # table segments rather than being split itself.
+        with (
+            metrics_adapter.span("reconcile_users.collect"),
+            ThreadPoolExecutor(
+                max_workers=total_segments + 1,
+                thread_name_prefix="reconcile",
+            ) as executor,
+        ):
+            pool_future = executor.submit(
+                _spill_pool_users,
+                cognito_client,
+                user_pool_id,
+                pool_sorter,
+                deadline,
+            )
+            segment_futures = [
+                executor.submit(
+                    _spill_table_users,
+                    dynamodb_client,
+                    users_table_settings.name,
+                    segment,
+                    total_segments,
+                    table_sorter,
+                )
+                for segment in range(total_segments)
+            ]
+            report.table_users = sum(
+                future.result() for future in segment_futures
+            )
+            report.pool_users = pool_future.result()
+
+        for user_id, is_verified, pool_user in _join(
+            iter(table_sorter), iter(pool_sorter)
+        ):
+            if pool_user is None:
+                # Unverified records expire on their own.
+                if is_verified:
+                    report.record(MISSING_POOL_USER, user_id)
+                continue
+
+            status, created_at, contact_keys = pool_user
+            if is_verified is None:
+                if created_at is None or created_at >= orphan_cutoff:
+                    continue
+                report.record(ORPHANED_POOL_USER, user_id)
+                if repair and not deadline.is_expired():
+                    if _delete_pool_user(
+                        cognito_client, user_pool_id, user_id, deadline
+                    ) and _release_claims(
+                        dynamodb_client,
+                        contacts_table_settings,
+                        user_id,
+                        deadline,
+                    ):
+                        report.repaired += 1
+                    else:
+                        report.repair_failed += 1
+            elif not is_verified and status == "CONFIRMED":
+                report.record(MISSING_VERIFIED_AT, user_id)
+                if repair and not deadline.is_expired():
+                    try:
+                        set_user_as_verified(
+                            dynamodb_client,
+                            users_table_settings.name,
+                            user_id,
+                            now,
+                            contacts_table_settings.name,
+                            contact_keys,
+                            deadline=deadline,
+                        )
+                        report.repaired += 1
+                    except (ValueError, DeadlineExceededError):
+                        report.repair_failed += 1
+
+    return report
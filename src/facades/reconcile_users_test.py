@@ -0,0 +1,149 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, MagicMock, patch
+
+from .reconcile_users import (
+    MISSING_POOL_USER,
+    MISSING_VERIFIED_AT,
+    ORPHANED_POOL_USER,
+    reconcile_users,
+)
+
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+
+class FakeDynamoDBClient:
+    def __init__(self, items):
+        self._items = items
+
+    def scan(self, Segment, TotalSegments, **kwargs):
+        # Two pages per segment.
+        items = [
+            item
+            for index, item in enumerate(self._items)
+            if index % TotalSegments == Segment
+        ]
+        if "ExclusiveStartKey" not in kwargs:
+            return {
+                "Items": items[:1],
+                "LastEvaluatedKey": {"page": {"N": "1"}},
+            }
+        return {"Items": items[1:]}
+
+
+class FakeCognitoClient:
+    def __init__(self, users):
+        self._users = users
+        self.deleted = []
+
+    def list_users(self, **kwargs):
+        if "PaginationToken" not in kwargs:
+            return {"Users": self._users[:2], "PaginationToken": "next"}
+        return {"Users": self._users[2:]}
+
+    def admin_delete_user(self, UserPoolId, Username):
+        self.deleted.append(Username)
+        return {}
+
+
+def _record(user_id, verified):
+    item = {"user_id": {"S": user_id}}
+    if verified:
+        item["verified_at"] = {"N": "1"}
+    return item
+
+
+def _pool_user(user_id, status="CONFIRMED", age=timedelta(days=2)):
+    return {
+        "Username": user_id,
+        "UserStatus": status,
+        "UserCreateDate": NOW - age,
+        "Attributes": [
+            {"Name": "email", "Value": f"{user_id}@example.com"},
+            {"Name": "email_verified", "Value": "true"},
+        ],
+    }
+
+
+def _settings():
+    settings = MagicMock()
+    settings.reconciliation.total_segments = 3
+    settings.reconciliation.spill_max_items = 2
+    settings.reconciliation.spill_directory = None
+    settings.reconciliation.orphan_grace_period_hours = 24
+    settings.ensure_users_table_settings.return_value.name = "users"
+    settings.ensure_contacts_table_settings.return_value.name = "contacts"
+    settings.ensure_user_pool_settings.return_value.id = "pool"
+    return settings
+
+
+class ReconcileUsersTests(unittest.TestCase):
+    def setUp(self):
+        self.dynamodb_client = FakeDynamoDBClient(
+            [
+                _record("a", verified=True),
+                _record("b", verified=False),
+                _record("c", verified=True),
+                _record("d", verified=False),
+                _record("e", verified=True),
+            ]
+        )
+        self.cognito_client = FakeCognitoClient(
+            [
+                _pool_user("a"),
+                _pool_user("b"),
+                _pool_user("d", status="UNCONFIRMED"),
+                _pool_user("f"),
+                _pool_user("g", age=timedelta(hours=1)),
+            ]
+        )
+
+    def test_reports_mismatches(self):
+        report = reconcile_users(
+            _settings(), self.dynamodb_client, self.cognito_client, NOW
+        )
+
+        self.assertEqual(report.table_users, 5)
+        self.assertEqual(report.pool_users, 5)
+        self.assertEqual(
+            report.samples,
+            {
+                MISSING_VERIFIED_AT: ["b"],
+                MISSING_POOL_USER: ["c", "e"],
+                ORPHANED_POOL_USER: ["f"],
+            },
+        )
+        self.assertEqual(report.repaired, 0)
+        self.assertEqual(self.cognito_client.deleted, [])
+
+    @patch("facades.reconcile_users.release_contact_claims")
+    @patch("facades.reconcile_users.set_user_as_verified")
+    def test_repairs_mismatches(
+        self, set_user_as_verified, release_contact_claims
+    ):
+        report = reconcile_users(
+            _settings(),
+            self.dynamodb_client,
+            self.cognito_client,
+            NOW,
+            repair=True,
+        )
+
+        self.assertEqual(report.repaired, 2)
+        self.assertEqual(self.cognito_client.deleted, ["f"])
+        set_user_as_verified.assert_called_once_with(
+            self.dynamodb_client,
+            "users",
+            "b",
+            NOW,
+            "contacts",
+            ["email#b@example.com"],
+            deadline=ANY,
+        )
+        release_contact_claims.assert_called_once_with(
+            self.dynamodb_client, "contacts", ANY, "f", deadline=ANY
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Protocol,
+)
+
+import src.adapters.metrics as metrics_adapter
+
+from src.adapters.bloom_filter import BloomFilter
+from src.adapters.contact_filter import Snapshot
+from src.services.user.list_verified_contacts import list_verified_contacts
+from src.settings import Settings
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+# A filter holding more contacts than it was sized for is rebuilt once its
+# false positive rate drifts this far past the configured one.
+REBUILD_FALSE_POSITIVE_FACTOR = 2.0
+
+
+class SnapshotStore(Protocol):
+    def load(
+        self, if_none_match: Optional[str] = None
+    ) -> Optional[Snapshot]: ...
+
+    def save(self, data: bytes) -> None: ...
+
+
+@dataclass
+class ContactFilterRefreshReport:
+    rebuilt: bool
+    added: int
+    item_count: int
+    size_bytes: int
+    estimated_false_positive_rate: float
+
+
+def _verified_contacts_in_stream(
+    records: Iterable[Mapping[str, Any]],
+) -> Iterator[str]:
+    # Contacts are never removed, a Bloom filter cannot forget them. The
+    # periodic rebuild drops contacts that were deleted since.
+    for record in records:
+        if record.get("eventName") not in ("INSERT", "MODIFY"):
+            continue
+        image = (record.get("dynamodb") or {}).get("NewImage") or {}
+        if not image.get("verified", {}).get("BOOL"):
+            continue
+        contact = image.get("contact", {}).get("S")
+        if contact:
+            yield contact
+
+
+def _load_contact_filter(
+    snapshot_store: SnapshotStore,
+) -> Optional[BloomFilter]:
+    snapshot = snapshot_store.load()
+    if not snapshot:
+        return None
+    try:
+        return BloomFilter.from_bytes(snapshot.data)
+    except ValueError:
+        return None
+
+
+def refresh_contact_filter(
+    settings: Settings,
+    dynamodb_client: DynamoDBClient,
+    snapshot_store: SnapshotStore,
+    records: Optional[Iterable[Mapping[str, Any]]] = None,
+) -> ContactFilterRefreshReport:
+    filter_settings = settings.ensure_contact_filter_settings()
+    contacts_table_settings = settings.ensure_contacts_table_settings()
+
+    # Stream records update the current snapshot, anything else rebuilds it.
+    current_filter = (
+        _load_contact_filter(snapshot_store) if records is not None else None
+    )
+
+    added = 0
+    if (
+        current_filter
+        and records is not None
+        and (
+            current_filter.estimated_false_positive_rate()
+            <= filter_settings.false_positive_rate
+            * REBUILD_FALSE_POSITIVE_FACTOR
+        )
+    ):
+        contact_filter = current_filter
+        rebuilt = False
+        for contact in _verified_contacts_in_stream(records):
+            contact_filter.add(contact)
+            added += 1
+    else:
+        capacity = max(
+            filter_settings.capacity,
+            2 * current_filter.item_count if current_filter else 0,
+        )
+        contact_filter = BloomFilter.for_capacity(
+            capacity, filter_settings.false_positive_rate
+        )
+        rebuilt = True
+        with metrics_adapter.span("contact_filter.rebuild"):
+            for contact in list_verified_contacts(
+                dynamodb_client, contacts_table_settings.name
+            ):
+                contact_filter.add(contact)
+                added += 1
+
+    snapshot_store.save(contact_filter.to_bytes())
+
+    return ContactFilterRefreshReport(
+        rebuilt=rebuilt,
+        added=added,
+        item_count=contact_filter.item_count,
+        size_bytes=contact_filter.size_bytes,
+        estimated_false_positive_rate=(
+            contact_filter.estimated_false_positive_rate()
+        ),
+    )
@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.adapters.bloom_filter import BloomFilter
+from src.adapters.contact_filter import Snapshot
+
+from .refresh_contact_filter import refresh_contact_filter
+
+
+class FakeSnapshotStore:
+    def __init__(self, contact_filter=None):
+        self.data = contact_filter.to_bytes() if contact_filter else None
+
+    def load(self, if_none_match=None):
+        return Snapshot(self.data, '"etag"') if self.data else None
+
+    def save(self, data):
+        self.data = data
+
+
+def _settings(capacity=100):
+    settings = MagicMock()
+    settings.ensure_contact_filter_settings.return_value.capacity = capacity
+    settings.ensure_contact_filter_settings.return_value.false_positive_rate = (
+        0.01
+    )
+    settings.ensure_contacts_table_settings.return_value.name = "contacts"
+    return settings
+
+
+def _client(*contacts):
+    client = MagicMock()
+    client.scan.return_value = {
+        "Items": [{"contact": {"S": contact}} for contact in contacts]
+    }
+    return client
+
+
+def _stream_record(event_name, contact, verified):
+    return {
+        "eventName": event_name,
+        "dynamodb": {
+            "NewImage": {
+                "contact": {"S": contact},
+                "verified": {"BOOL": verified},
+            }
+        },
+    }
+
+
+class RefreshContactFilterTests(unittest.TestCase):
+    def test_rebuilds_filter_from_verified_contacts(self):
+        client = _client("email#a@example.com", "email#b@example.com")
+        store = FakeSnapshotStore()
+
+        report = refresh_contact_filter(_settings(), client, store)
+
+        self.assertTrue(report.rebuilt)
+        self.assertEqual(report.added, 2)
+        contact_filter = BloomFilter.from_bytes(store.data)
+        self.assertIn("email#a@example.com", contact_filter)
+        self.assertIn("email#b@example.com", contact_filter)
+        self.assertEqual(
+            client.scan.call_args.kwargs["FilterExpression"],
+            "verified = :true",
+        )
+
+    def test_adds_verified_contacts_from_stream(self):
+        contact_filter = BloomFilter.for_capacity(100, 0.01)
+        contact_filter.add("email#a@example.com")
+        client = _client()
+        store = FakeSnapshotStore(contact_filter)
+
+        report = refresh_contact_filter(
+            _settings(),
+            client,
+            store,
+            records=[
+                _stream_record("MODIFY", "email#b@example.com", True),
+                _stream_record("INSERT", "email#c@example.com", False),
+                _stream_record("REMOVE", "email#d@example.com", True),
+            ],
+        )
+
+        self.assertFalse(report.rebuilt)
+        self.assertEqual(report.added, 1)
+        self.assertEqual(report.item_count, 2)
+        contact_filter = BloomFilter.from_bytes(store.data)
+        self.assertIn("email#a@example.com", contact_filter)
+        self.assertIn("email#b@example.com", contact_filter)
+        self.assertNotIn("email#c@example.com", contact_filter)
+        client.scan.assert_not_called()
+
+    def test_stream_rebuilds_missing_filter(self):
+        client = _client("email#a@example.com")
+
+        report = refresh_contact_filter(
+            _settings(), client, FakeSnapshotStore(), records=[]
+        )
+
+        self.assertTrue(report.rebuilt)
+        client.scan.assert_called_once()
+
+    def test_stream_rebuilds_overfull_filter_with_more_capacity(self):
+        contact_filter = BloomFilter.for_capacity(10, 0.01)
+        for i in range(50):
+            contact_filter.add(f"email#{i}@example.com")
+        client = _client("email#a@example.com")
+
+        report = refresh_contact_filter(
+            _settings(capacity=10),
+            client,
+            FakeSnapshotStore(contact_filter),
+            records=[],
+        )
+
+        self.assertTrue(report.rebuilt)
+        # Sized for twice the contacts the overfull filter held.
+        self.assertEqual(
+            report.size_bytes, BloomFilter.for_capacity(100, 0.01).size_bytes
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
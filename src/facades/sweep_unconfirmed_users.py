@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, List, Optional, Protocol
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+
+from src.adapters.aws import CognitoUser
+from src.adapters.deadline import NO_DEADLINE, Deadline, DeadlineExceededError
+from src.adapters.rate_limits import AdaptiveRateLimiter
+from src.services.user.list_unconfirmed_users import list_unconfirmed_users
+from src.settings import Settings
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+
+JOB_ID_PREFIX = "cleanup-unconfirmed-users"
+# Time kept to drain in-flight deletions and save the checkpoint.
+CHECKPOINT_MARGIN_SECONDS = 5.0
+
+
+class CheckpointStore(Protocol):
+    def load(self, job_id: str) -> Optional[dict]: ...
+
+    def save(self, job_id: str, checkpoint: dict) -> None: ...
+
+    def clear(self, job_id: str) -> None: ...
+
+
+@dataclass
+class SweepReport:
+    scanned: int = 0
+    deleted: int = 0
+    failed: int = 0
+    completed: bool = False
+    pagination_token: Optional[str] = None
+
+
+def _is_past_grace_period(user: CognitoUser, cutoff: datetime) -> bool:
+    return user.created_at is not None and user.created_at < cutoff
+
+
+def _delete_unconfirmed_user(
+    cognito_client: CognitoIdentityProviderClient,
+    user_pool_id: str,
+    username: str,
+    rate_limiter: AdaptiveRateLimiter,
+    deadline: Deadline,
+) -> bool:
+    """Deletes a user listed as unconfirmed, whatever its status is now.
+
+    AdminDeleteUser does not check the status, so a user who confirms
+    between the listing and this call is deleted as well.
+    """
+    try:
+        with metrics_adapter.span("admin_delete_user") as span:
+            response = rate_limiter.call(
+                lambda: cognito_client.admin_delete_user(
+                    UserPoolId=user_pool_id, Username=username
+                ),
+                deadline,
+            )
+            span.record_response(response)
+    except DeadlineExceededError:
+        return False
+    except ClientError as exc:
+        # Already deleted since it was listed.
+        return exc.response.get("Error", {}).get("Code") == (
+            "UserNotFoundException"
+        )
+    except BotoCoreError:
+        return False
+    return True
+
+
+def sweep_unconfirmed_users(
+    settings: Settings,
+    cognito_client: CognitoIdentityProviderClient,
+    checkpoint_store: CheckpointStore,
+    now: datetime,
+    deadline: Deadline = NO_DEADLINE,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+) -> SweepReport:
+    cleanup_settings = settings.ensure_cleanup_settings()
+    user_pool_id = cleanup_settings.user_pool_id
+    job_id = f"{JOB_ID_PREFIX}#{user_pool_id}"
+    cutoff = now - timedelta(hours=cleanup_settings.grace_period_hours)
+    rate_limiter = rate_limiter or rate_limits_adapter.get_rate_limiter(
+        rate_limits_adapter.COGNITO_USER_UPDATE
+    )
+
+    checkpoint = checkpoint_store.load(job_id) or {}
+    report = SweepReport(pagination_token=checkpoint.get("pagination_token"))
+
+    def has_time_left() -> bool:
+        return deadline.remaining_seconds() > CHECKPOINT_MARGIN_SECONDS
+
+    # Pages are consumed one at a time and at most two tasks per worker are
+    # queued, so memory stays flat whatever the pool size or user count.
+    in_flight = threading.BoundedSemaphore(cleanup_settings.max_workers * 2)
+
+    def submit(executor: ThreadPoolExecutor, username: str) -> Future:
+        in_flight.acquire()
+        future = executor.submit(
+            _delete_unconfirmed_user,
+            cognito_client,
+            user_pool_id,
+            username,
+            rate_limiter,
+            deadline,
+        )
+        future.add_done_callback(lambda _: in_flight.release())
+        return future
+
+    with ThreadPoolExecutor(
+        max_workers=cleanup_settings.max_workers,
+        thread_name_prefix="cleanup",
+    ) as executor:
+        pages = list_unconfirmed_users(
+            cognito_client, user_pool_id, report.pagination_token, deadline
+        )
+        try:
+            for page in pages:
+                futures: List[Future] = []
+                page_completed = True
+
+                for user in page.users:
+                    if not has_time_left():
+                        page_completed = False
+                        break
+                    report.scanned += 1
+                    if _is_past_grace_period(user, cutoff):
+                        futures.append(submit(executor, user.username))
+
+                for future in futures:
+                    if future.result():
+                        report.deleted += 1
+                    else:
+                        report.failed += 1
+
+                if not page_completed:
+                    # The page is listed again on resume, users deleted
+                    # from it are simply no longer returned.
+                    report.pagination_token = page.pagination_token
+                    checkpoint_store.save(
+                        job_id, {"pagination_token": report.pagination_token}
+                    )
+                    return report
+
+                report.pagination_token = page.next_pagination_token
+                if not report.pagination_token:
+                    break
+
+                checkpoint_store.save(
+                    job_id, {"pagination_token": report.pagination_token}
+                )
+                if not has_time_left():
+                    return report
+        except DeadlineExceededError:
+            # The next page could not be listed in time, the sweep resumes
+            # from the pagination token saved before it.
+            return report
+
+    checkpoint_store.clear(job_id)
+    report.completed = True
+    return report
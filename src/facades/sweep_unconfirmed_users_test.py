@@ -0,0 +1,217 @@
+import itertools
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from src.adapters.deadline import Deadline, DeadlineExceededError
+
+from .sweep_unconfirmed_users import (
+    CHECKPOINT_MARGIN_SECONDS,
+    sweep_unconfirmed_users,
+)
+
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+JOB_ID = "cleanup-unconfirmed-users#pool-id"
+
+
+class FakeCognitoClient:
+    def __init__(self, pages, on_delete=None):
+        self._pages = pages
+        self._on_delete = on_delete
+        self._lock = threading.Lock()
+        self.deleted = []
+
+    def list_users(self, **kwargs):
+        page = self._pages[kwargs.get("PaginationToken")]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def admin_delete_user(self, UserPoolId, Username):
+        if self._on_delete:
+            self._on_delete(Username)
+        with self._lock:
+            self.deleted.append(Username)
+        return {}
+
+
+class FakeCheckpointStore:
+    def __init__(self, checkpoint=None):
+        self.checkpoints = {JOB_ID: checkpoint} if checkpoint else {}
+        self.saved = []
+
+    def load(self, job_id):
+        return self.checkpoints.get(job_id)
+
+    def save(self, job_id, checkpoint):
+        self.saved.append(checkpoint)
+        self.checkpoints[job_id] = checkpoint
+
+    def clear(self, job_id):
+        self.checkpoints.pop(job_id, None)
+
+
+class NoWaitRateLimiter:
+    def __init__(self, deadline_exceeded=False):
+        self._deadline_exceeded = deadline_exceeded
+        self.deadlines = []
+
+    def call(self, operation, deadline=None):
+        self.deadlines.append(deadline)
+        if self._deadline_exceeded:
+            raise DeadlineExceededError()
+        return operation()
+
+
+def _user(username, age_hours):
+    return {
+        "Username": username,
+        "UserCreateDate": NOW - timedelta(hours=age_hours),
+    }
+
+
+class SweepUnconfirmedUsersTests(unittest.TestCase):
+    def _settings(self):
+        settings = MagicMock()
+        settings.ensure_cleanup_settings.return_value = SimpleNamespace(
+            user_pool_id="pool-id",
+            grace_period_hours=24,
+            max_workers=2,
+        )
+        return settings
+
+    def _sweep(
+        self, cognito_client, checkpoint_store, deadline=None, rate_limiter=None
+    ):
+        return sweep_unconfirmed_users(
+            self._settings(),
+            cognito_client,
+            checkpoint_store,
+            NOW,
+            deadline=deadline or Deadline.unbounded(),
+            rate_limiter=rate_limiter or NoWaitRateLimiter(),
+        )
+
+    def test_deletes_users_past_grace_period_on_every_page(self):
+        cognito_client = FakeCognitoClient(
+            {
+                None: {
+                    "Users": [_user("old-1", 48), _user("new-1", 1)],
+                    "PaginationToken": "page-2",
+                },
+                "page-2": {"Users": [_user("old-2", 25)]},
+            }
+        )
+        checkpoint_store = FakeCheckpointStore()
+
+        report = self._sweep(cognito_client, checkpoint_store)
+
+        self.assertEqual(sorted(cognito_client.deleted), ["old-1", "old-2"])
+        self.assertEqual(report.scanned, 3)
+        self.assertEqual(report.deleted, 2)
+        self.assertTrue(report.completed)
+        self.assertEqual(
+            checkpoint_store.saved, [{"pagination_token": "page-2"}]
+        )
+        self.assertEqual(checkpoint_store.checkpoints, {})
+
+    def test_resumes_from_saved_pagination_token(self):
+        cognito_client = FakeCognitoClient(
+            {"page-2": {"Users": [_user("old-2", 48)]}}
+        )
+        checkpoint_store = FakeCheckpointStore({"pagination_token": "page-2"})
+
+        report = self._sweep(cognito_client, checkpoint_store)
+
+        self.assertEqual(cognito_client.deleted, ["old-2"])
+        self.assertTrue(report.completed)
+
+    def test_checkpoints_interrupted_page_when_time_runs_out(self):
+        # Every clock read advances one second, so only the first user of
+        # the page is seen before the checkpoint margin is reached.
+        ticks = itertools.count()
+        deadline = Deadline(
+            (CHECKPOINT_MARGIN_SECONDS + 1.5) * 1000,
+            safety_margin_ms=0,
+            clock=lambda: float(next(ticks)),
+        )
+        cognito_client = FakeCognitoClient(
+            {
+                "page-2": {
+                    "Users": [_user("old-2", 48), _user("old-3", 48)],
+                    "PaginationToken": "page-3",
+                },
+            }
+        )
+        checkpoint_store = FakeCheckpointStore({"pagination_token": "page-2"})
+
+        report = self._sweep(cognito_client, checkpoint_store, deadline)
+
+        self.assertFalse(report.completed)
+        self.assertEqual(cognito_client.deleted, ["old-2"])
+        self.assertEqual(report.pagination_token, "page-2")
+        self.assertEqual(
+            checkpoint_store.checkpoints[JOB_ID], {"pagination_token": "page-2"}
+        )
+
+    def test_counts_failures_and_treats_missing_users_as_deleted(self):
+        def fail(username):
+            code = "UserNotFoundException" if username == "gone" else "Error"
+            raise ClientError(
+                {"Error": {"Code": code, "Message": "boom"}}, "AdminDeleteUser"
+            )
+
+        cognito_client = FakeCognitoClient(
+            {None: {"Users": [_user("gone", 48), _user("broken", 48)]}},
+            on_delete=fail,
+        )
+
+        report = self._sweep(cognito_client, FakeCheckpointStore())
+
+        self.assertEqual(report.deleted, 1)
+        self.assertEqual(report.failed, 1)
+        self.assertTrue(report.completed)
+
+    def test_counts_deletions_that_run_out_of_time_as_failed(self):
+        cognito_client = FakeCognitoClient(
+            {None: {"Users": [_user("old", 48)]}}
+        )
+        deadline = Deadline.unbounded()
+        rate_limiter = NoWaitRateLimiter(deadline_exceeded=True)
+
+        report = self._sweep(
+            cognito_client, FakeCheckpointStore(), deadline, rate_limiter
+        )
+
+        self.assertEqual(cognito_client.deleted, [])
+        self.assertEqual(report.failed, 1)
+        self.assertEqual(rate_limiter.deadlines, [deadline])
+
+    def test_keeps_checkpoint_when_next_page_is_not_listed_in_time(self):
+        cognito_client = FakeCognitoClient(
+            {
+                None: {
+                    "Users": [_user("old-1", 48)],
+                    "PaginationToken": "page-2",
+                },
+                "page-2": DeadlineExceededError(),
+            }
+        )
+        checkpoint_store = FakeCheckpointStore()
+
+        report = self._sweep(cognito_client, checkpoint_store)
+
+        self.assertFalse(report.completed)
+        self.assertEqual(report.deleted, 1)
+        self.assertEqual(report.pagination_token, "page-2")
+        self.assertEqual(
+            checkpoint_store.checkpoints[JOB_ID], {"pagination_token": "page-2"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
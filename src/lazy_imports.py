@@ -0,0 +1,24 @@
+import sys
+
+from importlib import import_module
+from typing import Any, Callable, Iterable
+
+
+def lazy_submodules(
+    package_name: str, names: Iterable[str]
+) -> Callable[[str], Any]:
+    # Builds a package __getattr__ that imports a submodule on first access,
+    # so a handler only loads what it actually uses. Each public name
+    # matches the submodule defining it.
+    exported = frozenset(names)
+
+    def __getattr__(name: str) -> Any:
+        if name not in exported:
+            raise AttributeError(
+                f"module {package_name!r} has no attribute {name!r}"
+            )
+        value = getattr(import_module(f".{name}", package_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    return __getattr__
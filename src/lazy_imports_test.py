@@ -0,0 +1,26 @@
+import sys
+import unittest
+
+from src.lazy_imports import lazy_submodules
+
+
+class LazySubmodulesTests(unittest.TestCase):
+    def test_imports_submodule_on_first_access(self):
+        __getattr__ = lazy_submodules("src.facades", ["import_users"])
+
+        import_users = __getattr__("import_users")
+
+        self.assertIs(
+            import_users, sys.modules["src.facades.import_users"].import_users
+        )
+        self.assertIs(sys.modules["src.facades"].import_users, import_users)
+
+    def test_rejects_names_it_does_not_export(self):
+        __getattr__ = lazy_submodules("src.facades", ["import_users"])
+
+        with self.assertRaises(AttributeError):
+            __getattr__("reconcile_users")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,31 @@
-from .register_unverified_user import register_unverified_user
-from .is_contact_in_use import is_contact_in_use
-from .set_user_as_verified import set_user_as_verified
+from typing import TYPE_CHECKING
+
+from src.lazy_imports import lazy_submodules
+
+if TYPE_CHECKING:
+    from .register_unverified_user import register_unverified_user
+    from .is_contact_in_use import is_contact_in_use
+    from .set_user_as_verified import set_user_as_verified
+    from .list_unconfirmed_users import list_unconfirmed_users
+    from .list_verified_contacts import list_verified_contacts
+    from .sign_up_user import sign_up_user
+    from .scan_users import scan_users
+    from .list_pool_users import list_pool_users
+    from .release_contact_claims import release_contact_claims
+    from .write_imported_user import write_imported_user
 
 __all__ = [
     "register_unverified_user",
     "is_contact_in_use",
     "set_user_as_verified",
+    "list_unconfirmed_users",
+    "list_verified_contacts",
+    "sign_up_user",
+    "scan_users",
+    "list_pool_users",
+    "release_contact_claims",
+    "write_imported_user",
 ]
+
+
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -0,0 +1,68 @@
+import re
+
+from botocore.exceptions import ClientError
+from typing import Literal, Mapping, Optional
+
+ContactAttributes = Literal["email", "phone_number"]
+
+CONTACT_ATTRIBUTES: tuple[ContactAttributes, ...] = ("email", "phone_number")
+
+VERIFIED_ATTRIBUTE_MAP: dict[ContactAttributes, str] = {
+    "email": "email_verified",
+    "phone_number": "phone_number_verified",
+}
+
+_PHONE_NUMBER_NOISE = re.compile(r"[^\d+]")
+
+
+def normalize_contact_value(
+    attribute_name: ContactAttributes, attribute_value: str
+) -> str:
+    value = attribute_value.strip()
+    if attribute_name == "email":
+        return value.lower()
+    return _PHONE_NUMBER_NOISE.sub("", value)
+
+
+def build_contact_key(
+    attribute_name: ContactAttributes, attribute_value: str
+) -> str:
+    return (
+        f"{attribute_name}#"
+        f"{normalize_contact_value(attribute_name, attribute_value)}"
+    )
+
+
+def extract_contact_keys(
+    user_attributes: Optional[Mapping[str, str]],
+    verified_only: bool = False,
+) -> list[str]:
+    user_attributes = user_attributes or {}
+    contact_keys: list[str] = []
+
+    for attribute_name in CONTACT_ATTRIBUTES:
+        attribute_value = user_attributes.get(attribute_name)
+        if not attribute_value:
+            continue
+        if verified_only and (
+            user_attributes.get(
+                VERIFIED_ATTRIBUTE_MAP[attribute_name], ""
+            ).lower()
+            != "true"
+        ):
+            continue
+        contact_keys.append(build_contact_key(attribute_name, attribute_value))
+
+    return contact_keys
+
+
+def is_contact_claim_rejected(exc: ClientError) -> bool:
+    if exc.response.get("Error", {}).get("Code") != (
+        "TransactionCanceledException"
+    ):
+        return False
+    reasons = exc.response.get("CancellationReasons") or []
+    # The first transaction item is the user record, the rest are claims.
+    return any(
+        reason.get("Code") == "ConditionalCheckFailed" for reason in reasons[1:]
+    )
@@ -0,0 +1,44 @@
+import unittest
+
+from src.services.user.contact_index import (
+    build_contact_key,
+    extract_contact_keys,
+)
+
+
+class ContactIndexTests(unittest.TestCase):
+    def test_build_contact_key_normalizes_email(self):
+        self.assertEqual(
+            build_contact_key("email", "  User@Example.COM "),
+            "email#user@example.com",
+        )
+
+    def test_build_contact_key_normalizes_phone_number(self):
+        self.assertEqual(
+            build_contact_key("phone_number", "+1 (555) 555-0123"),
+            "phone_number#+15555550123",
+        )
+
+    def test_extract_contact_keys_skips_missing_contacts(self):
+        self.assertEqual(
+            extract_contact_keys({"email": "user@example.com"}),
+            ["email#user@example.com"],
+        )
+        self.assertEqual(extract_contact_keys(None), [])
+
+    def test_extract_contact_keys_only_verified(self):
+        keys = extract_contact_keys(
+            {
+                "email": "user@example.com",
+                "email_verified": "true",
+                "phone_number": "+15555550123",
+                "phone_number_verified": "false",
+            },
+            verified_only=True,
+        )
+
+        self.assertEqual(keys, ["email#user@example.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,51 +1,102 @@
-from typing import Literal, Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional
 
 from botocore.exceptions import BotoCoreError, ClientError
-from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
 
-import src.adapters.aws as aws_adapter
+import src.adapters.metrics as metrics_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.services.user.contact_index import ContactAttributes, build_contact_key
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+    from mypy_boto3_dynamodb.type_defs import GetItemOutputTypeDef
+
+    from src.adapters.aws_async import AsyncClient
+    from src.adapters.bloom_filter import BloomFilter
 
-ContactAttributes = Literal["email", "phone_number"]
 
-_VerifiedAttributeMap: dict[ContactAttributes, str] = {
-    "email": "email_verified",
-    "phone_number": "phone_number_verified",
-}
+def _lookup_request(
+    contacts_table_name: str, contact_key: str
+) -> dict[str, Any]:
+    return {
+        "TableName": contacts_table_name,
+        "Key": {"contact": {"S": contact_key}},
+        "ProjectionExpression": "verified",
+    }
+
+
+def _is_definitely_unused(
+    contact_filter: Optional[BloomFilter], contact_key: str
+) -> bool:
+    # Verified contacts are never missing from the filter when it is built,
+    # and the claim written at registration still rejects any contact
+    # verified after the snapshot was taken.
+    return contact_filter is not None and contact_key not in contact_filter
+
+
+def _lookup_error(exc: Exception, deadline: Deadline) -> ValueError:
+    deadline.ensure_time_left()
+    return ValueError(
+        "Unable to validate contact information. Please try again."
+    )
+
+
+def _is_verified(response: GetItemOutputTypeDef) -> bool:
+    verified = response.get("Item", {}).get("verified", {})
+    return bool(verified.get("BOOL", False))
 
 
 def is_contact_in_use(
-    cognito_client: CognitoIdentityProviderClient,
-    user_pool_id: str,
+    dynamodb_client: DynamoDBClient,
+    contacts_table_name: str,
+    attribute_name: ContactAttributes,
+    attribute_value: Optional[str],
+    deadline: Deadline = NO_DEADLINE,
+    contact_filter: Optional[BloomFilter] = None,
+) -> bool:
+    if not attribute_value:
+        return False
+
+    contact_key = build_contact_key(attribute_name, attribute_value)
+    if _is_definitely_unused(contact_filter, contact_key):
+        return False
+
+    request = _lookup_request(contacts_table_name, contact_key)
+    deadline.ensure_time_left()
+    try:
+        with metrics_adapter.span("is_contact_in_use") as span:
+            response = dynamodb_client.get_item(**request)
+            span.record_response(response)
+    except (BotoCoreError, ClientError) as exc:
+        raise _lookup_error(exc, deadline) from exc
+
+    return _is_verified(response)
+
+
+async def is_contact_in_use_async(
+    dynamodb_client: AsyncClient,
+    contacts_table_name: str,
     attribute_name: ContactAttributes,
     attribute_value: Optional[str],
+    deadline: Deadline = NO_DEADLINE,
+    contact_filter: Optional[BloomFilter] = None,
 ) -> bool:
     if not attribute_value:
         return False
 
-    pagination_token: Optional[str] = None
+    contact_key = build_contact_key(attribute_name, attribute_value)
+    if _is_definitely_unused(contact_filter, contact_key):
+        return False
+
+    request = _lookup_request(contacts_table_name, contact_key)
+    deadline.ensure_time_left()
     try:
-        while True:
-            params = {
-                "UserPoolId": user_pool_id,
-                "Filter": f'{attribute_name} = "{attribute_value}"',
-                "Limit": 60,
-            }
-            if pagination_token:
-                params["PaginationToken"] = pagination_token
-
-            response = cognito_client.list_users(**params)
-            for user in response.get("Users", []):
-                if aws_adapter.is_user_attributed_verified(
-                    user, _VerifiedAttributeMap[attribute_name]
-                ):
-                    return True
-
-            pagination_token = response.get("PaginationToken")
-            if not pagination_token:
-                break
+        with metrics_adapter.span("is_contact_in_use") as span:
+            response = await dynamodb_client.get_item(**request)
+            span.record_response(response)
     except (BotoCoreError, ClientError) as exc:
-        raise ValueError(
-            "Unable to validate contact information. Please try again."
-        ) from exc
+        raise _lookup_error(exc, deadline) from exc
 
-    return False
+    return _is_verified(response)
@@ -1,70 +1,116 @@
 import unittest
 from unittest.mock import MagicMock
 
+from botocore.exceptions import ClientError
+
+from src.adapters.bloom_filter import BloomFilter
 from src.services.user.is_contact_in_use import is_contact_in_use
 
 
 class IsContactInUseTests(unittest.TestCase):
-    def test_returns_true_when_verified_user_found(self):
+    def test_returns_true_when_verified_contact_found(self):
         client = MagicMock()
-        client.list_users.side_effect = [
-            {
-                "Users": [
-                    {
-                        "Attributes": [
-                            {"Name": "email_verified", "Value": "true"}
-                        ]
-                    }
-                ]
-            }
-        ]
+        client.get_item.return_value = {"Item": {"verified": {"BOOL": True}}}
 
         result = is_contact_in_use(
-            cognito_client=client,
-            user_pool_id="pool",
+            dynamodb_client=client,
+            contacts_table_name="contacts-table",
             attribute_name="email",
-            attribute_value="user@example.com",
+            attribute_value=" User@Example.com ",
         )
 
         self.assertTrue(result)
-        client.list_users.assert_called_once()
+        client.get_item.assert_called_once_with(
+            TableName="contacts-table",
+            Key={"contact": {"S": "email#user@example.com"}},
+            ProjectionExpression="verified",
+        )
+
+    def test_returns_false_when_contact_is_only_claimed(self):
+        client = MagicMock()
+        client.get_item.return_value = {"Item": {"verified": {"BOOL": False}}}
+
+        result = is_contact_in_use(
+            dynamodb_client=client,
+            contacts_table_name="contacts-table",
+            attribute_name="phone_number",
+            attribute_value="+1 (555) 555-0123",
+        )
 
-    def test_returns_false_after_pagination_with_no_verified_users(self):
+        self.assertFalse(result)
+        _, kwargs = client.get_item.call_args
+        self.assertEqual(
+            kwargs["Key"], {"contact": {"S": "phone_number#+15555550123"}}
+        )
+
+    def test_returns_false_when_contact_not_indexed(self):
         client = MagicMock()
-        client.list_users.side_effect = [
-            {
-                "Users": [
-                    {
-                        "Attributes": [
-                            {"Name": "email_verified", "Value": "false"}
-                        ]
-                    }
-                ],
-                "PaginationToken": "next",
-            },
-            {"Users": []},
-        ]
+        client.get_item.return_value = {}
 
         result = is_contact_in_use(
-            cognito_client=client,
-            user_pool_id="pool",
+            dynamodb_client=client,
+            contacts_table_name="contacts-table",
             attribute_name="email",
             attribute_value="user@example.com",
         )
 
         self.assertFalse(result)
-        self.assertEqual(client.list_users.call_count, 2)
 
     def test_returns_false_when_no_attribute_value(self):
         client = MagicMock()
         result = is_contact_in_use(
-            cognito_client=client,
-            user_pool_id="pool",
+            dynamodb_client=client,
+            contacts_table_name="contacts-table",
             attribute_name="email",
             attribute_value=None,
         )
         self.assertFalse(result)
-        client.list_users.assert_not_called()
+        client.get_item.assert_not_called()
+
+    def test_raises_value_error_when_lookup_fails(self):
+        client = MagicMock()
+        client.get_item.side_effect = ClientError(
+            {"Error": {"Code": "Error", "Message": "boom"}}, "GetItem"
+        )
+
+        with self.assertRaisesRegex(ValueError, "Unable to validate contact"):
+            is_contact_in_use(
+                dynamodb_client=client,
+                contacts_table_name="contacts-table",
+                attribute_name="email",
+                attribute_value="user@example.com",
+            )
+
+    def test_filter_miss_skips_lookup(self):
+        client = MagicMock()
+
+        result = is_contact_in_use(
+            dynamodb_client=client,
+            contacts_table_name="contacts-table",
+            attribute_name="email",
+            attribute_value="new@example.com",
+            contact_filter=BloomFilter.for_capacity(100, 0.01),
+        )
+
+        self.assertFalse(result)
+        client.get_item.assert_not_called()
+
+    def test_filter_hit_falls_back_to_lookup(self):
+        client = MagicMock()
+        client.get_item.return_value = {"Item": {"verified": {"BOOL": True}}}
+        contact_filter = BloomFilter.for_capacity(100, 0.01)
+        contact_filter.add("email#user@example.com")
+
+        result = is_contact_in_use(
+            dynamodb_client=client,
+            contacts_table_name="contacts-table",
+            attribute_name="email",
+            attribute_value="User@Example.com",
+            contact_filter=contact_filter,
+        )
+
+        self.assertTrue(result)
+        client.get_item.assert_called_once()
 
 
 if __name__ == "__main__":
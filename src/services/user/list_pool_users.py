@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+
+from src.adapters.aws import CognitoUser
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.services.user.list_unconfirmed_users import LIST_USERS_PAGE_SIZE
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+
+
+def list_pool_users(
+    cognito_client: CognitoIdentityProviderClient,
+    user_pool_id: str,
+    attributes_to_get: Sequence[str] = (),
+    deadline: Deadline = NO_DEADLINE,
+) -> Iterator[CognitoUser]:
+    rate_limiter = rate_limits_adapter.get_rate_limiter(
+        rate_limits_adapter.COGNITO_USER_LIST
+    )
+    request: dict[str, Any] = {
+        "UserPoolId": user_pool_id,
+        "Limit": LIST_USERS_PAGE_SIZE,
+        "AttributesToGet": list(attributes_to_get),
+    }
+    while True:
+        try:
+            with metrics_adapter.span("list_pool_users") as span:
+                response = rate_limiter.call(
+                    partial(cognito_client.list_users, **request), deadline
+                )
+                span.record_response(response)
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError("Unable to list pool users.") from exc
+
+        for user in response.get("Users", []):
+            yield CognitoUser.from_user(user)
+
+        pagination_token = response.get("PaginationToken")
+        if not pagination_token:
+            return
+        request["PaginationToken"] = pagination_token
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+
+from src.adapters.aws import CognitoUser
+from src.adapters.deadline import NO_DEADLINE, Deadline
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+
+UNCONFIRMED_USERS_FILTER = 'cognito:user_status = "UNCONFIRMED"'
+# Largest page ListUsers returns.
+LIST_USERS_PAGE_SIZE = 60
+
+
+@dataclass(frozen=True)
+class UnconfirmedUsersPage:
+    # Token that fetched this page, so a page can be listed again.
+    pagination_token: Optional[str]
+    next_pagination_token: Optional[str]
+    users: List[CognitoUser] = field(default_factory=list)
+
+
+def list_unconfirmed_users(
+    cognito_client: CognitoIdentityProviderClient,
+    user_pool_id: str,
+    pagination_token: Optional[str] = None,
+    deadline: Deadline = NO_DEADLINE,
+) -> Iterator[UnconfirmedUsersPage]:
+    rate_limiter = rate_limits_adapter.get_rate_limiter(
+        rate_limits_adapter.COGNITO_USER_LIST
+    )
+    while True:
+        request: dict[str, Any] = {
+            "UserPoolId": user_pool_id,
+            "Filter": UNCONFIRMED_USERS_FILTER,
+            "Limit": LIST_USERS_PAGE_SIZE,
+            # Only usernames and dates are needed to pick users to delete.
+            "AttributesToGet": [],
+        }
+        if pagination_token:
+            request["PaginationToken"] = pagination_token
+
+        try:
+            with metrics_adapter.span("list_unconfirmed_users") as span:
+                response = rate_limiter.call(
+                    partial(cognito_client.list_users, **request), deadline
+                )
+                span.record_response(response)
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError("Unable to list unconfirmed users.") from exc
+
+        next_pagination_token = response.get("PaginationToken")
+        yield UnconfirmedUsersPage(
+            pagination_token=pagination_token,
+            next_pagination_token=next_pagination_token,
+            # Views instead of the response dicts, so a page held by the
+            # caller does not keep the whole response alive.
+            users=[
+                CognitoUser.from_user(user)
+                for user in response.get("Users", [])
+            ],
+        )
+
+        if not next_pagination_token:
+            return
+        pagination_token = next_pagination_token
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from src.adapters.deadline import Deadline, DeadlineExceededError
+from src.services.user.list_unconfirmed_users import (
+    UNCONFIRMED_USERS_FILTER,
+    list_unconfirmed_users,
+)
+
+
+class ListUnconfirmedUsersTests(unittest.TestCase):
+    def test_streams_pages_until_last_token(self):
+        client = MagicMock()
+        client.list_users.side_effect = [
+            {"Users": [{"Username": "user-1"}], "PaginationToken": "page-2"},
+            {"Users": [{"Username": "user-2"}]},
+        ]
+
+        pages = list(list_unconfirmed_users(client, "pool-id"))
+
+        self.assertEqual(
+            [page.pagination_token for page in pages], [None, "page-2"]
+        )
+        self.assertEqual(
+            [page.next_pagination_token for page in pages], ["page-2", None]
+        )
+        self.assertEqual([user.username for user in pages[1].users], ["user-2"])
+        client.list_users.assert_any_call(
+            UserPoolId="pool-id",
+            Filter=UNCONFIRMED_USERS_FILTER,
+            Limit=60,
+            AttributesToGet=[],
+            PaginationToken="page-2",
+        )
+
+    def test_fetches_pages_lazily(self):
+        client = MagicMock()
+        client.list_users.return_value = {"Users": [], "PaginationToken": "t"}
+
+        pages = list_unconfirmed_users(client, "pool-id", "start")
+        next(pages)
+
+        client.list_users.assert_called_once()
+        self.assertEqual(
+            client.list_users.call_args.kwargs["PaginationToken"], "start"
+        )
+
+    def test_wraps_aws_errors(self):
+        client = MagicMock()
+        client.list_users.side_effect = ClientError(
+            {"Error": {"Code": "Error", "Message": "boom"}}, "ListUsers"
+        )
+
+        with self.assertRaises(ValueError):
+            next(list_unconfirmed_users(client, "pool-id"))
+
+    def test_stops_when_rate_limit_wait_passes_deadline(self):
+        client = MagicMock()
+        rate_limiter = MagicMock()
+        rate_limiter.call.side_effect = DeadlineExceededError()
+        deadline = Deadline(60_000)
+
+        with patch(
+            "src.adapters.rate_limits.get_rate_limiter",
+            return_value=rate_limiter,
+        ):
+            with self.assertRaises(DeadlineExceededError):
+                next(list_unconfirmed_users(client, "pool-id", None, deadline))
+
+        self.assertIs(rate_limiter.call.call_args.args[1], deadline)
+        client.list_users.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+
+def list_verified_contacts(
+    dynamodb_client: DynamoDBClient, contacts_table_name: str
+) -> Iterator[str]:
+    request: dict[str, Any] = {
+        "TableName": contacts_table_name,
+        "ProjectionExpression": "contact",
+        "FilterExpression": "verified = :true",
+        "ExpressionAttributeValues": {":true": {"BOOL": True}},
+    }
+    while True:
+        try:
+            with metrics_adapter.span("list_verified_contacts") as span:
+                response = dynamodb_client.scan(**request)
+                span.record_response(response)
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError("Unable to list verified contacts.") from exc
+
+        for item in response.get("Items", []):
+            contact = item.get("contact", {}).get("S")
+            if contact:
+                yield contact
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return
+        request["ExclusiveStartKey"] = last_evaluated_key
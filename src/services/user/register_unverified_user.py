@@ -1,13 +1,28 @@
+from __future__ import annotations
+
 from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
 
 from botocore.exceptions import BotoCoreError, ClientError
-from mypy_boto3_dynamodb import DynamoDBClient
+
+import src.adapters.metrics as metrics_adapter
 
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
     PreSignUpTriggerEvent,
 )
 
-from src.settings import UsersTableSettings
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.settings import ContactsTableSettings, UsersTableSettings
+from src.services.user.contact_index import (
+    extract_contact_keys,
+    is_contact_claim_rejected,
+)
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+    from src.adapters.aws_async import AsyncClient
 
 
 def _compute_expiration_ts(minutes: int, now: datetime | None = None) -> int:
@@ -15,33 +30,140 @@ def _compute_expiration_ts(minutes: int, now: datetime | None = None) -> int:
     return int((now + timedelta(minutes=minutes)).timestamp())
 
 
-def _build_user_record(user_id: str, ttl_minutes: int, now: datetime) -> dict:
+def _build_user_record(
+    user_id: str, ttl_minutes: Optional[int], now: datetime
+) -> dict:
+    record = {
+        "user_id": {"S": user_id},
+        "created_at": {"N": str(int(now.timestamp()))},
+    }
+    # Records without a TTL, such as imported users, never expire.
+    if ttl_minutes is not None:
+        record["expires_at"] = {
+            "N": str(_compute_expiration_ts(ttl_minutes, now))
+        }
+    return record
+
+
+def _build_contact_claim(
+    contact_key: str, user_id: str, ttl_minutes: int, now: datetime
+) -> dict:
     return {
+        "contact": {"S": contact_key},
         "user_id": {"S": user_id},
+        "verified": {"BOOL": False},
         "created_at": {"N": str(int(now.timestamp()))},
         "expires_at": {"N": str(_compute_expiration_ts(ttl_minutes, now))},
     }
 
 
-def register_unverified_user(
+def _is_user_already_registered(exc: ClientError) -> bool:
+    if exc.response.get("Error", {}).get("Code") != (
+        "TransactionCanceledException"
+    ):
+        return False
+    reasons = exc.response.get("CancellationReasons") or []
+    return bool(reasons) and reasons[0].get("Code") == "ConditionalCheckFailed"
+
+
+def _build_transact_items(
     event: PreSignUpTriggerEvent,
     users_table_settings: UsersTableSettings,
-    dynamodb_client: DynamoDBClient,
+    contacts_table_settings: ContactsTableSettings,
     now: datetime,
-) -> None:
+) -> list:
     user_id = event.request.user_attributes.get("sub") or event.user_name
     if not user_id:
         raise ValueError("User identifier is missing.")
 
-    item = _build_user_record(
-        user_id, users_table_settings.expire_unverified_users_minutes, now
+    ttl_minutes = users_table_settings.expire_unverified_users_minutes
+    item = _build_user_record(user_id, ttl_minutes, now)
+
+    transact_items: list = [
+        {
+            "Put": {
+                "TableName": users_table_settings.name,
+                "Item": item,
+                "ConditionExpression": "attribute_not_exists(user_id)",
+            }
+        }
+    ]
+    for contact_key in extract_contact_keys(event.request.user_attributes):
+        transact_items.append(
+            {
+                "Put": {
+                    "TableName": contacts_table_settings.name,
+                    "Item": _build_contact_claim(
+                        contact_key, user_id, ttl_minutes, now
+                    ),
+                    "ConditionExpression": (
+                        "attribute_not_exists(contact) OR verified = :false"
+                    ),
+                    "ExpressionAttributeValues": {":false": {"BOOL": False}},
+                }
+            }
+        )
+
+    return transact_items
+
+
+def _registration_error(
+    exc: Exception, deadline: Deadline
+) -> Optional[ValueError]:
+    if isinstance(exc, ClientError):
+        if is_contact_claim_rejected(exc):
+            return ContactInUseError()
+        if _is_user_already_registered(exc):
+            # User ids are unique, so the record was written by an earlier
+            # attempt of this sign-up, together with its contact claims.
+            return None
+    deadline.ensure_time_left()
+    return ValueError("Unable to register user record.")
+
+
+def register_unverified_user(
+    event: PreSignUpTriggerEvent,
+    users_table_settings: UsersTableSettings,
+    contacts_table_settings: ContactsTableSettings,
+    dynamodb_client: DynamoDBClient,
+    now: datetime,
+    deadline: Deadline = NO_DEADLINE,
+) -> None:
+    transact_items = _build_transact_items(
+        event, users_table_settings, contacts_table_settings, now
     )
+    deadline.ensure_time_left()
+    try:
+        with metrics_adapter.span("register_unverified_user") as span:
+            response = dynamodb_client.transact_write_items(
+                TransactItems=transact_items
+            )
+            span.record_response(response)
+    except (BotoCoreError, ClientError) as exc:
+        error = _registration_error(exc, deadline)
+        if error:
+            raise error from exc
+
 
+async def register_unverified_user_async(
+    event: PreSignUpTriggerEvent,
+    users_table_settings: UsersTableSettings,
+    contacts_table_settings: ContactsTableSettings,
+    dynamodb_client: AsyncClient,
+    now: datetime,
+    deadline: Deadline = NO_DEADLINE,
+) -> None:
+    transact_items = _build_transact_items(
+        event, users_table_settings, contacts_table_settings, now
+    )
+    deadline.ensure_time_left()
     try:
-        dynamodb_client.put_item(
-            TableName=users_table_settings.name,
-            Item=item,
-            ConditionExpression="attribute_not_exists(user_id)",
-        )
+        with metrics_adapter.span("register_unverified_user") as span:
+            response = await dynamodb_client.transact_write_items(
+                TransactItems=transact_items
+            )
+            span.record_response(response)
     except (BotoCoreError, ClientError) as exc:
-        raise ValueError("Unable to register user record.") from exc
+        error = _registration_error(exc, deadline)
+        if error:
+            raise error from exc
@@ -2,6 +2,8 @@ import unittest
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
 
+from botocore.exceptions import ClientError
+
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
     PreSignUpTriggerEvent,
 )
@@ -9,7 +11,8 @@ from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import
 from src.services.user.register_unverified_user import (
     register_unverified_user,
 )
-from src.settings import UsersTableSettings
+from src.settings import ContactsTableSettings, UsersTableSettings
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
 
 
 class RegisterUnverifiedUserTests(unittest.TestCase):
@@ -21,43 +24,105 @@ class RegisterUnverifiedUserTests(unittest.TestCase):
                 "request": {
                     "userAttributes": {
                         "sub": "user-123",
+                        "email": "User@Example.com",
                     }
                 },
                 "response": {},
             }
         )
 
-    def test_registers_user_with_epoch_fields(self):
-        dynamodb = MagicMock()
-        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
-
+    def _register(self, dynamodb, event=None, now=None):
         register_unverified_user(
-            event=self._event(),
+            event=event or self._event(),
             users_table_settings=UsersTableSettings(
                 name="users-table", expire_unverified_users_minutes=60
             ),
+            contacts_table_settings=ContactsTableSettings(
+                name="contacts-table"
+            ),
             dynamodb_client=dynamodb,
-            now=now,
+            now=now or datetime.now(timezone.utc),
         )
 
-        args, kwargs = dynamodb.put_item.call_args
-        item = kwargs["Item"]
+    def test_registers_user_with_epoch_fields(self):
+        dynamodb = MagicMock()
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        self._register(dynamodb, now=now)
+
+        args, kwargs = dynamodb.transact_write_items.call_args
+        put = kwargs["TransactItems"][0]["Put"]
+        item = put["Item"]
+        self.assertEqual(put["TableName"], "users-table")
         self.assertEqual(item["user_id"]["S"], "user-123")
         self.assertEqual(item["created_at"]["N"], str(int(now.timestamp())))
         self.assertTrue(item["expires_at"]["N"].isdigit())
 
+    def test_claims_contacts_in_same_transaction(self):
+        dynamodb = MagicMock()
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        self._register(dynamodb, now=now)
+
+        args, kwargs = dynamodb.transact_write_items.call_args
+        self.assertEqual(len(kwargs["TransactItems"]), 2)
+        claim = kwargs["TransactItems"][1]["Put"]
+        self.assertEqual(claim["TableName"], "contacts-table")
+        self.assertEqual(
+            claim["Item"]["contact"], {"S": "email#user@example.com"}
+        )
+        self.assertEqual(claim["Item"]["user_id"], {"S": "user-123"})
+        self.assertEqual(claim["Item"]["verified"], {"BOOL": False})
+        self.assertIn("verified = :false", claim["ConditionExpression"])
+
+    def test_rejected_contact_claim_raises_contact_in_use(self):
+        dynamodb = MagicMock()
+        dynamodb.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+
+        with self.assertRaises(ContactInUseError):
+            self._register(dynamodb)
+
+    def test_existing_user_record_is_treated_as_registered(self):
+        dynamodb = MagicMock()
+        dynamodb.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "ConditionalCheckFailed"},
+                    {"Code": "None"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+
+        self._register(dynamodb)
+
+        dynamodb.transact_write_items.assert_called_once()
+
+    def test_failed_transaction_raises_value_error(self):
+        dynamodb = MagicMock()
+        dynamodb.transact_write_items.side_effect = ClientError(
+            {"Error": {"Code": "InternalServerError"}},
+            "TransactWriteItems",
+        )
+
+        with self.assertRaisesRegex(ValueError, "Unable to register user"):
+            self._register(dynamodb)
+
     def test_missing_user_id_raises(self):
         event = self._event(username="")
         event.request.user_attributes.pop("sub")
         with self.assertRaises(ValueError):
-            register_unverified_user(
-                event=event,
-                users_table_settings=UsersTableSettings(
-                    name="users-table", expire_unverified_users_minutes=60
-                ),
-                dynamodb_client=MagicMock(),
-                now=datetime.now(timezone.utc),
-            )
+            self._register(MagicMock(), event=event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+
+def _release_error(deadline: Deadline) -> ValueError:
+    deadline.ensure_time_left()
+    return ValueError("Unable to release contact claims.")
+
+
+def _claimed_contacts(
+    dynamodb_client: DynamoDBClient,
+    contacts_table_name: str,
+    user_id_index_name: str,
+    user_id: str,
+    deadline: Deadline,
+) -> Iterator[str]:
+    request: dict[str, Any] = {
+        "TableName": contacts_table_name,
+        "IndexName": user_id_index_name,
+        "KeyConditionExpression": "user_id = :user_id",
+        "ExpressionAttributeValues": {":user_id": {"S": user_id}},
+        "ProjectionExpression": "contact",
+    }
+    while True:
+        deadline.ensure_time_left()
+        try:
+            with metrics_adapter.span("query_contact_claims") as span:
+                response = dynamodb_client.query(**request)
+                span.record_response(response)
+        except (BotoCoreError, ClientError) as exc:
+            raise _release_error(deadline) from exc
+
+        for item in response.get("Items", []):
+            contact = item.get("contact", {}).get("S")
+            if contact:
+                yield contact
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return
+        request["ExclusiveStartKey"] = last_evaluated_key
+
+
+def release_contact_claims(
+    dynamodb_client: DynamoDBClient,
+    contacts_table_name: str,
+    user_id_index_name: str,
+    user_id: str,
+    deadline: Deadline = NO_DEADLINE,
+) -> int:
+    released = 0
+    for contact in _claimed_contacts(
+        dynamodb_client,
+        contacts_table_name,
+        user_id_index_name,
+        user_id,
+        deadline,
+    ):
+        deadline.ensure_time_left()
+        try:
+            with metrics_adapter.span("release_contact_claim") as span:
+                response = dynamodb_client.delete_item(
+                    TableName=contacts_table_name,
+                    Key={"contact": {"S": contact}},
+                    # The index lags behind the table, a contact it still
+                    # lists may already be claimed by a newer owner.
+                    ConditionExpression="user_id = :user_id",
+                    ExpressionAttributeValues={":user_id": {"S": user_id}},
+                )
+                span.record_response(response)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") == (
+                "ConditionalCheckFailedException"
+            ):
+                continue
+            raise _release_error(deadline) from exc
+        except BotoCoreError as exc:
+            raise _release_error(deadline) from exc
+        released += 1
+    return released
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+
+def scan_users(
+    dynamodb_client: DynamoDBClient,
+    users_table_name: str,
+    segment: int = 0,
+    total_segments: int = 1,
+) -> Iterator[dict[str, Any]]:
+    request: dict[str, Any] = {
+        "TableName": users_table_name,
+        "ProjectionExpression": "user_id, verified_at",
+        "Segment": segment,
+        "TotalSegments": total_segments,
+    }
+    while True:
+        try:
+            with metrics_adapter.span("scan_users") as span:
+                response = dynamodb_client.scan(**request)
+                span.record_response(response)
+        except (BotoCoreError, ClientError) as exc:
+            raise ValueError("Unable to scan users.") from exc
+
+        yield from response.get("Items", [])
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return
+        request["ExclusiveStartKey"] = last_evaluated_key
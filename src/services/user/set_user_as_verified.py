@@ -1,5 +1,75 @@
+from __future__ import annotations
+
 from datetime import datetime
-from mypy_boto3_dynamodb import DynamoDBClient
+from typing import TYPE_CHECKING, Iterable
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.services.user.contact_index import is_contact_claim_rejected
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+    from src.adapters.aws_async import AsyncClient
+
+
+def _build_transact_items(
+    user_table_name: str,
+    user_id: str,
+    now: datetime,
+    contacts_table_name: str,
+    verified_contact_keys: Iterable[str],
+) -> list:
+    verified_at = {"N": str(int(now.timestamp()))}
+
+    transact_items: list = [
+        {
+            "Update": {
+                "TableName": user_table_name,
+                "Key": {"user_id": {"S": user_id}},
+                "UpdateExpression": (
+                    "SET verified_at = :verified_at REMOVE expires_at"
+                ),
+                "ExpressionAttributeValues": {":verified_at": verified_at},
+            }
+        }
+    ]
+    for contact_key in verified_contact_keys:
+        transact_items.append(
+            {
+                "Update": {
+                    "TableName": contacts_table_name,
+                    "Key": {"contact": {"S": contact_key}},
+                    "UpdateExpression": (
+                        "SET user_id = :user_id, verified = :true, "
+                        "verified_at = :verified_at REMOVE expires_at"
+                    ),
+                    "ConditionExpression": (
+                        "attribute_not_exists(contact) OR verified = :false "
+                        "OR user_id = :user_id"
+                    ),
+                    "ExpressionAttributeValues": {
+                        ":user_id": {"S": user_id},
+                        ":true": {"BOOL": True},
+                        ":false": {"BOOL": False},
+                        ":verified_at": verified_at,
+                    },
+                }
+            }
+        )
+
+    return transact_items
+
+
+def _verification_error(exc: Exception, deadline: Deadline) -> ValueError:
+    if isinstance(exc, ClientError) and is_contact_claim_rejected(exc):
+        return ContactInUseError()
+    deadline.ensure_time_left()
+    return ValueError("Unable to set user as verified.")
 
 
 def set_user_as_verified(
@@ -7,12 +77,50 @@ def set_user_as_verified(
     user_table_name: str,
     user_id: str,
     now: datetime,
+    contacts_table_name: str,
+    verified_contact_keys: Iterable[str] = (),
+    deadline: Deadline = NO_DEADLINE,
+):
+    transact_items = _build_transact_items(
+        user_table_name,
+        user_id,
+        now,
+        contacts_table_name,
+        verified_contact_keys,
+    )
+    deadline.ensure_time_left()
+    try:
+        with metrics_adapter.span("set_user_as_verified") as span:
+            response = dynamodb_client.transact_write_items(
+                TransactItems=transact_items
+            )
+            span.record_response(response)
+    except (BotoCoreError, ClientError) as exc:
+        raise _verification_error(exc, deadline) from exc
+
+
+async def set_user_as_verified_async(
+    dynamodb_client: AsyncClient,
+    user_table_name: str,
+    user_id: str,
+    now: datetime,
+    contacts_table_name: str,
+    verified_contact_keys: Iterable[str] = (),
+    deadline: Deadline = NO_DEADLINE,
 ):
-    dynamodb_client.update_item(
-        TableName=user_table_name,
-        Key={"user_id": {"S": user_id}},
-        UpdateExpression="SET verified_at = :verified_at REMOVE expires_at",
-        ExpressionAttributeValues={
-            ":verified_at": {"N": str(int(now.timestamp()))}
-        },
+    transact_items = _build_transact_items(
+        user_table_name,
+        user_id,
+        now,
+        contacts_table_name,
+        verified_contact_keys,
     )
+    deadline.ensure_time_left()
+    try:
+        with metrics_adapter.span("set_user_as_verified") as span:
+            response = await dynamodb_client.transact_write_items(
+                TransactItems=transact_items
+            )
+            span.record_response(response)
+    except (BotoCoreError, ClientError) as exc:
+        raise _verification_error(exc, deadline) from exc
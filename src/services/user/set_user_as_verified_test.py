@@ -2,7 +2,10 @@ import unittest
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
 
+from botocore.exceptions import ClientError
+
 from src.services.user.set_user_as_verified import set_user_as_verified
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
 
 
 class SetUserAsVerifiedTests(unittest.TestCase):
@@ -15,16 +18,67 @@ class SetUserAsVerifiedTests(unittest.TestCase):
             user_table_name="users-table",
             user_id="user-123",
             now=now,
+            contacts_table_name="contacts-table",
         )
 
-        dynamodb.update_item.assert_called_once()
-        args, kwargs = dynamodb.update_item.call_args
-        self.assertEqual(kwargs["Key"], {"user_id": {"S": "user-123"}})
+        dynamodb.transact_write_items.assert_called_once()
+        args, kwargs = dynamodb.transact_write_items.call_args
+        self.assertEqual(len(kwargs["TransactItems"]), 1)
+        update = kwargs["TransactItems"][0]["Update"]
+        self.assertEqual(update["Key"], {"user_id": {"S": "user-123"}})
         self.assertEqual(
-            kwargs["ExpressionAttributeValues"],
+            update["ExpressionAttributeValues"],
             {":verified_at": {"N": str(int(now.timestamp()))}},
         )
-        self.assertIn("REMOVE expires_at", kwargs["UpdateExpression"])
+        self.assertIn("REMOVE expires_at", update["UpdateExpression"])
+
+    def test_marks_verified_contacts_in_same_transaction(self):
+        dynamodb = MagicMock()
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        set_user_as_verified(
+            dynamodb_client=dynamodb,
+            user_table_name="users-table",
+            user_id="user-123",
+            now=now,
+            contacts_table_name="contacts-table",
+            verified_contact_keys=["email#user@example.com"],
+        )
+
+        args, kwargs = dynamodb.transact_write_items.call_args
+        update = kwargs["TransactItems"][1]["Update"]
+        self.assertEqual(update["TableName"], "contacts-table")
+        self.assertEqual(
+            update["Key"], {"contact": {"S": "email#user@example.com"}}
+        )
+        self.assertEqual(
+            update["ExpressionAttributeValues"][":user_id"],
+            {"S": "user-123"},
+        )
+        self.assertIn("verified = :true", update["UpdateExpression"])
+
+    def test_contact_verified_by_other_user_raises(self):
+        dynamodb = MagicMock()
+        dynamodb.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+
+        with self.assertRaises(ContactInUseError):
+            set_user_as_verified(
+                dynamodb_client=dynamodb,
+                user_table_name="users-table",
+                user_id="user-123",
+                now=datetime.now(timezone.utc),
+                contacts_table_name="contacts-table",
+                verified_contact_keys=["email#user@example.com"],
+            )
 
 
 if __name__ == "__main__":
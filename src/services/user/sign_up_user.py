@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import uuid
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+import src.adapters.rate_limits as rate_limits_adapter
+
+from src.adapters.deadline import NO_DEADLINE, Deadline
+from src.dto.sign_up import SignUpRequest
+
+if TYPE_CHECKING:
+    from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
+    from mypy_boto3_cognito_idp.type_defs import AttributeTypeTypeDef
+
+
+class SignUpRejectedError(ValueError):
+    def __init__(self, reason: str):
+        super().__init__(reason or "Sign up was rejected.")
+
+
+class InvalidPasswordError(ValueError):
+    def __init__(self):
+        super().__init__("Password does not meet the password policy.")
+
+
+class SignUpThrottledError(ValueError):
+    def __init__(self):
+        super().__init__("Too many sign up attempts. Please try again later.")
+
+
+@dataclass(frozen=True)
+class SignUpResult:
+    user_id: str
+    user_confirmed: bool
+
+
+# Prefix Cognito adds to the message of a pre sign-up trigger error.
+_TRIGGER_ERROR_PREFIX = "PreSignUp failed with error "
+
+
+def _trigger_rejection_reason(exc: ClientError) -> str:
+    message = exc.response.get("Error", {}).get("Message", "")
+    if message.startswith(_TRIGGER_ERROR_PREFIX):
+        message = message[len(_TRIGGER_ERROR_PREFIX) :]
+    return message.rstrip(".") + "." if message else ""
+
+
+def sign_up_user(
+    cognito_client: CognitoIdentityProviderClient,
+    client_id: str,
+    request: SignUpRequest,
+    deadline: Deadline = NO_DEADLINE,
+) -> SignUpResult:
+    user_attributes: list[AttributeTypeTypeDef] = [
+        {"Name": "email", "Value": request.email}
+    ]
+    if request.phone_number:
+        user_attributes.append(
+            {"Name": "phone_number", "Value": request.phone_number}
+        )
+
+    # The username is picked once, so a throttled attempt is retried as the
+    # same sign up.
+    username = str(uuid.uuid4())
+    rate_limiter = rate_limits_adapter.get_rate_limiter(
+        rate_limits_adapter.COGNITO_USER_CREATION
+    )
+
+    deadline.ensure_time_left()
+    try:
+        with metrics_adapter.span("sign_up_user") as span:
+            response = rate_limiter.call(
+                lambda: cognito_client.sign_up(
+                    ClientId=client_id,
+                    # The pre sign-up trigger only accepts UUIDv4 usernames.
+                    Username=username,
+                    Password=request.password,
+                    UserAttributes=user_attributes,
+                    ValidationData=[
+                        {
+                            "Name": "reCaptchaToken",
+                            "Value": request.recaptcha_token,
+                        }
+                    ],
+                ),
+                deadline,
+            )
+            span.record_response(response)
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code")
+        if code == "UserLambdaValidationException":
+            raise SignUpRejectedError(_trigger_rejection_reason(exc)) from exc
+        if code == "InvalidPasswordException":
+            raise InvalidPasswordError() from exc
+        if code in ("TooManyRequestsException", "LimitExceededException"):
+            raise SignUpThrottledError() from exc
+        deadline.ensure_time_left()
+        raise ValueError("Unable to sign up user.") from exc
+    except BotoCoreError as exc:
+        deadline.ensure_time_left()
+        raise ValueError("Unable to sign up user.") from exc
+
+    return SignUpResult(
+        user_id=response["UserSub"],
+        user_confirmed=response.get("UserConfirmed", False),
+    )
@@ -0,0 +1,136 @@
+import unittest
+import uuid
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from src.adapters.deadline import Deadline, DeadlineExceededError
+from src.adapters.rate_limits import (
+    COGNITO_USER_CREATION,
+    AdaptiveRateLimiter,
+)
+from src.dto.sign_up import SignUpRequest
+from src.services.user.sign_up_user import (
+    InvalidPasswordError,
+    SignUpRejectedError,
+    SignUpThrottledError,
+    sign_up_user,
+)
+
+
+def _client_error(code, message="boom"):
+    return ClientError({"Error": {"Code": code, "Message": message}}, "SignUp")
+
+
+class SignUpUserTests(unittest.TestCase):
+    def setUp(self):
+        # Throttled attempts are retried without waiting.
+        self.rate_limiter = AdaptiveRateLimiter(
+            COGNITO_USER_CREATION,
+            1000.0,
+            sleep=lambda seconds: None,
+            jitter=lambda: 0.0,
+        )
+        patcher = patch(
+            "src.adapters.rate_limits.get_rate_limiter",
+            return_value=self.rate_limiter,
+        )
+        self.get_rate_limiter = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _request(self, **overrides):
+        values = {
+            "email": "user@example.com",
+            "password": "correct horse",
+            "reCaptchaToken": "token",
+            **overrides,
+        }
+        return SignUpRequest.model_validate(values)
+
+    def test_signs_up_with_uuid_username_and_recaptcha_token(self):
+        client = MagicMock()
+        client.sign_up.return_value = {
+            "UserSub": "sub-1",
+            "UserConfirmed": False,
+        }
+
+        result = sign_up_user(
+            client, "client-id", self._request(phoneNumber="+15555550123")
+        )
+
+        self.assertEqual(result.user_id, "sub-1")
+        self.assertFalse(result.user_confirmed)
+        kwargs = client.sign_up.call_args.kwargs
+        self.assertEqual(uuid.UUID(kwargs["Username"]).version, 4)
+        self.assertEqual(kwargs["ClientId"], "client-id")
+        self.assertEqual(kwargs["Password"], "correct horse")
+        self.assertEqual(
+            kwargs["UserAttributes"],
+            [
+                {"Name": "email", "Value": "user@example.com"},
+                {"Name": "phone_number", "Value": "+15555550123"},
+            ],
+        )
+        self.assertEqual(
+            kwargs["ValidationData"],
+            [{"Name": "reCaptchaToken", "Value": "token"}],
+        )
+
+    def test_reports_trigger_rejection_reason(self):
+        client = MagicMock()
+        client.sign_up.side_effect = _client_error(
+            "UserLambdaValidationException",
+            "PreSignUp failed with error Contact information is already in use.",
+        )
+
+        with self.assertRaises(SignUpRejectedError) as raised:
+            sign_up_user(client, "client-id", self._request())
+
+        self.assertEqual(
+            str(raised.exception), "Contact information is already in use."
+        )
+
+    def test_maps_cognito_errors(self):
+        cases = {
+            "InvalidPasswordException": InvalidPasswordError,
+            "TooManyRequestsException": SignUpThrottledError,
+            "InternalErrorException": ValueError,
+        }
+        for code, error_type in cases.items():
+            with self.subTest(code=code):
+                client = MagicMock()
+                client.sign_up.side_effect = _client_error(code)
+
+                with self.assertRaises(error_type):
+                    sign_up_user(client, "client-id", self._request())
+
+    def test_retries_throttled_sign_up_with_same_username(self):
+        client = MagicMock()
+        client.sign_up.side_effect = [
+            _client_error("TooManyRequestsException"),
+            {"UserSub": "sub-1", "UserConfirmed": False},
+        ]
+
+        result = sign_up_user(client, "client-id", self._request())
+
+        self.assertEqual(result.user_id, "sub-1")
+        self.get_rate_limiter.assert_called_once_with(COGNITO_USER_CREATION)
+        first, second = client.sign_up.call_args_list
+        self.assertEqual(first.kwargs["Username"], second.kwargs["Username"])
+        self.assertEqual(self.rate_limiter.usage().throttles, 1)
+
+    def test_gives_up_when_rate_limit_wait_passes_deadline(self):
+        client = MagicMock()
+        deadline = Deadline(60_000)
+        self.rate_limiter.acquire = MagicMock(
+            side_effect=DeadlineExceededError()
+        )
+
+        with self.assertRaises(DeadlineExceededError):
+            sign_up_user(client, "client-id", self._request(), deadline)
+
+        client.sign_up.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import random
+import time
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+import src.adapters.metrics as metrics_adapter
+
+from src.services.user.contact_index import is_contact_claim_rejected
+from src.services.user.register_unverified_user import (
+    _build_user_record,
+    _is_user_already_registered,
+)
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient
+
+MAX_WRITE_ATTEMPTS = 8
+BASE_BACKOFF_SECONDS = 0.05
+MAX_BACKOFF_SECONDS = 5.0
+RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "ThrottlingException",
+        "InternalServerError",
+    }
+)
+
+# Cancellation reasons of a transaction that may succeed when retried.
+RETRYABLE_CANCELLATION_CODES = frozenset(
+    {
+        "TransactionConflict",
+        "ProvisionedThroughputExceeded",
+        "ThrottlingError",
+    }
+)
+
+
+class UserAlreadyExistsError(ValueError):
+    def __init__(self):
+        super().__init__("User already exists.")
+
+
+def _build_transact_items(
+    users_table_name: str,
+    contacts_table_name: str,
+    user_id: str,
+    verified_contact_keys: Iterable[str],
+    job_id: str,
+    now: datetime,
+) -> list:
+    # Imported users already exist elsewhere, so they are stored verified
+    # and without the TTL of unverified sign ups.
+    verified_at = {"N": str(int(now.timestamp()))}
+    user_record = _build_user_record(user_id, None, now)
+    user_record["verified_at"] = verified_at
+    user_record["import_job_id"] = {"S": job_id}
+
+    transact_items: list = [
+        {
+            "Put": {
+                "TableName": users_table_name,
+                "Item": user_record,
+                # A resumed import rewrites the users of its last window.
+                "ConditionExpression": (
+                    "attribute_not_exists(user_id) OR import_job_id = :job_id"
+                ),
+                "ExpressionAttributeValues": {":job_id": {"S": job_id}},
+            }
+        }
+    ]
+    for contact_key in verified_contact_keys:
+        transact_items.append(
+            {
+                "Put": {
+                    "TableName": contacts_table_name,
+                    "Item": {
+                        "contact": {"S": contact_key},
+                        "user_id": {"S": user_id},
+                        "verified": {"BOOL": True},
+                        "verified_at": verified_at,
+                    },
+                    "ConditionExpression": (
+                        "attribute_not_exists(contact) OR verified = :false "
+                        "OR user_id = :user_id"
+                    ),
+                    "ExpressionAttributeValues": {
+                        ":user_id": {"S": user_id},
+                        ":false": {"BOOL": False},
+                    },
+                }
+            }
+        )
+
+    return transact_items
+
+
+def _is_retryable(exc: ClientError) -> bool:
+    code = exc.response.get("Error", {}).get("Code")
+    if code == "TransactionCanceledException":
+        return any(
+            reason.get("Code") in RETRYABLE_CANCELLATION_CODES
+            for reason in exc.response.get("CancellationReasons") or []
+        )
+    return code in RETRYABLE_ERROR_CODES
+
+
+def write_imported_user(
+    dynamodb_client: DynamoDBClient,
+    users_table_name: str,
+    contacts_table_name: str,
+    user_id: str,
+    verified_contact_keys: Iterable[str],
+    job_id: str,
+    now: datetime,
+    max_attempts: int = MAX_WRITE_ATTEMPTS,
+    sleep: Callable[[float], None] = time.sleep,
+    jitter: Callable[[], float] = random.random,
+) -> None:
+    # The user record and its contact claims are written together, so a
+    # user is never imported without its claims or over an existing one.
+    transact_items = _build_transact_items(
+        users_table_name,
+        contacts_table_name,
+        user_id,
+        verified_contact_keys,
+        job_id,
+        now,
+    )
+    last_error: Optional[Exception] = None
+    for attempt in range(max_attempts):
+        if attempt:
+            # Exponential backoff with full jitter.
+            sleep(
+                jitter()
+                * min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2**attempt)
+            )
+        try:
+            with metrics_adapter.span("write_imported_user") as span:
+                response = dynamodb_client.transact_write_items(
+                    TransactItems=transact_items
+                )
+                span.record_response(response)
+            return
+        except ClientError as exc:
+            if is_contact_claim_rejected(exc):
+                raise ContactInUseError() from exc
+            if _is_user_already_registered(exc):
+                raise UserAlreadyExistsError() from exc
+            if not _is_retryable(exc):
+                raise ValueError("Unable to write imported user.") from exc
+            last_error = exc
+        except BotoCoreError as exc:
+            last_error = exc
+    raise ValueError("Unable to write imported user.") from last_error
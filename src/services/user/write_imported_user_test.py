@@ -0,0 +1,105 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from src.services.user.write_imported_user import (
+    UserAlreadyExistsError,
+    write_imported_user,
+)
+from src.validators.enforce_user_contact_uniqueness import ContactInUseError
+
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+
+def _cancelled(*codes):
+    return ClientError(
+        {
+            "Error": {"Code": "TransactionCanceledException"},
+            "CancellationReasons": [{"Code": code} for code in codes],
+        },
+        "TransactWriteItems",
+    )
+
+
+class WriteImportedUserTests(unittest.TestCase):
+    def _write(self, client, **kwargs):
+        write_imported_user(
+            client,
+            "users",
+            "contacts",
+            "user-1",
+            ["email#user@example.com"],
+            "job-1",
+            NOW,
+            sleep=lambda seconds: None,
+            **kwargs,
+        )
+
+    def test_writes_user_and_claims_conditionally(self):
+        client = MagicMock()
+
+        self._write(client)
+
+        user_put, claim_put = [
+            item["Put"]
+            for item in client.transact_write_items.call_args.kwargs[
+                "TransactItems"
+            ]
+        ]
+        self.assertEqual(user_put["Item"]["import_job_id"], {"S": "job-1"})
+        self.assertEqual(
+            user_put["ConditionExpression"],
+            "attribute_not_exists(user_id) OR import_job_id = :job_id",
+        )
+        self.assertEqual(
+            claim_put["ConditionExpression"],
+            "attribute_not_exists(contact) OR verified = :false "
+            "OR user_id = :user_id",
+        )
+        self.assertEqual(claim_put["Item"]["verified"], {"BOOL": True})
+
+    def test_rejects_contacts_claimed_by_other_users(self):
+        client = MagicMock()
+        client.transact_write_items.side_effect = _cancelled(
+            "None", "ConditionalCheckFailed"
+        )
+
+        with self.assertRaises(ContactInUseError):
+            self._write(client)
+        client.transact_write_items.assert_called_once()
+
+    def test_rejects_existing_users(self):
+        client = MagicMock()
+        client.transact_write_items.side_effect = _cancelled(
+            "ConditionalCheckFailed", "None"
+        )
+
+        with self.assertRaises(UserAlreadyExistsError):
+            self._write(client)
+
+    def test_retries_conflicting_transactions(self):
+        client = MagicMock()
+        client.transact_write_items.side_effect = [
+            _cancelled("TransactionConflict", "None"),
+            {},
+        ]
+
+        self._write(client)
+
+        self.assertEqual(client.transact_write_items.call_count, 2)
+
+    def test_gives_up_after_last_attempt(self):
+        client = MagicMock()
+        client.transact_write_items.side_effect = ClientError(
+            {"Error": {"Code": "ThrottlingException"}}, "TransactWriteItems"
+        )
+
+        with self.assertRaises(ValueError):
+            self._write(client, max_attempts=3)
+        self.assertEqual(client.transact_write_items.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,25 +1,54 @@
-from typing import Any, Optional, Annotated
-from annotated_types import Ge
+from typing import Any, Literal, Optional, Annotated
+from annotated_types import Ge, Gt, Le, Lt
 
-from saas_python_lib.settings import (
-    get_required_aws_ssm_parameter_value,
-    is_aws_session_token_available,
-)
+from saas_python_lib.settings import is_aws_session_token_available
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from pydantic_settings import (
     BaseSettings,
     SettingsConfigDict,
 )
 
+import src.adapters.ssm as ssm_adapter
+
+
+class AWSClientSettings(BaseSettings):
+    # Read on its own, the SSM client is needed before Settings is loaded.
+    model_config = SettingsConfigDict(
+        env_prefix="APP_AWS_CLIENTS__",
+        case_sensitive=False,
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    max_pool_connections: Annotated[int, Gt(0)] = 10
+    retry_mode: Literal["legacy", "standard", "adaptive"] = "standard"
+    max_attempts: Annotated[int, Gt(0)] = 3
+    connect_timeout_seconds: Annotated[float, Gt(0)] = 1.0
+    read_timeout_seconds: Annotated[float, Gt(0)] = 5.0
+    tcp_keepalive: bool = True
+    endpoint_urls: dict[str, str] = {}
+    warm_up: bool = False
+    warm_up_budget_seconds: Optional[Annotated[float, Gt(0)]] = None
+
 
 class ReCaptchaSettings(BaseModel):
     secret_key: str
+    verify_timeout_seconds: Annotated[float, Gt(0)] = 2.0
 
 
 class CleanUpSettings(BaseModel):
     user_pool_id: str
     grace_period_hours: Annotated[int, Ge(0)] = 24
+    max_workers: Annotated[int, Gt(0)] = 4
+
+
+class RateLimitSettings(BaseModel):
+    # Shares of the Cognito quotas this process may use, per second.
+    cognito_user_creation_per_second: Annotated[float, Gt(0)] = 50.0
+    cognito_user_list_per_second: Annotated[float, Gt(0)] = 30.0
+    cognito_user_update_per_second: Annotated[float, Gt(0)] = 25.0
 
 
 class UsersTableSettings(BaseModel):
@@ -27,13 +56,100 @@ class UsersTableSettings(BaseModel):
     expire_unverified_users_minutes: Annotated[int, Ge(0)] = 360
 
 
+class ContactsTableSettings(BaseModel):
+    name: str
+    # Global secondary index on user_id, used to release a user's claims.
+    user_id_index_name: str = "user_id-index"
+
+
+class ContactFilterSettings(BaseModel):
+    snapshot_bucket: str
+    snapshot_key: str = "contact-filter/snapshot.bin"
+    capacity: Annotated[int, Gt(0)] = 1_000_000
+    false_positive_rate: Annotated[float, Gt(0), Lt(1)] = 0.01
+    refresh_seconds: Annotated[float, Gt(0)] = 300.0
+
+
+class JobsTableSettings(BaseModel):
+    name: str
+
+
+class ReconciliationSettings(BaseModel):
+    total_segments: Annotated[int, Gt(0)] = 4
+    # Records held in memory per side before a sorted run is spilled.
+    spill_max_items: Annotated[int, Gt(0)] = 100_000
+    spill_directory: Optional[str] = None
+    orphan_grace_period_hours: Annotated[int, Ge(0)] = 24
+    repair: bool = False
+
+
+class UserImportSettings(BaseModel):
+    max_workers: Annotated[int, Gt(0)] = 8
+    max_write_attempts: Annotated[int, Gt(0)] = 8
+
+
+class IdempotencySettings(BaseModel):
+    table_name: str
+    expires_after_seconds: Annotated[int, Gt(0)] = 3600
+    local_cache_max_items: Annotated[int, Gt(0)] = 1024
+
+
+class SignUpApiSettings(BaseModel):
+    client_id: str
+    max_body_bytes: Annotated[int, Gt(0)] = 4096
+
+
 class UserPoolSettings(BaseModel):
     id: str
 
 
+class TenantRoutingSettings(BaseModel):
+    # Only the Cognito triggers are routed. The bus processor, the
+    # unconfirmed users sweep and the reconciliation still work on the
+    # pool and tables of this deployment, so routed pools need their own
+    # deployment of those to be cleaned up.
+
+    # SSM path holding one TenantPoolSettings JSON document per pool id.
+    parameter_prefix: str
+    max_cached_pools: Annotated[int, Gt(0)] = 64
+    refresh_seconds: Annotated[float, Gt(0)] = 300.0
+
+
+class TenantPoolSettings(BaseModel):
+    users_table: UsersTableSettings
+    contacts_table: ContactsTableSettings
+    # Tables in another region than the function get their own clients.
+    region_name: Optional[str] = None
+
+
 class PosthogSettings(BaseModel):
     api_key: str
     api_host: str = "https://app.posthog.com"
+    max_queue_size: Annotated[int, Gt(0)] = 1000
+    max_batch_size: Annotated[int, Gt(0)] = 100
+    send_timeout_seconds: Annotated[float, Gt(0)] = 2.0
+    # Longest a handler waits for its events to be sent before returning.
+    flush_timeout_seconds: Annotated[float, Ge(0)] = 0.5
+
+
+class MetricsSettings(BaseModel):
+    enabled: bool = False
+    namespace: str = "SaasUserManagement"
+    sample_rate: Annotated[float, Ge(0), Le(1)] = 1.0
+
+
+# Fields that hold an SSM parameter name until they are resolved.
+SSM_PARAMETER_FIELDS: tuple[tuple[str, str], ...] = (
+    ("recaptcha", "secret_key"),
+    ("cleanup", "user_pool_id"),
+    ("user_pool", "id"),
+    ("posthog", "api_key"),
+    ("posthog", "api_host"),
+)
+# Resolved values of these are never written to the local snapshot.
+SECRET_SSM_PARAMETER_FIELDS: frozenset[tuple[str, str]] = frozenset(
+    {("recaptcha", "secret_key"), ("posthog", "api_key")}
+)
 
 
 class Settings(BaseSettings):
@@ -45,38 +161,92 @@ class Settings(BaseSettings):
         env_nested_delimiter="__",
     )
 
+    _ssm_parameter_names: dict[tuple[str, str], str] = PrivateAttr(
+        default_factory=dict
+    )
+
     def model_post_init(self, __context: Any) -> None:
         if not is_aws_session_token_available():
             return
 
-        if self.recaptcha is not None:
-            self.recaptcha.secret_key = get_required_aws_ssm_parameter_value(
-                parameter_name=self.recaptcha.secret_key,
-            )
+        # Parameter names are only collected here. Each section is resolved
+        # by its accessor, so a handler only fetches what it uses.
+        for section_name, field_name in SSM_PARAMETER_FIELDS:
+            section = getattr(self, section_name)
+            if section is not None:
+                self._ssm_parameter_names[(section_name, field_name)] = getattr(
+                    section, field_name
+                )
 
-        if self.cleanup is not None:
-            self.cleanup.user_pool_id = get_required_aws_ssm_parameter_value(
-                parameter_name=self.cleanup.user_pool_id,
-            )
+    def refresh_ssm_parameters(
+        self, section_name: Optional[str] = None
+    ) -> None:
+        fields = {
+            field: parameter_name
+            for field, parameter_name in self._ssm_parameter_names.items()
+            if section_name is None or field[0] == section_name
+        }
+        if not fields:
+            return
 
-        if self.user_pool is not None:
-            self.user_pool.id = get_required_aws_ssm_parameter_value(
-                parameter_name=self.user_pool.id,
-            )
+        parameter_cache = ssm_adapter.get_parameter_cache()
+        values: dict[str, str] = {}
+        secret_names = [
+            parameter_name
+            for field, parameter_name in fields.items()
+            if field in SECRET_SSM_PARAMETER_FIELDS
+        ]
+        names = [
+            parameter_name
+            for field, parameter_name in fields.items()
+            if field not in SECRET_SSM_PARAMETER_FIELDS
+        ]
+        if names:
+            values.update(parameter_cache.get_many(names, persist=True))
+        if secret_names:
+            values.update(parameter_cache.get_many(secret_names))
 
-        if self.posthog is not None:
-            self.posthog.api_key = get_required_aws_ssm_parameter_value(
-                parameter_name=self.posthog.api_key,
-            )
-            self.posthog.api_host = get_required_aws_ssm_parameter_value(
-                parameter_name=self.posthog.api_host,
+        for field, parameter_name in fields.items():
+            section_name, field_name = field
+            setattr(
+                getattr(self, section_name), field_name, values[parameter_name]
             )
 
     recaptcha: Optional[ReCaptchaSettings] = None
     cleanup: Optional[CleanUpSettings] = None
     users_table: Optional[UsersTableSettings] = None
+    contacts_table: Optional[ContactsTableSettings] = None
+    jobs_table: Optional[JobsTableSettings] = None
+    user_import: Optional[UserImportSettings] = None
+    reconciliation: Optional[ReconciliationSettings] = None
+    contact_filter: Optional[ContactFilterSettings] = None
+    idempotency: Optional[IdempotencySettings] = None
     user_pool: Optional[UserPoolSettings] = None
+    sign_up_api: Optional[SignUpApiSettings] = None
     posthog: Optional[PosthogSettings] = None
+    metrics: Optional[MetricsSettings] = None
+    rate_limits: Optional[RateLimitSettings] = None
+    tenant_routing: Optional[TenantRoutingSettings] = None
+
+    def for_user_pool(
+        self, user_pool_id: str, tenant_pool: TenantPoolSettings
+    ) -> "Settings":
+        # The contact filter only covers the contacts table of this
+        # deployment, so routed pools always look contacts up.
+        settings = self.model_copy(
+            update={
+                "users_table": tenant_pool.users_table,
+                "contacts_table": tenant_pool.contacts_table,
+                "user_pool": UserPoolSettings(id=user_pool_id),
+                "contact_filter": None,
+            }
+        )
+        settings._ssm_parameter_names = {
+            field: parameter_name
+            for field, parameter_name in self._ssm_parameter_names.items()
+            if field[0] != "user_pool"
+        }
+        return settings
 
     def ensure_users_table_settings(self) -> UsersTableSettings:
         users_table = self.users_table
@@ -84,12 +254,46 @@ class Settings(BaseSettings):
             raise ValueError("Users table is not configured.")
         return users_table
 
+    def ensure_contacts_table_settings(self) -> ContactsTableSettings:
+        if not self.contacts_table:
+            raise ValueError("Contacts table is not configured.")
+        return self.contacts_table
+
+    def ensure_jobs_table_settings(self) -> JobsTableSettings:
+        if not self.jobs_table:
+            raise ValueError("Jobs table is not configured.")
+        return self.jobs_table
+
+    def ensure_cleanup_settings(self) -> CleanUpSettings:
+        self.refresh_ssm_parameters("cleanup")
+        if not self.cleanup:
+            raise ValueError("Clean up is not configured.")
+        return self.cleanup
+
+    def ensure_contact_filter_settings(self) -> ContactFilterSettings:
+        if not self.contact_filter:
+            raise ValueError("Contact filter is not configured.")
+        return self.contact_filter
+
+    def ensure_sign_up_api_settings(self) -> SignUpApiSettings:
+        if not self.sign_up_api:
+            raise ValueError("Sign up API is not configured.")
+        return self.sign_up_api
+
     def ensure_recaptcha_settings(self) -> ReCaptchaSettings:
+        self.refresh_ssm_parameters("recaptcha")
         if not self.recaptcha:
             raise ValueError("reCAPTCHA secret key is not configured.")
         return self.recaptcha
 
     def ensure_user_pool_settings(self) -> UserPoolSettings:
+        self.refresh_ssm_parameters("user_pool")
         if not self.user_pool:
             raise ValueError("User pool is not configured.")
         return self.user_pool
+
+    def ensure_posthog_settings(self) -> PosthogSettings:
+        self.refresh_ssm_parameters("posthog")
+        if not self.posthog:
+            raise ValueError("PostHog is not configured.")
+        return self.posthog
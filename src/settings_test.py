@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.adapters.ssm import ParameterCache
+from src.adapters.ssm_test import FakeSSMClient
+from src.settings import Settings, TenantPoolSettings
+
+
+class SettingsTests(unittest.TestCase):
+    def _settings(self, client, cache=None, **values):
+        cache = cache or ParameterCache(lambda: client)
+        for patcher in (
+            patch(
+                "src.settings.is_aws_session_token_available",
+                return_value=True,
+            ),
+            patch(
+                "src.settings.ssm_adapter.get_parameter_cache",
+                return_value=cache,
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return Settings.model_validate(values), cache
+
+    def test_resolves_each_section_on_first_access(self):
+        client = FakeSSMClient(
+            {
+                "/recaptcha/secret": "secret",
+                "/user-pool/id": "pool-id",
+                "/posthog/key": "key",
+                "/posthog/host": "https://posthog.example.com",
+            }
+        )
+
+        settings, _ = self._settings(
+            client,
+            recaptcha={"secret_key": "/recaptcha/secret"},
+            user_pool={"id": "/user-pool/id"},
+            posthog={"api_key": "/posthog/key", "api_host": "/posthog/host"},
+        )
+        self.assertEqual(client.calls, [])
+
+        self.assertEqual(settings.ensure_user_pool_settings().id, "pool-id")
+        self.assertEqual(client.calls, [["/user-pool/id"]])
+        self.assertEqual(settings.recaptcha.secret_key, "/recaptcha/secret")
+
+        posthog_settings = settings.ensure_posthog_settings()
+        self.assertEqual(posthog_settings.api_key, "key")
+        self.assertEqual(
+            posthog_settings.api_host, "https://posthog.example.com"
+        )
+
+    def test_accessors_pick_up_rotated_parameters(self):
+        client = FakeSSMClient({"/recaptcha/secret": "old"})
+        settings, cache = self._settings(
+            client, recaptcha={"secret_key": "/recaptcha/secret"}
+        )
+        settings.ensure_recaptcha_settings()
+
+        client.values["/recaptcha/secret"] = "rotated"
+        cache.clear()
+        recaptcha_settings = settings.ensure_recaptcha_settings()
+
+        self.assertEqual(recaptcha_settings.secret_key, "rotated")
+
+    def test_snapshots_only_non_secret_values(self):
+        client = FakeSSMClient(
+            {"/user-pool/id": "pool-id", "/recaptcha/secret": "secret"}
+        )
+        snapshot = MagicMock()
+        snapshot.load.return_value = {}
+        settings, _ = self._settings(
+            client,
+            ParameterCache(lambda: client, snapshot=snapshot),
+            recaptcha={"secret_key": "/recaptcha/secret"},
+            user_pool={"id": "/user-pool/id"},
+        )
+
+        settings.ensure_user_pool_settings()
+        settings.ensure_recaptcha_settings()
+
+        snapshot.save.assert_called_once()
+        self.assertEqual(
+            list(snapshot.save.call_args.args[0]), ["/user-pool/id"]
+        )
+
+    def test_user_pool_settings_override_tables_and_pool(self):
+        client = FakeSSMClient(
+            {"/user-pool/id": "home-pool", "/recaptcha/secret": "secret"}
+        )
+        settings, _ = self._settings(
+            client,
+            recaptcha={"secret_key": "/recaptcha/secret"},
+            user_pool={"id": "/user-pool/id"},
+            users_table={"name": "users"},
+            contacts_table={"name": "contacts"},
+            contact_filter={"snapshot_bucket": "bucket"},
+        )
+
+        tenant_settings = settings.for_user_pool(
+            "tenant-pool",
+            TenantPoolSettings.model_validate(
+                {
+                    "users_table": {"name": "tenant-users"},
+                    "contacts_table": {"name": "tenant-contacts"},
+                }
+            ),
+        )
+
+        self.assertEqual(
+            tenant_settings.ensure_user_pool_settings().id, "tenant-pool"
+        )
+        self.assertEqual(
+            tenant_settings.ensure_users_table_settings().name, "tenant-users"
+        )
+        self.assertIsNone(tenant_settings.contact_filter)
+        self.assertEqual(
+            tenant_settings.ensure_recaptcha_settings().secret_key, "secret"
+        )
+        self.assertEqual(settings.ensure_user_pool_settings().id, "home-pool")
+        self.assertEqual(settings.ensure_users_table_settings().name, "users")
+
+    def test_skips_resolution_without_aws_session(self):
+        with patch(
+            "src.settings.is_aws_session_token_available", return_value=False
+        ):
+            settings = Settings.model_validate(
+                {"user_pool": {"id": "/user-pool/id"}}
+            )
+
+        self.assertEqual(
+            settings.ensure_user_pool_settings().id, "/user-pool/id"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,19 @@
-from .enforce_user_contact_uniqueness import enforce_user_contact_uniqueness
-from .validate_recaptcha import validate_recaptcha
-from .validate_user_username import validate_user_username
+from typing import TYPE_CHECKING
+
+from src.lazy_imports import lazy_submodules
+
+if TYPE_CHECKING:
+    from .enforce_user_contact_uniqueness import enforce_user_contact_uniqueness
+    from .validate_recaptcha import validate_recaptcha
+    from .validate_user_username import validate_user_username
+    from .run_concurrent_checks import run_concurrent_checks
 
 __all__ = [
     "enforce_user_contact_uniqueness",
     "validate_recaptcha",
     "validate_user_username",
+    "run_concurrent_checks",
 ]
+
+
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -1,9 +1,13 @@
-from typing import Protocol
+from concurrent.futures import Executor
+from functools import partial
+from typing import Optional, Protocol
 
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
     PreSignUpTriggerEvent,
 )
 
+from src.validators.run_concurrent_checks import run_concurrent_checks
+
 CONTACT_IN_USE_MESSAGE = (
     "We can't create an account with this contact information. "
     "Please sign in or recover your account instead."
@@ -19,9 +23,22 @@ class ContactValidator(Protocol):
     def __call__(self, attribute_name: str, attribute_value: str) -> bool: ...
 
 
+def _ensure_contact_not_in_use(
+    contact_validator: ContactValidator,
+    attribute_name: str,
+    attribute_value: str,
+) -> None:
+    if contact_validator(
+        attribute_name,
+        attribute_value,
+    ):
+        raise ContactInUseError()
+
+
 def enforce_user_contact_uniqueness(
     event: PreSignUpTriggerEvent,
     contact_validator: ContactValidator,
+    executor: Optional[Executor] = None,
 ) -> None:
     user_attributes = event.request.user_attributes or {}
 
@@ -36,14 +53,20 @@ def enforce_user_contact_uniqueness(
         ),
     )
 
-    for (
-        attribute_name,
-        attribute_value,
-    ) in contact_checks:
-        if not attribute_value:
-            continue
-        if contact_validator(
+    checks = [
+        partial(
+            _ensure_contact_not_in_use,
+            contact_validator,
             attribute_name,
             attribute_value,
-        ):
-            raise ContactInUseError()
+        )
+        for attribute_name, attribute_value in contact_checks
+        if attribute_value
+    ]
+
+    if executor is None or len(checks) < 2:
+        for check in checks:
+            check()
+        return
+
+    run_concurrent_checks(checks, executor)
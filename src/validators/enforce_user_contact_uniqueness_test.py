@@ -1,4 +1,5 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 
 from aws_lambda_powertools.utilities.data_classes.cognito_user_pool_event import (
@@ -48,6 +49,28 @@ class EnforceUserContactUniquenessTests(unittest.TestCase):
         event = self._event(email="", phone="")
         enforce_user_contact_uniqueness(event, validator)
 
+    def test_checks_contacts_concurrently_with_executor(self):
+        validator = MagicMock()
+        validator.return_value = False
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            enforce_user_contact_uniqueness(
+                self._event(), validator, executor=executor
+            )
+
+        validator.assert_any_call("email", "user@example.com")
+        validator.assert_any_call("phone_number", "+15555550123")
+
+    def test_raises_from_concurrent_checks(self):
+        validator = MagicMock()
+        validator.side_effect = lambda name, value: name == "phone_number"
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with self.assertRaisesRegex(ValueError, CONTACT_IN_USE_MESSAGE):
+                enforce_user_contact_uniqueness(
+                    self._event(), validator, executor=executor
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,32 @@
+import asyncio
+
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Sequence
+
+Check = Callable[[], None]
+AsyncCheck = Callable[[], Awaitable[None]]
+
+
+def run_concurrent_checks(checks: Sequence[Check], executor: Executor) -> None:
+    # Checks run concurrently but failures are reported in the order the
+    # checks are given: a failure is raised once every earlier check has
+    # passed, and the checks that have not started yet are cancelled.
+    futures = [executor.submit(check) for check in checks]
+    try:
+        for future in futures:
+            future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+async def run_concurrent_checks_async(checks: Sequence[AsyncCheck]) -> None:
+    # Same ordering as run_concurrent_checks, with tasks on the running loop.
+    tasks = [asyncio.ensure_future(check()) for check in checks]
+    try:
+        for task in tasks:
+            await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,74 @@
+import threading
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from src.validators.run_concurrent_checks import run_concurrent_checks
+
+
+class FirstOnlyExecutor:
+    # Runs the first submitted check and leaves the others queued.
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn):
+        future = Future()
+        if not self.futures:
+            try:
+                future.set_result(fn())
+            except Exception as exc:
+                future.set_exception(exc)
+        self.futures.append(future)
+        return future
+
+
+class RunConcurrentChecksTests(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def test_runs_all_checks(self):
+        checks = [MagicMock(), MagicMock(), MagicMock()]
+
+        run_concurrent_checks(checks, self.executor)
+
+        for check in checks:
+            check.assert_called_once()
+
+    def test_runs_checks_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        run_concurrent_checks([barrier.wait, barrier.wait], self.executor)
+
+    def test_earlier_check_failure_takes_precedence(self):
+        release = threading.Event()
+
+        def slow_failure():
+            release.wait(5)
+            raise KeyError("first")
+
+        def fast_failure():
+            release.set()
+            raise ValueError("second")
+
+        with self.assertRaises(KeyError):
+            run_concurrent_checks([slow_failure, fast_failure], self.executor)
+
+    def test_cancels_checks_that_did_not_start(self):
+        executor = FirstOnlyExecutor()
+        pending = MagicMock()
+
+        def failure():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            run_concurrent_checks([failure, pending], executor)
+
+        self.assertTrue(executor.futures[1].cancelled())
+        pending.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()